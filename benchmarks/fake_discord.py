@@ -0,0 +1,275 @@
+"""
+In-memory Discord state and a mock REST layer for offline benchmarks.
+
+Guilds, members, roles and channels are real nextcord objects built from
+synthetic gateway payloads, so cog code runs unchanged. All REST traffic,
+including interaction responses that go through the webhook adapter, is
+answered locally with configurable latency and simulated rate limits.
+"""
+import asyncio
+import datetime
+import itertools
+import time
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+
+import nextcord
+from nextcord.ext import commands
+from nextcord.http import HTTPClient
+from nextcord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+from utils.case_store import CaseStore
+from utils.dm_outbox import DMOutbox
+from utils.guild_features import GuildFeatures
+from utils.member_cache import MemberCache
+
+# Snowflakes only need to be unique and increasing within a run, but they carry a
+# creation time, so they are based on the current time to look like recent messages
+DISCORD_EPOCH = 1420070400000
+_sequence = itertools.count()
+
+ADMINISTRATOR = 8
+NOW = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+# asyncio.sleep as it was before benchmarks patch it out of cog code
+real_sleep = asyncio.sleep
+
+def snowflake() -> int:
+    return (int(time.time() * 1000) - DISCORD_EPOCH) << 22 | (next(_sequence) & 0x3FFFFF)
+#=============================================================================================================================================================
+def user_payload(user_id, name, bot=False):
+    return {"id": str(user_id), "username": name, "discriminator": "0", "global_name": None, "avatar": None, "bot": bot}
+
+def member_payload(user_id, name, roles=(), bot=False):
+    return {"user": user_payload(user_id, name, bot), "roles": [str(role) for role in roles], "joined_at": NOW, "deaf": False, "mute": False}
+
+def role_payload(role_id, name, position, permissions=0):
+    return {
+        "id": str(role_id), "name": name, "position": position, "permissions": str(permissions),
+        "color": 0, "hoist": False, "managed": False, "mentionable": False
+    }
+
+def channel_payload(channel_id, guild_id, name, position, parent_id=None):
+    return {
+        "id": str(channel_id), "guild_id": str(guild_id), "type": 0, "name": name, "position": position,
+        "permission_overwrites": [], "parent_id": str(parent_id) if parent_id else None, "nsfw": False
+    }
+
+def category_payload(category_id, guild_id, name, position):
+    return {"id": str(category_id), "guild_id": str(guild_id), "type": 4, "name": name, "position": position, "permission_overwrites": []}
+
+def message_payload(channel_id, author, content="benchmark message", message_id=None, timestamp=NOW):
+    return {
+        "id": str(message_id or snowflake()), "channel_id": str(channel_id), "author": author, "content": content,
+        "timestamp": timestamp, "edited_timestamp": None, "tts": False, "mention_everyone": False,
+        "mentions": [], "mention_roles": [], "attachments": [], "embeds": [], "pinned": False, "type": 0
+    }
+#=============================================================================================================================================================
+class RateLimiter:
+    """
+    Per-bucket fixed window limiter. A request over the limit counts as a 429 and
+    waits for the window to reset, the way the real client does after a 429.
+    """
+
+    def __init__(self, limit: int = 0, per: float = 1.0):
+        self.limit = limit
+        self.per = per
+        self._windows = {}
+        self.hits = 0
+
+    async def acquire(self, bucket) -> None:
+        if not self.limit:
+            return
+        while True:
+            now = time.perf_counter()
+            started, used = self._windows.get(bucket, (now, 0))
+            if now - started >= self.per:
+                started, used = now, 0
+            if used < self.limit:
+                self._windows[bucket] = (started, used + 1)
+                return
+            self.hits += 1
+            await real_sleep(self.per - (now - started))
+
+class MockHTTPClient(HTTPClient):
+    """
+    HTTPClient that answers every route locally.
+
+    ``latency`` seconds are spent on each request and ``rate_limit`` requests
+    are allowed per route bucket every ``rate_limit_per`` seconds. Calls are
+    counted by ``(method, path)``.
+    """
+
+    def __init__(self, *, latency: float = 0.0, rate_limit: int = 0, rate_limit_per: float = 1.0, **kwargs):
+        super().__init__(dispatch=lambda *args, **kwargs: None, **kwargs)
+        self.latency = latency
+        self.limiter = RateLimiter(rate_limit, rate_limit_per)
+        self.calls = Counter()
+        self.bot_user = None
+        self.history = defaultdict(list)  # channel_id -> message payloads, newest first
+        self.messages = {}  # message_id -> payload, for fetch_message
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.limiter.hits = 0
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        self.calls[(route.method, route.path)] += 1
+        await self.limiter.acquire(route.bucket)
+        if self.latency:
+            await real_sleep(self.latency)
+        return self.respond(route, kwargs)
+
+    def respond(self, route, kwargs):
+        """Build a plausible response body for a route"""
+        key = (route.method, route.path)
+        if key == ("POST", "/channels/{channel_id}/messages"):
+            content = (kwargs.get("json") or {}).get("content") or ""
+            return message_payload(route.channel_id, self.bot_user, content)
+        if key == ("GET", "/channels/{channel_id}/messages"):
+            params = kwargs.get("params") or {}
+            messages = self.history[int(route.channel_id)]
+            if params.get("before"):
+                messages = [m for m in messages if int(m["id"]) < int(params["before"])]
+            return messages[:params.get("limit", 50)]
+        if key == ("GET", "/channels/{channel_id}/messages/{message_id}"):
+            message_id = route.url.rsplit("/", 1)[1]
+            return self.messages.get(message_id) or message_payload(route.channel_id, self.bot_user, message_id=message_id)
+        if key == ("POST", "/channels/{channel_id}/messages/bulk-delete"):
+            deleted = {str(message_id) for message_id in (kwargs.get("json") or {}).get("messages", [])}
+            channel_id = int(route.channel_id)
+            self.history[channel_id] = [m for m in self.history[channel_id] if m["id"] not in deleted]
+            return None
+        if key == ("GET", "/guilds/{guild_id}/members/{member_id}"):
+            user_id = route.url.rsplit("/", 1)[1]
+            return member_payload(user_id, f"user{user_id}")
+        if key[0] == "GET" and route.path == "/users/{user_id}":
+            user_id = route.url.rsplit("/", 1)[1]
+            return user_payload(user_id, f"user{user_id}")
+        return None
+
+class MockWebhookAdapter(AsyncWebhookAdapter):
+    """Webhook adapter that answers interaction responses and followups through a MockHTTPClient"""
+
+    def __init__(self, http: MockHTTPClient, channel_id: int):
+        super().__init__()
+        self.http = http
+        self.channel_id = channel_id
+
+    async def request(self, route, session, *, payload=None, multipart=None, files=None, reason=None, auth_token=None, params=None):
+        self.http.calls[(route.method, route.path)] += 1
+        await self.http.limiter.acquire(route.bucket)
+        if self.http.latency:
+            await real_sleep(self.http.latency)
+        if route.method == "POST" and route.path.startswith("/interactions/"):
+            return None
+        if route.method == "DELETE":
+            return None
+        return message_payload(self.channel_id, self.http.bot_user, (payload or {}).get("content") or "")
+#=============================================================================================================================================================
+class FakeEnvironment:
+    """
+    A bot with one synthetic guild loaded into its connection state.
+
+    The guild has ``members`` human members, ``channels`` text channels spread
+    over ``categories`` categories, an administrator role for the bot and a
+    moderator who owns the guild.
+    """
+
+    def __init__(self, members: int = 1000, channels: int = 50, categories: int = 10,
+                 latency: float = 0.0, rate_limit: int = 0, rate_limit_per: float = 1.0):
+        intents = nextcord.Intents.default()
+        intents.members = True
+        intents.message_content = True
+        self.bot = commands.Bot(command_prefix="s!", intents=intents, help_command=None)
+        self.bot.guild_features = GuildFeatures()
+        self.bot.member_cache = MemberCache(self.bot)
+        self.bot.dm_outbox = DMOutbox(self.bot)
+        self.bot.case_store = CaseStore(":memory:")
+
+        self.http = MockHTTPClient(latency=latency, rate_limit=rate_limit, rate_limit_per=rate_limit_per)
+        self.bot.http = self.http
+        self.state = self.bot._connection
+        self.state.http = self.http
+
+        # The bot's own user
+        self.bot_id = snowflake()
+        self.http.bot_user = user_payload(self.bot_id, "Stellaris", bot=True)
+        self.state.user = nextcord.ClientUser(state=self.state, data=self.http.bot_user)
+
+        self.guild_id = snowflake()
+        self.moderator_id = snowflake()
+        self.admin_role_id = snowflake()
+        self.member_role_id = snowflake()
+        self.guild = self._build_guild(members, channels, categories)
+        self.state._add_guild(self.guild)
+        self.channel = self.guild.text_channels[0]
+
+    def _build_guild(self, member_count, channel_count, category_count):
+        guild_id = self.guild_id
+        roles = [
+            role_payload(guild_id, "@everyone", 0, permissions=0),
+            role_payload(self.member_role_id, "Member", 1),
+            role_payload(self.admin_role_id, "Stellaris", 2, permissions=ADMINISTRATOR)
+        ]
+
+        channels = []
+        category_ids = [snowflake() for _ in range(category_count)]
+        for position, category_id in enumerate(category_ids):
+            channels.append(category_payload(category_id, guild_id, f"category-{position}", position))
+        for position in range(channel_count):
+            parent = category_ids[position % category_count] if category_ids else None
+            channels.append(channel_payload(snowflake(), guild_id, f"channel-{position}", position, parent))
+
+        members = [
+            member_payload(self.bot_id, "Stellaris", roles=[self.admin_role_id], bot=True),
+            member_payload(self.moderator_id, "moderator", roles=[self.admin_role_id])
+        ]
+        for i in range(member_count):
+            # Every tenth member already has the member role
+            member_roles = [self.member_role_id] if i % 10 == 0 else []
+            members.append(member_payload(snowflake(), f"member{i}", roles=member_roles))
+
+        return nextcord.Guild(data={
+            "id": str(guild_id), "name": "Benchmark Guild", "owner_id": str(self.moderator_id),
+            "roles": roles, "channels": channels, "members": members, "member_count": len(members),
+            "emojis": [], "stickers": [], "features": [], "threads": [], "stage_instances": [],
+            "guild_scheduled_events": [], "verification_level": 0, "default_message_notifications": 0,
+            "explicit_content_filter": 0, "mfa_level": 0, "premium_tier": 0, "nsfw_level": 0,
+            "afk_timeout": 300, "preferred_locale": "en-US", "large": True
+        }, state=self.state)
+
+    def use_webhook_adapter(self) -> None:
+        """Route interaction responses in the current context through the mock layer"""
+        async_context.set(MockWebhookAdapter(self.http, self.channel.id))
+
+    def interaction(self, name: str, options=None, channel=None) -> nextcord.Interaction:
+        """Build a slash command interaction from the moderator"""
+        channel = channel or self.channel
+        moderator = member_payload(self.moderator_id, "moderator", roles=[self.admin_role_id])
+        moderator["permissions"] = str(ADMINISTRATOR)
+        return nextcord.Interaction(data={
+            "id": str(snowflake()), "application_id": str(self.bot_id), "type": 2, "token": "benchmark",
+            "version": 1, "guild_id": str(self.guild_id), "channel_id": str(channel.id), "member": moderator,
+            "data": {"id": str(snowflake()), "name": name, "type": 1, "options": options or []},
+            "locale": "en-US", "guild_locale": "en-US", "app_permissions": str(ADMINISTRATOR)
+        }, state=self.state)
+
+    def new_member(self, name: str = "newcomer") -> nextcord.Member:
+        """Build a member as if they had just joined, and add them to the cache"""
+        member = nextcord.Member(data=member_payload(snowflake(), name), guild=self.guild, state=self.state)
+        self.guild._add_member(member)
+        return member
+
+    def fill_history(self, channel, count: int, author_count: int = 50) -> None:
+        """Give a channel ``count`` recent messages for history() to return"""
+        authors = [member._user._to_minimal_user_json() for member in self.guild.members[2:2 + author_count]]
+        self.http.history[channel.id] = [
+            message_payload(channel.id, authors[i % len(authors)], f"message {i}")
+            for i in range(count)
+        ][::-1]
+
+    def report(self) -> SimpleNamespace:
+        """REST calls and 429s since the last reset"""
+        return SimpleNamespace(calls=sum(self.http.calls.values()), routes=self.http.calls.most_common(3),
+                               rate_limited=self.http.limiter.hits)
@@ -0,0 +1,119 @@
+"""
+Measure bytes per cached message for the message log cache.
+
+Run from the repository root:
+    python -m benchmarks.message_cache [count]
+"""
+import datetime
+import gc
+import random
+import sys
+import tracemalloc
+from types import SimpleNamespace
+
+from utils.message_cache import MessageCache
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog hello everyone gg lol anyone playing tonight "
+    "server raid boss drop loot patch notes update broken fixed thanks mods please help"
+).split()
+#=============================================================================================================================================================
+class FakeAuthor(SimpleNamespace):
+    """Builds fresh strings on every access, like nextcord's User does"""
+    def __str__(self):
+        return f"{self.name}#{self.discriminator}"
+
+    @property
+    def display_avatar(self):
+        return SimpleNamespace(url=f"https://cdn.discordapp.com/avatars/{self.id}/a1b2c3d4e5f6a7b8c9d0.png?size=1024")
+
+def make_authors(count):
+    """Build a pool of fake authors shared between messages"""
+    return [FakeAuthor(id=300000000000000000 + i, name=f"user{i}", discriminator="0") for i in range(count)]
+
+def make_messages(count, seed=1234):
+    """Build fake messages with a rough mix of short chat, long posts and attachments"""
+    rng = random.Random(seed)
+    authors = make_authors(200)
+    channel_id = 100000000000000000
+    messages = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.7:
+            length = rng.randint(2, 20)
+        elif roll < 0.95:
+            length = rng.randint(20, 80)
+        else:
+            length = rng.randint(80, 300)
+        content = " ".join(rng.choice(WORDS) for _ in range(length))
+
+        attachments = []
+        if rng.random() < 0.15:
+            attachment_id = 200000000000000000 + i
+            attachments.append(SimpleNamespace(
+                url=f"https://cdn.discordapp.com/attachments/{channel_id}/{attachment_id}/image_{i}.png"
+                    f"?ex=65f1a2b3&is=65df2db3&hm=0123456789abcdef0123456789abcdef0123456789abcdef0123456789abcdef&"
+            ))
+
+        messages.append(SimpleNamespace(
+            id=400000000000000000 + i,
+            content=content,
+            attachments=attachments,
+            author=rng.choice(authors)
+        ))
+    return messages
+#=============================================================================================================================================================
+def fill_legacy(messages):
+    """The original MessageLogEvents representation: one dict of plain strings per message"""
+    cache = {}
+    for message in messages:
+        cache[message.id] = {
+            "content": message.content,
+            "attachments": [attachment.url for attachment in message.attachments],
+            "timestamp": datetime.datetime.now()
+        }
+    return cache
+
+def fill_cache(messages, **kwargs):
+    cache = MessageCache(max_size=len(messages), **kwargs)
+    for message in messages:
+        cache.put(message)
+    return cache
+
+def measure(label, fill, count):
+    """
+    Report the memory a filled cache retains once the source messages are gone,
+    which is what happens on the gateway after each event has been handled
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    messages = make_messages(count)
+    cache = fill(messages)
+    del messages
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{label:<28} {retained / count:>10.1f} bytes/message")
+    return cache
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"Caching {count:,} messages\n")
+
+    measure("legacy dict", fill_legacy, count)
+    measure("MessageCache (plain)", fill_cache, count)
+    measure("MessageCache (compact zlib)", lambda m: fill_cache(m, compact=True, codec="zlib"), count)
+    compact = measure("MessageCache (compact lzma)", lambda m: fill_cache(m, compact=True, codec="lzma"), count)
+
+    # Make sure the compact representation round-trips, signed attachment URLs included
+    for message in make_messages(1000):
+        data = compact.get(message.id)
+        assert data["content"] == message.content
+        assert data["attachments"] == [attachment.url for attachment in message.attachments]
+        assert data["author"][1] == str(message.author)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Replay a recorded gateway session through the bot's listeners.
+
+Recordings come from the gateway recorder (GATEWAY_RECORD=true). Events are
+fed to nextcord's parsers at N times their recorded pace, so the registered
+cogs' listeners run exactly as they would live, against a mock REST layer.
+Sleeps inside cog code are scaled by the same factor. Reports throughput and
+the per-event latency from parse until every listener it triggered finished.
+
+Run from the repository root:
+    python -m benchmarks.replay data/recordings/gateway-1700000000.jsonl.gz --speed 10
+    python -m benchmarks.replay recording.jsonl.gz --speed 0 --autorole --cog cogs.moderation.lock:LockCommands
+"""
+import argparse
+import asyncio
+import contextvars
+import gzip
+import importlib
+import json
+import time
+from collections import Counter, defaultdict
+
+import nextcord
+from nextcord.ext import commands
+
+from benchmarks.fake_discord import MockHTTPClient, real_sleep
+from utils.case_store import CaseStore
+from utils.dm_outbox import DMOutbox
+from utils.guild_features import GuildFeatures
+from utils.member_cache import MemberCache
+from utils.instrumentation import CommandStats
+
+# Cogs whose listeners are replayed by default
+DEFAULT_COGS = ["cogs.admin.logs:MessageLogEvents", "cogs.admin.autorole:Autorole"]
+
+class EventTiming:
+    """Tracks one gateway event until every listener task it scheduled has finished"""
+    __slots__ = ("event", "start", "pending", "parsed")
+
+    def __init__(self, event, start):
+        self.event = event
+        self.start = start
+        self.pending = 0
+        self.parsed = False
+
+# Event being parsed right now, so scheduled listener tasks can be attributed to it
+current_event: contextvars.ContextVar = contextvars.ContextVar("current_event", default=None)
+#=============================================================================================================================================================
+class Replayer:
+    def __init__(self, args):
+        self.args = args
+        self.latencies = defaultdict(list)
+        self.counts = Counter()
+        self.errors = Counter()
+        self.tasks = set()
+
+        intents = nextcord.Intents.default()
+        intents.members = True
+        intents.message_content = True
+        self.bot = commands.Bot(command_prefix="s!", intents=intents, help_command=None, chunk_guilds_at_startup=False)
+        self.bot.guild_features = GuildFeatures()
+        self.bot.member_cache = MemberCache(self.bot, "lazy")
+        self.bot.dm_outbox = DMOutbox(self.bot)
+        self.bot.case_store = CaseStore(":memory:")
+        self.bot.message_archive = None
+
+        self.http = MockHTTPClient(latency=args.latency, rate_limit=args.rate_limit, rate_limit_per=args.rate_limit_per)
+        self.bot.http = self.http
+        self.state = self.bot._connection
+        self.state.http = self.http
+
+        for spec in DEFAULT_COGS + (args.cog or []):
+            module_name, _, class_name = spec.partition(":")
+            cog_class = getattr(importlib.import_module(module_name), class_name)
+            self.bot.add_cog(cog_class(self.bot))
+
+        # Attribute every listener task to the event that scheduled it
+        original_schedule = self.bot._schedule_event
+
+        def schedule_event(coro, event_name, *args, **kwargs):
+            task = original_schedule(coro, event_name, *args, **kwargs)
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            timing = current_event.get()
+            if timing is not None:
+                timing.pending += 1
+                task.add_done_callback(lambda _: self._listener_done(timing))
+            return task
+
+        self.bot._schedule_event = schedule_event
+
+    def _listener_done(self, timing):
+        timing.pending -= 1
+        if timing.pending == 0 and timing.parsed:
+            self.latencies[timing.event].append(time.perf_counter() - timing.start)
+
+    def _configure_autorole(self, guild_id):
+        """Give a replayed guild an autorole so member joins exercise Autorole"""
+        cog = self.bot.get_cog("Autorole")
+        guild = self.bot.get_guild(guild_id)
+        if not cog or not guild:
+            return
+        roles = [role for role in guild.roles if not role.is_default() and not role.managed]
+        if roles:
+            cog.autorole_config[str(guild.id)] = {"member_roles": [{"id": roles[0].id, "delay": None}], "bot_roles": []}
+            cog._refresh_features()
+
+    def feed(self, event, data):
+        """Hand one recorded event to nextcord's parser"""
+        if event == "READY":
+            # Only the bot's own user is needed; READY would otherwise try to chunk guilds over the websocket
+            try:
+                self.state.user = nextcord.ClientUser(state=self.state, data=data["user"])
+                self.http.bot_user = data["user"]
+            except Exception:
+                self.errors[event] += 1
+            self.counts[event] += 1
+            return
+        parser = self.state.parsers.get(event)
+        if parser is None:
+            return
+
+        # Let fetch_message find messages the recording has seen
+        if event in ("MESSAGE_CREATE", "MESSAGE_UPDATE") and "id" in data:
+            self.http.messages[data["id"]] = {**self.http.messages.get(data["id"], {}), **data}
+
+        timing = EventTiming(event, time.perf_counter())
+        token = current_event.set(timing)
+        try:
+            parser(data)
+        except Exception:
+            self.errors[event] += 1
+        finally:
+            current_event.reset(token)
+        timing.parsed = True
+        self.counts[event] += 1
+        if timing.pending == 0:
+            self.latencies[event].append(time.perf_counter() - timing.start)
+
+        if event == "GUILD_CREATE" and self.args.autorole:
+            self._configure_autorole(int(data["id"]))
+
+    async def run(self):
+        speed = self.args.speed
+        start = time.perf_counter()
+        with gzip.open(self.args.recording, "rt", encoding="utf-8") as file:
+            for line in file:
+                record = json.loads(line)
+                if speed > 0:
+                    delay = record["t"] / speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        await real_sleep(delay)
+                self.feed(record["event"], record["data"])
+                # Give scheduled listeners a chance to run between events
+                await real_sleep(0)
+
+        fed = time.perf_counter() - start
+        if self.tasks:
+            await asyncio.wait(set(self.tasks), timeout=self.args.drain_timeout)
+        return fed, time.perf_counter() - start
+
+    def report(self, fed, elapsed):
+        total = sum(self.counts.values())
+        print(f"Replayed {total:,} events in {fed:.2f}s ({total / fed if fed else 0:,.0f} events/s), "
+              f"all listeners done after {elapsed:.2f}s")
+        print(f"REST calls: {sum(self.http.calls.values()):,}  simulated 429s: {self.http.limiter.hits:,}\n")
+
+        print(f"{'Event':<28} {'Count':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'Errors':>7}")
+        for event, count in self.counts.most_common():
+            p50, p95, p99, top = CommandStats.percentiles(self.latencies[event], 50, 95, 99, 100)
+            print(f"{event:<28} {count:>8,} {p50 * 1000:>7.2f}ms {p95 * 1000:>7.2f}ms {p99 * 1000:>7.2f}ms "
+                  f"{top * 1000:>7.2f}ms {self.errors[event]:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a gateway recording through the bot's listeners")
+    parser.add_argument("recording", help="gzip JSON-lines file written by the gateway recorder")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 = as fast as possible)")
+    parser.add_argument("--cog", action="append", help="extra cog to load as module:Class (MessageLogEvents and Autorole are always loaded)")
+    parser.add_argument("--autorole", action="store_true", help="configure an autorole in every replayed guild")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds spent on each mock REST call")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests allowed per route bucket per window (0 = unlimited)")
+    parser.add_argument("--rate-limit-per", type=float, default=1.0, help="rate limit window in seconds")
+    parser.add_argument("--drain-timeout", type=float, default=60.0, help="seconds to wait for listeners after the last event")
+    args = parser.parse_args()
+
+    # Scale sleeps in cog code (edit coalescing, autorole delays) along with the replay
+    async def scaled_sleep(delay, result=None):
+        await real_sleep(delay / args.speed if args.speed > 0 else 0)
+        return result
+
+    # The bot is built inside the running loop so cogs that use bot.loop schedule onto it
+    async def replay():
+        replayer = Replayer(args)
+        fed, elapsed = await replayer.run()
+        replayer.report(fed, elapsed)
+
+    asyncio.sleep = scaled_sleep
+    try:
+        asyncio.run(replay())
+    finally:
+        asyncio.sleep = real_sleep
+
+if __name__ == "__main__":
+    main()
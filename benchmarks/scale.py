@@ -0,0 +1,146 @@
+"""
+Measure how moderation commands and listeners behave on a large guild, offline.
+
+Each scenario drives the real cog code against a synthetic guild held in
+nextcord's connection state, with every REST call answered by a mock layer.
+Reports wall time, REST calls (and simulated 429s) and peak memory.
+
+Run from the repository root:
+    python -m benchmarks.scale --members 100000 --channels 500 --latency 0.005 --rate-limit 50
+    python -m benchmarks.scale --scenario lockdown --scenario role-members
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import cogs.admin.role as role_module
+from cogs.admin.autorole import Autorole
+from cogs.admin.role import RoleCommands, RoleView
+from cogs.moderation.lock import LockCommands
+from cogs.moderation.purge import PurgeCommands
+
+from benchmarks.fake_discord import FakeEnvironment, real_sleep
+
+SCENARIOS = {}
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+#=============================================================================================================================================================
+class ConfirmedRoleView(RoleView):
+    """RoleView that is confirmed as soon as it is awaited"""
+    async def wait(self):
+        self.value = True
+        self.stop()
+        return False
+
+async def skip_sleep(delay, result=None):
+    """Stand-in for asyncio.sleep so cog delays (notice cleanup, pacing) don't dominate the timings"""
+    await real_sleep(0)
+    return result
+
+@scenario("lockdown")
+async def run_lockdown(env, args):
+    cog = LockCommands(env.bot)
+    await LockCommands.lockdown.callback(cog, env.interaction("lockdown"), category=None, reason="Benchmark", duration=None)
+
+@scenario("role-add-all")
+async def run_role_add_all(env, args):
+    cog = RoleCommands(env.bot)
+    role = env.guild.get_role(env.member_role_id)
+    await RoleCommands.role_add.callback(cog, env.interaction("role"), role=role, users="all", reason="Benchmark")
+
+@scenario("role-members")
+async def run_role_members(env, args):
+    cog = RoleCommands(env.bot)
+    role = env.guild.get_role(env.member_role_id)
+    await RoleCommands.role_members.callback(cog, env.interaction("role"), role=role)
+
+@scenario("purge")
+async def run_purge(env, args):
+    cog = PurgeCommands(env.bot)
+    env.fill_history(env.channel, args.history)
+    await PurgeCommands.purge.callback(
+        cog, env.interaction("purge"), amount=100, user=None, contains=None,
+        attachments=False, embeds=False, links=False, invites=False, bots=False
+    )
+
+@scenario("autorole-join")
+async def run_autorole_join(env, args):
+    cog = Autorole(env.bot)
+    cog.autorole_config = {
+        str(env.guild.id): {"member_roles": [{"id": env.member_role_id, "delay": None}], "bot_roles": []}
+    }
+    cog._refresh_features()
+    for i in range(args.joins):
+        await cog.on_member_join(env.new_member(f"newcomer{i}"))
+#=============================================================================================================================================================
+async def run(args):
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    env = FakeEnvironment(
+        members=args.members,
+        channels=args.channels,
+        categories=args.categories,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        rate_limit_per=args.rate_limit_per
+    )
+    env.use_webhook_adapter()
+    state_memory = tracemalloc.get_traced_memory()[0]
+    print(
+        f"Built guild with {args.members:,} members and {args.channels:,} channels "
+        f"in {time.perf_counter() - start:.2f}s ({state_memory / (1024 * 1024):.1f} MB)\n"
+    )
+
+    print(f"{'Scenario':<16} {'Wall time':>10} {'REST':>8} {'429s':>6} {'Peak':>10}   Top routes")
+    for name in args.scenario or SCENARIOS:
+        env.http.reset()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        error = None
+        try:
+            await SCENARIOS[name](env, args)
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - start
+
+        peak = (tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024)
+        report = env.report()
+        routes = ", ".join(f"{method} {path} x{count}" for (method, path), count in report.routes)
+        print(f"{name:<16} {elapsed:>9.2f}s {report.calls:>8,} {report.rate_limited:>6,} {peak:>8.1f}MB   {routes}")
+        if error:
+            print(f"{'':<16} failed: {type(error).__name__}: {error}")
+
+    tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scale benchmarks for moderation commands")
+    parser.add_argument("--members", type=int, default=100000, help="members in the synthetic guild")
+    parser.add_argument("--channels", type=int, default=500, help="text channels in the synthetic guild")
+    parser.add_argument("--categories", type=int, default=25, help="categories the channels are spread over")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds spent on each mock REST call")
+    parser.add_argument("--rate-limit", type=int, default=0, help="requests allowed per route bucket per window (0 = unlimited)")
+    parser.add_argument("--rate-limit-per", type=float, default=1.0, help="rate limit window in seconds")
+    parser.add_argument("--history", type=int, default=500, help="messages in the channel for the purge scenario")
+    parser.add_argument("--joins", type=int, default=1000, help="member joins for the autorole scenario")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="scenario to run (repeatable, default all)")
+    args = parser.parse_args()
+
+    # Cog code sleeps for pacing and cleanup; the mock REST layer keeps real latency
+    asyncio.sleep = skip_sleep
+    role_module.RoleView = ConfirmedRoleView
+    try:
+        asyncio.run(run(args))
+    finally:
+        asyncio.sleep = real_sleep
+        role_module.RoleView = RoleView
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,8 @@ import logging
 
 from utils.embed_helper import EmbedHelper
 from utils.error_handler import ErrorHandler
+from utils.guild_config import save_guild_config
+from utils.guild_features import GuildFeature
 from utils.time_helper import TimeHelper
 
 # File to store autorole configuration
@@ -56,14 +58,22 @@ class Autorole(commands.Cog):
         except Exception as e:
             logger.error(f"Error loading autorole config: {e}")
             self.autorole_config = {}
+        self._refresh_features()
     
-    def save_config(self):
-        """Save autorole configuration to file"""
+    def save_config(self, guild_id: str):
+        """Save one guild's autorole configuration, keeping changes other cluster workers made to the file"""
         try:
-            with open(AUTOROLE_CONFIG_FILE, 'w') as f:
-                json.dump(self.autorole_config, f, indent=4)
+            self.autorole_config = save_guild_config(AUTOROLE_CONFIG_FILE, guild_id, self.autorole_config.get(guild_id))
         except Exception as e:
             logger.error(f"Error saving autorole config: {e}")
+        self._refresh_features()
+    
+    def _refresh_features(self):
+        """Flag every guild that has at least one autorole configured"""
+        self.bot.guild_features.replace(GuildFeature.AUTOROLE, [
+            int(guild_id) for guild_id, config in self.autorole_config.items()
+            if config.get("member_roles") or config.get("bot_roles")
+        ])
     
     def _check_permissions(self, interaction: Interaction) -> bool:
         """Check if the user has the required permissions"""
@@ -157,7 +167,7 @@ class Autorole(commands.Cog):
             if role_config["id"] == role.id:
                 # Update existing role config
                 role_config["delay"] = delay_seconds
-                self.save_config()
+                self.save_config(guild_id)
                 
                 delay_text = self._format_delay_text(delay_seconds)
                 await interaction.response.send_message(
@@ -173,7 +183,7 @@ class Autorole(commands.Cog):
             "id": role.id,
             "delay": delay_seconds
         })
-        self.save_config()
+        self.save_config(guild_id)
         
         # Send success message
         delay_text = self._format_delay_text(delay_seconds)
@@ -247,7 +257,7 @@ class Autorole(commands.Cog):
             if role_config["id"] == role.id:
                 # Update existing role config
                 role_config["delay"] = delay_seconds
-                self.save_config()
+                self.save_config(guild_id)
                 
                 delay_text = self._format_delay_text(delay_seconds)
                 await interaction.response.send_message(
@@ -263,7 +273,7 @@ class Autorole(commands.Cog):
             "id": role.id,
             "delay": delay_seconds
         })
-        self.save_config()
+        self.save_config(guild_id)
         
         # Send success message
         delay_text = self._format_delay_text(delay_seconds)
@@ -329,7 +339,7 @@ class Autorole(commands.Cog):
             return
         
         # Save config and send success message
-        self.save_config()
+        self.save_config(guild_id)
         await interaction.response.send_message(
             embed=EmbedHelper.success_embed(
                 "Member Autorole Removed",
@@ -392,7 +402,7 @@ class Autorole(commands.Cog):
             return
         
         # Save config and send success message
-        self.save_config()
+        self.save_config(guild_id)
         await interaction.response.send_message(
             embed=EmbedHelper.success_embed(
                 "Bot Autorole Removed",
@@ -487,7 +497,7 @@ class Autorole(commands.Cog):
                 config_updated = True
         
         if config_updated:
-            self.save_config()
+            self.save_config(guild_id)
             if (not self.autorole_config[guild_id].get("member_roles", []) and 
                 not self.autorole_config[guild_id].get("bot_roles", [])):
                 await interaction.response.send_message(
@@ -560,7 +570,7 @@ class Autorole(commands.Cog):
         
         # Clear member autoroles and save config
         self.autorole_config[guild_id]["member_roles"] = []
-        self.save_config()
+        self.save_config(guild_id)
         
         await interaction.edit_original_message(
             embed=EmbedHelper.success_embed(
@@ -624,7 +634,7 @@ class Autorole(commands.Cog):
         
         # Clear bot autoroles and save config
         self.autorole_config[guild_id]["bot_roles"] = []
-        self.save_config()
+        self.save_config(guild_id)
         
         await interaction.edit_original_message(
             embed=EmbedHelper.success_embed(
@@ -691,7 +701,7 @@ class Autorole(commands.Cog):
             "member_roles": [],
             "bot_roles": []
         }
-        self.save_config()
+        self.save_config(guild_id)
         
         await interaction.edit_original_message(
             embed=EmbedHelper.success_embed(
@@ -705,9 +715,9 @@ class Autorole(commands.Cog):
     async def on_member_join(self, member):
         """Event listener for when a member joins the server"""
         # Check if guild has any autoroles configured
-        guild_id = str(member.guild.id)
-        if guild_id not in self.autorole_config:
+        if not self.bot.guild_features.enabled(member.guild.id, GuildFeature.AUTOROLE, "member_join"):
             return
+        guild_id = str(member.guild.id)
         
         # Determine if the new member is a bot or human
         if member.bot:
@@ -737,10 +747,13 @@ class Autorole(commands.Cog):
             
             try:
                 # Check if member is still in the server
-                if member in member.guild.members:
+                if await self.bot.member_cache.get_member(member.guild, member.id):
                     await member.add_roles(role)
                     logger.info(f"Assigned autorole {role.name} to {member_type} {member.name} in {member.guild.name}")
             except nextcord.Forbidden:
                 logger.error(f"Missing permissions to assign autorole {role.name} to {member_type} {member.name} in {member.guild.name}")
             except Exception as e:
-                logger.error(f"Error assigning autorole: {e}")
\ No newline at end of file
+                logger.error(f"Error assigning autorole: {e}")
+
+def setup(bot):
+    bot.add_cog(Autorole(bot))
@@ -0,0 +1,85 @@
+import logging
+import time
+
+import nextcord
+from nextcord.ext import commands
+
+from utils.embed_helper import EmbedHelper
+from utils.extensions import ExtensionLoader
+
+logger = logging.getLogger('bot.Extensions')
+#=============================================================================================================================================================
+class ExtensionCommands(commands.Cog):
+    """Owner-only commands for loading, unloading and reloading cogs without restarting"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_check(self, ctx: commands.Context) -> bool:
+        # Only the bot owner can use these commands
+        return await self.bot.is_owner(ctx.author)
+
+    def _resolve(self, name: str):
+        """Match a short name against loaded and discovered extensions"""
+        candidates = set(self.bot.extensions) | set(ExtensionLoader.discover())
+        return ExtensionLoader.resolve(name, sorted(candidates))
+
+    async def _apply(self, ctx: commands.Context, name: str, action: str, method) -> None:
+        """Run a load/unload/reload and re-sync slash commands so Discord matches the loaded cogs"""
+        extension = self._resolve(name)
+        if extension is None:
+            await ctx.send(embed=EmbedHelper.error_embed("Unknown Extension", f"No single extension matches `{name}`."))
+            return
+
+        start = time.perf_counter()
+        try:
+            method(extension)
+        except commands.ExtensionError as e:
+            logger.error(f"Failed to {action} {extension}: {e}", exc_info=True)
+            await ctx.send(embed=EmbedHelper.error_embed(f"Failed to {action.capitalize()}", f"`{extension}`: {e}"))
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+
+        # Push only the slash commands that changed, and delete ones that are gone
+        await self.bot.command_sync.sync()
+
+        logger.info(f"{action.capitalize()}ed {extension} in {elapsed:.1f}ms (by {ctx.author})")
+        await ctx.send(embed=EmbedHelper.success_embed(
+            f"Extension {action.capitalize()}ed",
+            f"`{extension}` in {elapsed:.1f}ms"
+        ))
+    #=============================================================================================================================================================
+    @commands.command(name="reload")
+    async def reload(self, ctx: commands.Context, name: str):
+        """Reload a cog, e.g. s!reload status"""
+        await self._apply(ctx, name, "reload", self.bot.reload_extension)
+
+    @commands.command(name="load")
+    async def load(self, ctx: commands.Context, name: str):
+        """Load a cog that is not loaded, e.g. s!load moderation.purge"""
+        await self._apply(ctx, name, "load", self.bot.load_extension)
+
+    @commands.command(name="unload")
+    async def unload(self, ctx: commands.Context, name: str):
+        """Unload a cog, e.g. s!unload activity"""
+        await self._apply(ctx, name, "unload", self.bot.unload_extension)
+
+    @commands.command(name="extensions")
+    async def extensions(self, ctx: commands.Context):
+        """List loaded and available cogs"""
+        loaded = sorted(self.bot.extensions)
+        available = [name for name in ExtensionLoader.discover() if name not in self.bot.extensions]
+
+        embed = EmbedHelper.info_embed(
+            "Extensions",
+            f"{len(loaded)} loaded, {len(available)} available",
+            fields=[
+                ("Loaded", "\n".join(f"`{name}`" for name in loaded) or "None", False),
+                ("Not Loaded", "\n".join(f"`{name}`" for name in available) or "None", False)
+            ]
+        )
+        await ctx.send(embed=embed)
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(ExtensionCommands(bot))
@@ -4,7 +4,30 @@ import asyncio
 from utils.embed_helper import EmbedHelper
 from utils.error_handler import ErrorHandler
 from utils.embed_helper import EmbedColors
+from utils.guild_features import GuildFeature
 import datetime
+import io
+import os
+import time
+from utils.message_cache import MessageCache
+from utils.time_helper import TimeHelper
+from utils.transcript import TranscriptHelper
+
+# Message cache settings for MessageLogEvents
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "1000"))
+MESSAGE_CACHE_COMPACT = os.getenv("MESSAGE_CACHE_COMPACT", "false").lower() in ("1", "true", "yes")
+MESSAGE_CACHE_CODEC = os.getenv("MESSAGE_CACHE_CODEC", "zlib")
+MESSAGE_CACHE_COMPRESS_THRESHOLD = int(os.getenv("MESSAGE_CACHE_COMPRESS_THRESHOLD", "256"))
+
+# Bulk deletion transcripts ("txt" or "html"), rendered on a worker thread above the threshold
+TRANSCRIPT_FORMAT = "html" if os.getenv("BULK_TRANSCRIPT_FORMAT", "txt").lower() == "html" else "txt"
+TRANSCRIPT_THREAD_THRESHOLD = 50
+
+# Edits to the same message within this many seconds are logged as one entry (0 logs every edit)
+EDIT_COALESCE_WINDOW = float(os.getenv("EDIT_COALESCE_WINDOW", "10"))
+
+# Number of archived messages shown per page of /logs search
+SEARCH_PAGE_SIZE = 8
 #=============================================================================================================================================================
 class LogsCommands(commands.Cog):
     """Commands for setting up logging channels"""
@@ -15,9 +38,17 @@ class LogsCommands(commands.Cog):
         
     @nextcord.slash_command(
         name="logs",
+        description="Set up and search the server logs"
+    )
+    async def logs(self, interaction: nextcord.Interaction):
+        """Base command for logs"""
+        pass
+        
+    @logs.subcommand(
+        name="setup",
         description="Set up logging channels for moderation actions"
     )
-    async def logs(
+    async def logs_setup(
         self, 
         interaction: nextcord.Interaction,
         category_name: str = nextcord.SlashOption(
@@ -76,7 +107,109 @@ class LogsCommands(commands.Cog):
             
         # If no existing channels, create them directly
         await self.create_log_channels(interaction, category_name)
-        
+
+    @logs.subcommand(
+        name="search",
+        description="Search archived edited and deleted messages"
+    )
+    async def logs_search(
+        self,
+        interaction: nextcord.Interaction,
+        user: nextcord.User = nextcord.SlashOption(
+            description="Only show messages from this user",
+            required=False
+        ),
+        channel: nextcord.TextChannel = nextcord.SlashOption(
+            description="Only show messages from this channel",
+            required=False
+        ),
+        text: str = nextcord.SlashOption(
+            description="Only show messages containing these words",
+            required=False
+        ),
+        since: str = nextcord.SlashOption(
+            description="Only show messages from the last period (e.g. 1h, 2d, 7d)",
+            required=False
+        ),
+        until: str = nextcord.SlashOption(
+            description="Only show messages older than this period (e.g. 1h, 2d)",
+            required=False
+        ),
+        event: str = nextcord.SlashOption(
+            description="Only show edits or deletions",
+            choices={"Edits": "edit", "Deletions": "delete"},
+            required=False
+        )
+    ):
+        """Search the message archive with filters"""
+        # Check if the user has permission to view message logs
+        if not interaction.user.guild_permissions.manage_messages:
+            await interaction.response.send_message(
+                embed=EmbedHelper.permission_error_embed("Manage Messages"),
+                ephemeral=True
+            )
+            return
+
+        archive = getattr(self.bot, "message_archive", None)
+        if archive is None:
+            await interaction.response.send_message(
+                embed=EmbedHelper.error_embed(
+                    "Message Archive Disabled",
+                    "The message archive is not enabled on this bot."
+                ),
+                ephemeral=True
+            )
+            return
+
+        # Parse the time range
+        now = time.time()
+        time_range = {}
+        for name, value in (("since", since), ("until", until)):
+            if not value:
+                continue
+            seconds = TimeHelper.parse_time(value)
+            if seconds is None:
+                await interaction.response.send_message(
+                    embed=EmbedHelper.error_embed(
+                        "Invalid Duration",
+                        "Please provide a valid duration format (e.g. 30s, 5m, 2h, 7d)."
+                    ),
+                    ephemeral=True
+                )
+                return
+            time_range[name] = now - seconds
+
+        # Defer response since searching might take time
+        await interaction.response.defer(ephemeral=True)
+
+        filters = {
+            "user_id": user.id if user else None,
+            "channel_id": channel.id if channel else None,
+            "text": text,
+            "since": time_range.get("since"),
+            "until": time_range.get("until"),
+            "event": event
+        }
+
+        try:
+            view = LogsSearchView(archive, interaction, filters)
+            embed = await view.load_page()
+
+            if not view.results:
+                await interaction.followup.send(
+                    embed=EmbedHelper.info_embed(
+                        "No Results",
+                        "No archived messages matched your search."
+                    ),
+                    ephemeral=True
+                )
+                return
+
+            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+
+        except Exception as e:
+            await self.error_handler.handle_command_error(interaction, e, "logs search", True)
+
     async def create_log_channels(self, interaction, category_name):
         """Create the logging channels"""
         try:
@@ -253,8 +386,97 @@ class LogsConfirmationView(nextcord.ui.View):
             await self.interaction.edit_original_message(view=self)
         except:
             pass
+#=============================================================================================================================================================
+class LogsSearchView(nextcord.ui.View):
+    """Paginated results for /logs search"""
 
+    def __init__(self, archive, interaction, filters):
+        super().__init__(timeout=300)
+        self.archive = archive
+        self.interaction = interaction
+        self.filters = filters
+        self.cursors = [None]  # before_id for each page visited so far
+        self.page = 0
+        self.results = []
 
+    async def load_page(self):
+        """Fetch the current page and return its embed"""
+        # Fetch one extra row to know whether there is a next page
+        rows = await self.archive.search(
+            self.interaction.guild.id,
+            before_id=self.cursors[self.page],
+            limit=SEARCH_PAGE_SIZE + 1,
+            **self.filters
+        )
+        has_next = len(rows) > SEARCH_PAGE_SIZE
+        self.results = rows[:SEARCH_PAGE_SIZE]
+
+        if has_next and len(self.cursors) == self.page + 1:
+            self.cursors.append(self.results[-1]["id"])
+
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = not has_next
+        return self.build_embed()
+
+    def build_embed(self):
+        """Create the embed for the current page"""
+        embed = nextcord.Embed(
+            title="Message Archive Search",
+            color=EmbedColors.INFO,
+            timestamp=datetime.datetime.now()
+        )
+
+        lines = []
+        for row in self.results:
+            action = "Edited" if row["event"] == "edit" else "Deleted"
+            author = f"<@{row['author_id']}>" if row["author_id"] else "Unknown user"
+            header = f"**{action}** in <#{row['channel_id']}> by {author} <t:{int(row['created_at'])}:R>"
+
+            if row["event"] == "edit":
+                body = f"**Before:** {(row['content'] or 'Unknown')[:300]}\n**After:** {(row['after_content'] or '(No content)')[:300]}"
+            else:
+                body = (row["content"] or "(No content)")[:500]
+                if row["attachments"]:
+                    body += f"\n*{len(row['attachments'])} attachment(s)*"
+
+            lines.append(f"{header}\n{body}")
+
+        embed.description = "\n\n".join(lines)[:4096]
+        embed.set_footer(text=f"Page {self.page + 1}")
+        return embed
+
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        """Only the user who ran the search can page through it"""
+        if interaction.user.id != self.interaction.user.id:
+            await interaction.response.send_message("You cannot use these buttons.", ephemeral=True)
+            return False
+        return True
+    #=============================================================================================================================================================
+    @nextcord.ui.button(label="Previous", style=nextcord.ButtonStyle.secondary)
+    async def previous_button(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        """Go to the previous page"""
+        self.page = max(self.page - 1, 0)
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
+    #=============================================================================================================================================================
+    @nextcord.ui.button(label="Next", style=nextcord.ButtonStyle.primary)
+    async def next_button(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        """Go to the next page"""
+        if self.page + 1 < len(self.cursors):
+            self.page += 1
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def on_timeout(self):
+        """Handle timeout"""
+        # Disable all buttons
+        for child in self.children:
+            child.disabled = True
+
+        try:
+            await self.interaction.edit_original_message(view=self)
+        except:
+            pass
 #=============================================================================================================================================================
 
 class MessageLogEvents(commands.Cog):
@@ -262,8 +484,22 @@ class MessageLogEvents(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.message_cache = {}  # Cache for storing message content for edit logs
-        self.max_cache_size = 1000  # Maximum number of messages to cache
+        # Cache for storing message content for edit and delete logs
+        self.message_cache = MessageCache(
+            max_size=MESSAGE_CACHE_SIZE,
+            compact=MESSAGE_CACHE_COMPACT,
+            codec=MESSAGE_CACHE_CODEC,
+            compress_threshold=MESSAGE_CACHE_COMPRESS_THRESHOLD
+        )
+        # Edits waiting to be logged, keyed by message ID
+        self.pending_edits = {}
+        
+    def cog_unload(self):
+        """Send pending edit logs right away when the cog is unloaded (reload or shutdown)"""
+        for pending in self.pending_edits.values():
+            pending["task"].cancel()
+            self.bot.loop.create_task(self.send_edit_log(pending))
+        self.pending_edits.clear()
         
     def get_message_logs_channel(self, guild):
         """Get the message logs channel for a guild"""
@@ -273,6 +509,44 @@ class MessageLogEvents(commands.Cog):
             return channel
         return None
         
+    def refresh_feature(self, guild):
+        """Turn the message logging flag on or off depending on whether the guild has a logs channel"""
+        has_channel = nextcord.utils.get(guild.text_channels, name="message-logs") is not None
+        self.bot.guild_features.set(guild.id, GuildFeature.MESSAGE_LOGS, has_channel)
+        
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild):
+        """Set the message logging flag for every guild as it becomes available"""
+        self.refresh_feature(guild)
+        
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        """Set the message logging flag when the bot joins a guild"""
+        self.refresh_feature(guild)
+        
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        """Clear the message logging flag when the bot leaves a guild"""
+        self.bot.guild_features.set(guild.id, GuildFeature.MESSAGE_LOGS, False)
+        
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        """Keep the message logging flag in sync when channels are created"""
+        if isinstance(channel, nextcord.TextChannel):
+            self.refresh_feature(channel.guild)
+            
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        """Keep the message logging flag in sync when channels are deleted"""
+        if isinstance(channel, nextcord.TextChannel):
+            self.refresh_feature(channel.guild)
+            
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        """Keep the message logging flag in sync when channels are renamed"""
+        if before.name != after.name and isinstance(after, nextcord.TextChannel):
+            self.refresh_feature(after.guild)
+            
     @commands.Cog.listener()
     async def on_message(self, message):
         """Cache messages for edit logging"""
@@ -280,19 +554,13 @@ class MessageLogEvents(commands.Cog):
         if message.author.bot or not message.guild:
             return
             
+        # Skip guilds without message logging
+        if not self.bot.guild_features.enabled(message.guild.id, GuildFeature.MESSAGE_LOGS, "message"):
+            return
+            
         # Cache the message content for future edit comparisons
-        # Use a simple LRU-like cache by checking the size
-        if len(self.message_cache) >= self.max_cache_size:
-            # Remove the oldest item if we've reached max size
-            oldest_key = next(iter(self.message_cache))
-            self.message_cache.pop(oldest_key)
-            
-        # Store message content with message ID as key
-        self.message_cache[message.id] = {
-            "content": message.content,
-            "attachments": [attachment.url for attachment in message.attachments],
-            "timestamp": datetime.datetime.now()
-        }
+        # The cache evicts the oldest message once it is full
+        self.message_cache.put(message)
         
     @commands.Cog.listener()
     async def on_raw_message_edit(self, payload):
@@ -301,6 +569,10 @@ class MessageLogEvents(commands.Cog):
         if not payload.guild_id:
             return
             
+        # Skip guilds without message logging
+        if not self.bot.guild_features.enabled(payload.guild_id, GuildFeature.MESSAGE_LOGS, "raw_message_edit"):
+            return
+            
         # Get guild and channel
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
@@ -326,52 +598,40 @@ class MessageLogEvents(commands.Cog):
                 return
                 
             # Get before content from cache
-            cached_info = self.message_cache.get(payload.message_id, {})
+            cached_info = self.message_cache.get(payload.message_id) or {}
             before_content = cached_info.get("content", "Unknown (not in cache)")
             
             # Skip if content didn't change (could be embed or other update)
             if before_content == after.content:
                 return
                 
-            # Create embed for edit log
-            embed = nextcord.Embed(
-                title="Message Edited",
-                description=f"Message edited in {channel.mention}",
-                color=EmbedColors.INFO,
-                timestamp=datetime.datetime.now()
-            )
-            
-            embed.set_author(
-                name=f"{after.author} ({after.author.id})",
-                icon_url=after.author.display_avatar.url
-            )
-            
-            # Add fields for before and after content
-            if before_content:
-                embed.add_field(
-                    name="Before",
-                    value=before_content[:1024],
-                    inline=False
-                )
-            
-            embed.add_field(
-                name="After",
-                value=after.content[:1024] if after.content else "(No content)",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="Message Link",
-                value=f"[Jump to Message]({after.jump_url})",
-                inline=False
-            )
-            
-            # Send the log
-            await logs_channel.send(embed=embed)
+            # Fold the edit into a pending log entry for this message if there is one
+            pending = self.pending_edits.get(payload.message_id)
+            if pending:
+                pending["after"] = after
+                pending["count"] += 1
+            elif EDIT_COALESCE_WINDOW > 0:
+                self.pending_edits[payload.message_id] = {
+                    "logs_channel": logs_channel,
+                    "channel": channel,
+                    "before": before_content,
+                    "after": after,
+                    "count": 1,
+                    "task": self.bot.loop.create_task(self.flush_edit_later(payload.message_id))
+                }
+            else:
+                await logs_channel.send(embed=self.build_edit_embed(channel, before_content, after, 1))
             
             # Update cache with new content
-            if payload.message_id in self.message_cache:
-                self.message_cache[payload.message_id]["content"] = after.content
+            self.message_cache.update_content(payload.message_id, after.content)
+            
+            # Archive the edit if the message archive is enabled
+            archive = getattr(self.bot, "message_archive", None)
+            if archive:
+                archive.record_edit(
+                    guild.id, channel.id, payload.message_id, after.author,
+                    cached_info.get("content"), after.content
+                )
                 
         except (nextcord.NotFound, nextcord.Forbidden, nextcord.HTTPException) as e:
             # Can't fetch the message (deleted, no permissions, etc.)
@@ -402,6 +662,61 @@ class MessageLogEvents(commands.Cog):
                 # Send the log with limited info
                 await logs_channel.send(embed=embed)
         
+    def build_edit_embed(self, channel, before_content, after, count):
+        """Build the log embed for one or more edits to a message"""
+        embed = nextcord.Embed(
+            title="Message Edited" if count == 1 else f"Message Edited ({count} times)",
+            description=f"Message edited in {channel.mention}",
+            color=EmbedColors.INFO,
+            timestamp=datetime.datetime.now()
+        )
+        
+        embed.set_author(
+            name=f"{after.author} ({after.author.id})",
+            icon_url=after.author.display_avatar.url
+        )
+        
+        # Add fields for before and after content
+        if before_content:
+            embed.add_field(
+                name="Before" if count == 1 else "Before (first edit)",
+                value=before_content[:1024],
+                inline=False
+            )
+        
+        embed.add_field(
+            name="After" if count == 1 else "After (latest edit)",
+            value=after.content[:1024] if after.content else "(No content)",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="Message Link",
+            value=f"[Jump to Message]({after.jump_url})",
+            inline=False
+        )
+        
+        return embed
+        
+    async def flush_edit_later(self, message_id):
+        """Log the edits collected for a message once the coalescing window has passed"""
+        await asyncio.sleep(EDIT_COALESCE_WINDOW)
+        pending = self.pending_edits.pop(message_id, None)
+        if pending:
+            await self.send_edit_log(pending)
+            
+    async def send_edit_log(self, pending):
+        """Send the log entry for a set of coalesced edits"""
+        # Skip the log if the message ended up back where it started
+        if pending["before"] == pending["after"].content:
+            return
+            
+        try:
+            embed = self.build_edit_embed(pending["channel"], pending["before"], pending["after"], pending["count"])
+            await pending["logs_channel"].send(embed=embed)
+        except (nextcord.Forbidden, nextcord.HTTPException):
+            pass
+        
     @commands.Cog.listener()
     async def on_raw_message_delete(self, payload):
         """Log message deletions using raw event to catch all deletions"""
@@ -409,6 +724,10 @@ class MessageLogEvents(commands.Cog):
         if not payload.guild_id:
             return
             
+        # Skip guilds without message logging
+        if not self.bot.guild_features.enabled(payload.guild_id, GuildFeature.MESSAGE_LOGS, "raw_message_delete"):
+            return
+            
         # Get guild
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
@@ -424,8 +743,8 @@ class MessageLogEvents(commands.Cog):
         if not channel:
             return
             
-        # Get cached message data
-        message_data = self.message_cache.get(payload.message_id, {})
+        # Get cached message data and remove it from the cache
+        message_data = self.message_cache.pop(payload.message_id)
         
         # If we have cached data for this message
         if message_data:
@@ -448,6 +767,12 @@ class MessageLogEvents(commands.Cog):
                     name=f"{author} ({author.id})",
                     icon_url=author.display_avatar.url
                 )
+            elif message_data.get("author"):
+                author_id, author_name, avatar_url = message_data["author"]
+                embed.set_author(
+                    name=f"{author_name} ({author_id})",
+                    icon_url=avatar_url
+                )
             
             # Add content field if we have content
             if content:
@@ -475,8 +800,17 @@ class MessageLogEvents(commands.Cog):
             # Send the log
             await logs_channel.send(embed=embed)
             
-            # Remove from cache
-            del self.message_cache[payload.message_id]
+            # Archive the deletion if the message archive is enabled
+            archive = getattr(self.bot, "message_archive", None)
+            if archive:
+                author_id, author_name = None, None
+                if hasattr(payload, "cached_message") and payload.cached_message:
+                    author_id, author_name = payload.cached_message.author.id, str(payload.cached_message.author)
+                elif message_data.get("author"):
+                    author_id, author_name = message_data["author"][:2]
+                archive.record_delete(
+                    guild.id, channel.id, payload.message_id, author_id, author_name, content, attachments
+                )
         else:
             # Message was not in cache, log with limited information
             embed = nextcord.Embed(
@@ -520,6 +854,15 @@ class MessageLogEvents(commands.Cog):
             # Send the log with limited info
             await logs_channel.send(embed=embed)
             
+            # Archive what we know about the deletion if the message archive is enabled
+            archive = getattr(self.bot, "message_archive", None)
+            if archive and hasattr(payload, "cached_message") and payload.cached_message:
+                cached_message = payload.cached_message
+                archive.record_delete(
+                    guild.id, channel.id, payload.message_id, cached_message.author.id, str(cached_message.author),
+                    cached_message.content, [attachment.url for attachment in cached_message.attachments]
+                )
+            
     @commands.Cog.listener()
     async def on_raw_bulk_message_delete(self, payload):
         """Log bulk message deletions using raw event"""
@@ -527,6 +870,10 @@ class MessageLogEvents(commands.Cog):
         if not payload.guild_id:
             return
             
+        # Skip guilds without message logging
+        if not self.bot.guild_features.enabled(payload.guild_id, GuildFeature.MESSAGE_LOGS, "raw_bulk_message_delete"):
+            return
+            
         # Get guild
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
@@ -542,6 +889,9 @@ class MessageLogEvents(commands.Cog):
         if not channel:
             return
             
+        # Remove deleted messages from cache in one pass, keeping the ones we still had
+        deleted = self.message_cache.pop_many(payload.message_ids)
+        
         # Create embed for bulk deletion
         embed = nextcord.Embed(
             title="Bulk Message Deletion",
@@ -550,19 +900,52 @@ class MessageLogEvents(commands.Cog):
             timestamp=datetime.datetime.now()
         )
         
-        # Add the list of deleted message IDs
-        embed.add_field(
-            name="Deleted Message IDs",
-            value=", ".join(str(msg_id) for msg_id in list(payload.message_ids)[:20]) + 
-                  (f"\n... and {len(payload.message_ids) - 20} more" if len(payload.message_ids) > 20 else ""),
-            inline=False
-        )
+        transcript_file = None
+        if deleted:
+            # Build a transcript of every deleted message still in the cache
+            # Large batches are rendered on a worker thread to keep the event loop free
+            if len(deleted) > TRANSCRIPT_THREAD_THRESHOLD:
+                data = await self.bot.loop.run_in_executor(
+                    None, TranscriptHelper.render, deleted, channel.name, TRANSCRIPT_FORMAT
+                )
+            else:
+                data = TranscriptHelper.render(deleted, channel.name, TRANSCRIPT_FORMAT)
+                
+            transcript_file = nextcord.File(
+                io.BytesIO(data),
+                filename=f"bulk-delete-{channel.name}-{payload.channel_id}.{TRANSCRIPT_FORMAT}"
+            )
+            embed.add_field(
+                name="Transcript",
+                value=f"{len(deleted)} of {len(payload.message_ids)} messages were recovered from the cache and attached.",
+                inline=False
+            )
+        else:
+            # Nothing cached, so fall back to listing the deleted message IDs
+            embed.add_field(
+                name="Deleted Message IDs",
+                value=", ".join(str(msg_id) for msg_id in list(payload.message_ids)[:20]) + 
+                      (f"\n... and {len(payload.message_ids) - 20} more" if len(payload.message_ids) > 20 else ""),
+                inline=False
+            )
         
-        # Send the log
-        await logs_channel.send(embed=embed)
+        # Send the log and transcript in a single upload
+        if transcript_file:
+            await logs_channel.send(embed=embed, file=transcript_file)
+        else:
+            await logs_channel.send(embed=embed)
         
-        # Remove deleted messages from cache
-        for message_id in payload.message_ids:
-            if message_id in self.message_cache:
-                del self.message_cache[message_id]
-#=============================================================================================================================================================
\ No newline at end of file
+        # Archive the deleted messages we still had
+        archive = getattr(self.bot, "message_archive", None)
+        if archive:
+            for message_id, data in deleted:
+                author_id, author_name = data["author"][:2] if data.get("author") else (None, None)
+                archive.record_delete(
+                    guild.id, channel.id, message_id, author_id, author_name,
+                    data.get("content"), data.get("attachments")
+                )
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(LogsCommands(bot))
+    bot.add_cog(MessageLogEvents(bot))
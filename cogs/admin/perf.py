@@ -0,0 +1,101 @@
+import nextcord
+from nextcord import Interaction, SlashOption
+from nextcord.ext import commands
+
+from utils.embed_helper import EmbedHelper
+from utils.error_handler import ErrorHandler
+from utils.instrumentation import CommandStats, command_stats
+
+# Number of commands listed in the /perf overview
+PERF_TOP_COMMANDS = 10
+#=============================================================================================================================================================
+class PerfCommands(commands.Cog):
+    """Command for inspecting per-command latency"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.error_handler = ErrorHandler(bot)
+    #=============================================================================================================================================================
+    @nextcord.slash_command(
+        name="perf",
+        description="Show slash command latency percentiles (admin only)"
+    )
+    async def perf(
+        self,
+        interaction: Interaction,
+        command: str = SlashOption(
+            description="Show details for one command, e.g. lockdown or role add",
+            required=False,
+            default=None
+        )
+    ):
+        """Show time-to-first-response, run time and HTTP usage per command"""
+        # Check if the user is an administrator
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                embed=EmbedHelper.permission_error_embed("Administrator"),
+                ephemeral=True
+            )
+            return
+
+        try:
+            if command:
+                # Show the full breakdown for a single command
+                name = command.lstrip("/").strip().lower()
+                stats = command_stats.get(name)
+                if not stats:
+                    await interaction.response.send_message(
+                        embed=EmbedHelper.error_embed("No Data", f"`/{name}` hasn't been used since the bot started."),
+                        ephemeral=True
+                    )
+                    return
+
+                embed = EmbedHelper.info_embed(
+                    f"Performance: /{name}",
+                    f"Based on the last {len(stats.total):,} of {stats.count:,} invocations",
+                    fields=[
+                        ("Time to First Response", self._format_percentiles(stats.ttfr), False),
+                        ("Total Run Time", self._format_percentiles(stats.total), False),
+                        ("HTTP Time", self._format_percentiles(stats.http_time), False),
+                        ("HTTP Calls", self._format_percentiles(stats.http_calls, unit=""), False)
+                    ]
+                )
+            else:
+                # Overview of the busiest commands
+                busiest = sorted(command_stats.items(), key=lambda item: item[1].count, reverse=True)[:PERF_TOP_COMMANDS]
+                if not busiest:
+                    await interaction.response.send_message(
+                        embed=EmbedHelper.info_embed("Performance", "No commands have been used since the bot started."),
+                        ephemeral=True
+                    )
+                    return
+
+                lines = ["Command          Uses   TTFR p95  Total p95  HTTP avg"]
+                for name, stats in busiest:
+                    ttfr = CommandStats.percentiles(stats.ttfr, 95)[0]
+                    total = CommandStats.percentiles(stats.total, 95)[0]
+                    http_avg = sum(stats.http_calls) / len(stats.http_calls) if stats.http_calls else 0
+                    lines.append(
+                        f"{name[:16]:<16} {stats.count:>5} {ttfr * 1000:>8.0f}ms {total * 1000:>8.0f}ms {http_avg:>9.1f}"
+                    )
+
+                embed = EmbedHelper.info_embed(
+                    "Performance",
+                    "```\n" + "\n".join(lines) + "\n```",
+                    footer="Use /perf command:<name> for percentiles of a single command"
+                )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            await self.error_handler.handle_command_error(interaction, e, "perf")
+
+    def _format_percentiles(self, samples, unit="ms"):
+        """Format p50/p95/p99 of a sample window"""
+        p50, p95, p99 = CommandStats.percentiles(samples, 50, 95, 99)
+        if unit == "ms":
+            return f"p50 `{p50 * 1000:.1f}ms` • p95 `{p95 * 1000:.1f}ms` • p99 `{p99 * 1000:.1f}ms`"
+        return f"p50 `{p50:g}` • p95 `{p95:g}` • p99 `{p99:g}`"
+
+def setup(bot):
+    bot.add_cog(PerfCommands(bot))
@@ -5,6 +5,8 @@ from typing import List, Optional, Union
 
 from utils.embed_helper import EmbedHelper
 from utils.error_handler import ErrorHandler
+from utils.response_cache import ResponseCache
+from utils.rest_scheduler import rest_lane
 from utils.time_helper import TimeHelper
 #=============================================================================================================================================================
 class RoleView(nextcord.ui.View):
@@ -98,10 +100,11 @@ class RoleCommands(commands.Cog):
         failed_ids = []
         
         for user_id in user_ids:
-            try:
-                member = await interaction.guild.fetch_member(user_id)
+            # Served from the member cache when possible, fetched otherwise
+            member = await self.bot.member_cache.get_member(interaction.guild, user_id)
+            if member:
                 members.append(member)
-            except nextcord.errors.NotFound:
+            else:
                 failed_ids.append(user_id)
         
         return members, failed_ids
@@ -130,7 +133,7 @@ class RoleCommands(commands.Cog):
             embed = EmbedHelper.warning_embed(
                 "Confirm Mass Role Assignment",
                 f"Are you sure you want to add {role.mention} to **ALL** members in the server? "
-                f"This will affect **{len(interaction.guild.members)}** members and may take a long time."
+                f"This will affect **{interaction.guild.member_count}** members and may take a long time."
             )
             view = RoleView()
             
@@ -144,7 +147,8 @@ class RoleCommands(commands.Cog):
                 )
                 return
             
-            # Use all guild members
+            # Use all guild members, chunking the guild first if its members aren't cached
+            await self.bot.member_cache.ensure(interaction.guild)
             target_members = interaction.guild.members
             await interaction.edit_original_message(
                 embed=EmbedHelper.info_embed(
@@ -209,26 +213,27 @@ class RoleCommands(commands.Cog):
         failed_users = []
         already_had_role = []
         
-        for member in target_members:
-            try:
-                # Skip bot user
-                if member.bot:
-                    continue
+        with rest_lane("bulk" if len(target_members) > 5 else "interactive"):
+            for member in target_members:
+                try:
+                    # Skip bot user
+                    if member.bot:
+                        continue
                     
-                # Check if user already has the role
-                if role in member.roles:
-                    already_had_role.append(member)
-                    continue
+                    # Check if user already has the role
+                    if role in member.roles:
+                        already_had_role.append(member)
+                        continue
                 
-                # Add the role
-                await member.add_roles(
-                    role, 
-                    reason=f"Role added by {interaction.user} ({interaction.user.id})" + 
-                           (f" | Reason: {reason}" if reason else "")
-                )
-                success_users.append(member)
-            except Exception as e:
-                failed_users.append(f"{member.mention} (Error: {str(e)[:50]})")
+                    # Add the role
+                    await member.add_roles(
+                        role, 
+                        reason=f"Role added by {interaction.user} ({interaction.user.id})" + 
+                               (f" | Reason: {reason}" if reason else "")
+                    )
+                    success_users.append(member)
+                except Exception as e:
+                    failed_users.append(f"{member.mention} (Error: {str(e)[:50]})")
         
         # Create response embed
         if success_users:
@@ -278,7 +283,8 @@ class RoleCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=embed)
             except:
                 pass
                 
@@ -349,7 +355,8 @@ class RoleCommands(commands.Cog):
                 )
                 return
             
-            # Get all members with the role
+            # Get all members with the role, chunking the guild first if its members aren't cached
+            await self.bot.member_cache.ensure(interaction.guild)
             target_members = role.members
             await interaction.edit_original_message(
                 embed=EmbedHelper.info_embed(
@@ -414,22 +421,23 @@ class RoleCommands(commands.Cog):
         failed_users = []
         didnt_have_role = []
         
-        for member in target_members:
-            try:
-                # Check if user doesn't have the role
-                if role not in member.roles:
-                    didnt_have_role.append(member)
-                    continue
+        with rest_lane("bulk" if len(target_members) > 5 else "interactive"):
+            for member in target_members:
+                try:
+                    # Check if user doesn't have the role
+                    if role not in member.roles:
+                        didnt_have_role.append(member)
+                        continue
                 
-                # Remove the role
-                await member.remove_roles(
-                    role, 
-                    reason=f"Role removed by {interaction.user} ({interaction.user.id})" + 
-                           (f" | Reason: {reason}" if reason else "")
-                )
-                success_users.append(member)
-            except Exception as e:
-                failed_users.append(f"{member.mention} (Error: {str(e)[:50]})")
+                    # Remove the role
+                    await member.remove_roles(
+                        role, 
+                        reason=f"Role removed by {interaction.user} ({interaction.user.id})" + 
+                               (f" | Reason: {reason}" if reason else "")
+                    )
+                    success_users.append(member)
+                except Exception as e:
+                    failed_users.append(f"{member.mention} (Error: {str(e)[:50]})")
         
         # Create response embed
         if success_users:
@@ -479,7 +487,8 @@ class RoleCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=embed)
             except:
                 pass
                 
@@ -519,6 +528,26 @@ class RoleCommands(commands.Cog):
         role: nextcord.Role = SlashOption(description="The role to get information about")
     ):
         """Display detailed information about a role"""
+        # Per-user and per-guild cooldown
+        retry_after = self.bot.response_cache.retry_after(interaction.user.id, interaction.guild_id)
+        if retry_after:
+            await interaction.response.send_message(embed=ResponseCache.cooldown_embed(retry_after), ephemeral=True)
+            return
+        
+        # Defer, since counting the role's members may need the guild's members fetched first
+        await interaction.response.defer()
+        
+        # Reuse the rendered embed until the role or its members change, or it expires
+        embed = self.bot.response_cache.get("role_info", role.id)
+        if embed is None:
+            embed = await self._build_role_info_embed(interaction.guild, role)
+            self.bot.response_cache.put("role_info", role.id, embed)
+        
+        embed.set_footer(text=f"Requested by {interaction.user.display_name}")
+        await interaction.followup.send(embed=embed)
+    
+    async def _build_role_info_embed(self, guild: nextcord.Guild, role: nextcord.Role) -> nextcord.Embed:
+        """Render the role information embed"""
         # Get role creation date
         created_at_timestamp = int(role.created_at.timestamp())
         creation_date = f"<t:{created_at_timestamp}:F>"
@@ -534,6 +563,7 @@ class RoleCommands(commands.Cog):
         permissions_text = ", ".join(permissions) if permissions else "None"
         
         # Get member count with this role
+        await self.bot.member_cache.ensure(guild)
         member_count = len(role.members)
         
         # Create embed
@@ -545,7 +575,7 @@ class RoleCommands(commands.Cog):
         
         # Role stats
         embed.add_field(name="Color", value=f"#{role.color.value:06x}" if role.color.value else "Default", inline=True)
-        embed.add_field(name="Position", value=f"{role.position} (of {len(interaction.guild.roles)})", inline=True)
+        embed.add_field(name="Position", value=f"{role.position} (of {len(guild.roles)})", inline=True)
         embed.add_field(name="Members", value=f"{member_count} member{'' if member_count == 1 else 's'}", inline=True)
         
         embed.add_field(name="Mentionable", value="Yes" if role.mentionable else "No", inline=True)
@@ -589,15 +619,13 @@ class RoleCommands(commands.Cog):
                 inline=False
             )
         
-        embed.set_footer(text=f"Requested by {interaction.user.display_name}")
-        
         # Add a color block to visualize the role color
         if role.color.value:
             # Create a small color sample using unicode block characters
             color_block = "■" * 12
             embed.description = f"**ID:** {role.id}\n**Color Sample:** {color_block}"
         
-        await interaction.response.send_message(embed=embed)
+        return embed
     #=============================================================================================================================================================
     @role.subcommand(name="members", description="Show members who have a specific role")
     async def role_members(
@@ -606,7 +634,11 @@ class RoleCommands(commands.Cog):
         role: nextcord.Role = SlashOption(description="The role to check members for")
     ):
         """Display all members who have a specific role"""
+        # Defer, since the guild's members may need to be fetched first
+        await interaction.response.defer()
+        
         # Get members with this role
+        await self.bot.member_cache.ensure(interaction.guild)
         members = role.members
         
         if not members:
@@ -614,7 +646,7 @@ class RoleCommands(commands.Cog):
                 f"Role Members: {role.name}",
                 f"No members have the {role.mention} role."
             )
-            await interaction.response.send_message(embed=embed)
+            await interaction.followup.send(embed=embed)
             return
         
         # Create embed
@@ -649,5 +681,8 @@ class RoleCommands(commands.Cog):
                     inline=False
                 )
         
-        await interaction.response.send_message(embed=embed)
-#=============================================================================================================================================================
\ No newline at end of file
+        await interaction.followup.send(embed=embed)
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(RoleCommands(bot))
@@ -0,0 +1,277 @@
+import nextcord
+from nextcord.ext import commands
+import json
+import os
+import time
+import logging
+from utils.embed_helper import EmbedHelper
+from utils.error_handler import ErrorHandler
+from utils.guild_config import save_guild_config
+from utils.guild_features import GuildFeature
+from utils.rest_scheduler import rest_lane
+from utils.time_helper import TimeHelper
+from utils.spam_tracker import (
+    SpamTracker, MESSAGE_LIMIT, MESSAGE_WINDOW, DUPLICATE_LIMIT, DUPLICATE_WINDOW, MENTION_LIMIT, MENTION_WINDOW
+)
+
+# File to store anti-spam configuration
+ANTISPAM_CONFIG_FILE = "./data/antispam.json"
+
+# Default mute length when spam is detected, and how far back the spammer's messages are deleted
+DEFAULT_MUTE_DURATION = "10m"
+PURGE_WINDOW = 60.0
+
+# Reason shown in the mute and case for each rule
+RULE_REASONS = {
+    "messages": f"Sent more than {MESSAGE_LIMIT} messages in {MESSAGE_WINDOW:g} seconds",
+    "duplicates": f"Sent the same message {DUPLICATE_LIMIT} times in {DUPLICATE_WINDOW:g} seconds",
+    "mentions": f"Sent {MENTION_LIMIT} or more mentions in {MENTION_WINDOW:g} seconds"
+}
+
+# Set up logging
+logger = logging.getLogger('bot.AntiSpam')
+#=============================================================================================================================================================
+class AntiSpam(commands.Cog):
+    """Automatic muting of spammers and removal of their recent messages"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.error_handler = ErrorHandler(bot)
+        self.config = {}
+        self.tracker = SpamTracker()
+        self.handling = set()  # (guild_id, user_id) being muted/purged right now
+
+        # Create data directory if it doesn't exist
+        os.makedirs(os.path.dirname(ANTISPAM_CONFIG_FILE), exist_ok=True)
+
+        self.load_config()
+
+    def load_config(self):
+        """Load anti-spam configuration from file"""
+        try:
+            if os.path.exists(ANTISPAM_CONFIG_FILE):
+                with open(ANTISPAM_CONFIG_FILE, 'r') as f:
+                    self.config = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading anti-spam config: {e}")
+            self.config = {}
+        self._refresh_features()
+
+    def save_config(self, guild_id: str):
+        """Save one guild's anti-spam configuration, keeping changes other cluster workers made to the file"""
+        try:
+            self.config = save_guild_config(ANTISPAM_CONFIG_FILE, guild_id, self.config.get(guild_id))
+        except Exception as e:
+            logger.error(f"Error saving anti-spam config: {e}")
+        self._refresh_features()
+
+    def _refresh_features(self):
+        """Flag every guild with anti-spam enabled"""
+        self.bot.guild_features.replace(GuildFeature.ANTI_RAID, [
+            int(guild_id) for guild_id, config in self.config.items() if config.get("enabled")
+        ])
+    #=============================================================================================================================================================
+    @nextcord.slash_command(
+        name="antispam",
+        description="Configure automatic spam protection"
+    )
+    async def antispam(self, interaction: nextcord.Interaction):
+        """Base command for anti-spam configuration"""
+        pass
+
+    @antispam.subcommand(
+        name="enable",
+        description="Mute spammers and delete their recent messages automatically"
+    )
+    async def antispam_enable(
+        self,
+        interaction: nextcord.Interaction,
+        mute_duration: str = nextcord.SlashOption(
+            description=f"How long spammers are muted (e.g. 5m, 1h). Default: {DEFAULT_MUTE_DURATION}",
+            required=False
+        ),
+        purge: bool = nextcord.SlashOption(
+            description="Delete the spammer's messages from the last minute. Default: yes",
+            required=False
+        )
+    ):
+        """Enable anti-spam for this server"""
+        # Check if the user has permission to manage the server
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message(
+                embed=EmbedHelper.permission_error_embed("Manage Server"),
+                ephemeral=True
+            )
+            return
+
+        # Parse the mute duration
+        seconds = TimeHelper.parse_time(mute_duration or DEFAULT_MUTE_DURATION)
+        if seconds is None:
+            await interaction.response.send_message(
+                embed=EmbedHelper.error_embed(
+                    "Invalid Duration",
+                    "Please provide a valid duration format (e.g. 30s, 5m, 2h, 7d)."
+                ),
+                ephemeral=True
+            )
+            return
+
+        guild_id = str(interaction.guild.id)
+        self.config[guild_id] = {
+            "enabled": True,
+            "mute_duration": seconds,
+            "purge": purge is not False
+        }
+        self.save_config(guild_id)
+
+        await interaction.response.send_message(
+            embed=EmbedHelper.success_embed(
+                "Anti-Spam Enabled",
+                f"Spammers will be muted for **{TimeHelper.format_duration(seconds)}**"
+                + (" and their messages from the last minute deleted." if purge is not False else ".")
+            ),
+            ephemeral=True
+        )
+
+    @antispam.subcommand(
+        name="disable",
+        description="Turn off automatic spam protection"
+    )
+    async def antispam_disable(self, interaction: nextcord.Interaction):
+        """Disable anti-spam for this server"""
+        # Check if the user has permission to manage the server
+        if not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message(
+                embed=EmbedHelper.permission_error_embed("Manage Server"),
+                ephemeral=True
+            )
+            return
+
+        guild_id = str(interaction.guild.id)
+        self.config.pop(guild_id, None)
+        self.save_config(guild_id)
+        self.tracker.forget_guild(interaction.guild.id)
+
+        await interaction.response.send_message(
+            embed=EmbedHelper.success_embed(
+                "Anti-Spam Disabled",
+                "Messages in this server are no longer checked for spam."
+            ),
+            ephemeral=True
+        )
+
+    @antispam.subcommand(
+        name="status",
+        description="Show the anti-spam settings of this server"
+    )
+    async def antispam_status(self, interaction: nextcord.Interaction):
+        """Show the anti-spam configuration"""
+        config = self.config.get(str(interaction.guild.id))
+
+        embed = EmbedHelper.info_embed(
+            "Anti-Spam",
+            "Anti-spam is **enabled** in this server." if config else "Anti-spam is **disabled** in this server."
+        )
+
+        if config:
+            embed.add_field(name="Mute Duration", value=TimeHelper.format_duration(config["mute_duration"]), inline=True)
+            embed.add_field(name="Delete Messages", value="Yes" if config.get("purge", True) else "No", inline=True)
+
+        embed.add_field(name="Rules", value="\n".join(f"• {reason}" for reason in RULE_REASONS.values()), inline=False)
+        embed.add_field(name="Exempt", value="Bots and members with Manage Messages", inline=False)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    #=============================================================================================================================================================
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        """Check every message against the spam windows"""
+        if message.guild is None or message.author.bot:
+            return
+        if not self.bot.guild_features.enabled(message.guild.id, GuildFeature.ANTI_RAID, "antispam_message"):
+            return
+
+        now = time.monotonic()
+        rule = self.tracker.check(
+            message.guild.id,
+            message.author.id,
+            message.channel.id,
+            message.id,
+            message.content,
+            len(message.mentions) + len(message.role_mentions),
+            now
+        )
+        if rule is None:
+            return
+
+        # Messages that trigger while the author is already being handled stay tracked for that run to delete
+        key = (message.guild.id, message.author.id)
+        if key in self.handling:
+            return
+
+        # Start a fresh window so the next messages don't trigger again while this one is handled
+        targets = self.tracker.pop_messages(message.guild.id, message.author.id, PURGE_WINDOW, now)
+        self.handling.add(key)
+        try:
+            await self.handle_spam(message, rule, targets)
+        except Exception as e:
+            logger.error(f"Error handling spam from {message.author} ({message.author.id}) in {message.guild.id}: {e}")
+        finally:
+            self.handling.discard(key)
+
+    async def handle_spam(self, message, rule, targets):
+        """Mute the author of a spam message and delete their recent messages"""
+        guild = message.guild
+        member = message.author
+        config = self.config.get(str(guild.id), {})
+
+        # Moderators and members above the bot are left alone
+        if not isinstance(member, nextcord.Member) or member.guild_permissions.manage_messages:
+            return
+        if guild.me.top_role <= member.top_role:
+            return
+
+        reason = f"Anti-spam: {RULE_REASONS[rule]}"
+
+        # Mute through the same path as /mute, unless the member is already muted
+        mute_cog = self.bot.get_cog("MuteCommands")
+        muted_role = nextcord.utils.get(guild.roles, name="Muted")
+        if mute_cog and guild.me.guild_permissions.manage_roles and (muted_role is None or muted_role not in member.roles):
+            await mute_cog.mute_member(guild, member, guild.me, reason, config.get("mute_duration"), muted_role)
+
+        if not config.get("purge", True):
+            return
+
+        deleted_count = await self.delete_messages(guild, targets)
+        # Messages sent while the mute was being applied were tracked again; delete those too
+        late = self.tracker.pop_messages(guild.id, member.id, PURGE_WINDOW, time.monotonic())
+        deleted_count += await self.delete_messages(guild, late)
+
+        if deleted_count:
+            # Record the case
+            self.bot.case_store.record(
+                guild.id, "purge", self.bot.user.id, user_id=member.id, channel_id=message.channel.id,
+                reason=reason, details=f"{deleted_count} spam messages deleted"
+            )
+
+    async def delete_messages(self, guild, targets):
+        """Delete tracked (channel_id, message_id) pairs with one bulk request per channel and return how many were deleted"""
+        by_channel = {}
+        for channel_id, message_id in targets:
+            by_channel.setdefault(channel_id, []).append(nextcord.Object(id=message_id))
+
+        deleted_count = 0
+        with rest_lane("bulk"):
+            for channel_id, messages in by_channel.items():
+                channel = guild.get_channel_or_thread(channel_id)
+                if channel is None or not channel.permissions_for(guild.me).manage_messages:
+                    continue
+                try:
+                    await channel.delete_messages(messages)
+                    deleted_count += len(messages)
+                except nextcord.HTTPException as e:
+                    logger.debug(f"Could not delete spam messages in {channel_id}: {e}")
+        return deleted_count
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(AntiSpam(bot))
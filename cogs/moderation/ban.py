@@ -5,6 +5,7 @@ import asyncio
 from utils.embed_helper import EmbedHelper
 from utils.time_helper import TimeHelper
 from utils.error_handler import ErrorHandler
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class BanCommands(commands.Cog):
     """Commands for banning and unbanning users"""
@@ -73,8 +74,8 @@ class BanCommands(commands.Cog):
             )
             return
         
-        # Get the member object if the user is in the guild
-        member = interaction.guild.get_member(user.id)
+        # Get the member object if the user is in the guild (fetched if the guild's members aren't cached)
+        member = await self.bot.member_cache.get_member(interaction.guild, user.id)
         
         # Only perform role hierarchy checks if the user is a member of the guild
         if member is not None:
@@ -144,26 +145,25 @@ class BanCommands(commands.Cog):
         else:
             ban_embed.add_field(name="Duration", value="Permanent", inline=True)
             
-        # Try to DM the user before banning
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Banned",
-                f"You have been banned from **{interaction.guild.name}**",
-                emoji="🔨",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user before banning
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Banned",
+            f"You have been banned from **{interaction.guild.name}**",
+            emoji="🔨",
+            moderator=interaction.user,
+            reason=reason
+        )
             
-            if expiry_time:
-                dm_embed.add_field(name="Duration", value=duration_text, inline=True)
-                dm_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
-            else:
-                dm_embed.add_field(name="Duration", value="Permanent", inline=True)
+        if expiry_time:
+            dm_embed.add_field(name="Duration", value=duration_text, inline=True)
+            dm_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
+        else:
+            dm_embed.add_field(name="Duration", value="Permanent", inline=True)
                 
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            ban_embed.add_field(name="Note", value="Could not DM user about the ban", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed, removal=True)
+        # A banned user can no longer be messaged, so give the DM a bounded head start
+        await self.bot.dm_outbox.wait(dm)
+        self.bot.dm_outbox.add_status_field(ban_embed, dm)
             
         # Ban the user
         try:
@@ -180,6 +180,9 @@ class BanCommands(commands.Cog):
                 # await self.bot.db.add_temp_ban(user.id, interaction.guild.id, expiry_time)
                 pass
                 
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "ban", interaction.user.id, user_id=user.id, reason=reason, duration=seconds if expiry_time else None)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=ban_embed)
             
@@ -187,7 +190,9 @@ class BanCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=ban_embed)
+                    with rest_lane("logging"):
+                        log_message = await log_channel.send(embed=ban_embed)
+                    self.bot.dm_outbox.report(dm, log_message, ban_embed)
             except:
                 pass
                 
@@ -275,6 +280,9 @@ class BanCommands(commands.Cog):
                 reason=reason
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "unban", interaction.user.id, user_id=ban_entry.user.id, reason=reason)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=unban_embed)
             
@@ -282,7 +290,8 @@ class BanCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=unban_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=unban_embed)
             except:
                 pass
                 
@@ -372,4 +381,7 @@ class BanCommands(commands.Cog):
             
         except Exception as e:
             await self.error_handler.handle_command_error(interaction, e, "baninfo", True)
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(BanCommands(bot))
@@ -0,0 +1,215 @@
+import nextcord
+from nextcord.ext import commands
+import datetime
+import time
+from utils.embed_helper import EmbedHelper, EmbedColors
+from utils.error_handler import ErrorHandler
+from utils.time_helper import TimeHelper
+from utils.case_store import CASE_ACTIONS
+
+# Number of cases shown per page of /cases
+CASES_PAGE_SIZE = 10
+#=============================================================================================================================================================
+class CaseCommands(commands.Cog):
+    """Command for searching the moderation case history"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.error_handler = ErrorHandler(bot)
+
+    @nextcord.slash_command(
+        name="cases",
+        description="Search the moderation history of this server"
+    )
+    async def cases(
+        self,
+        interaction: nextcord.Interaction,
+        user: nextcord.User = nextcord.SlashOption(
+            description="Only show cases against this user",
+            required=False
+        ),
+        moderator: nextcord.User = nextcord.SlashOption(
+            description="Only show cases by this moderator",
+            required=False
+        ),
+        action: str = nextcord.SlashOption(
+            description="Only show this kind of action",
+            choices={name.capitalize(): name for name in CASE_ACTIONS},
+            required=False
+        ),
+        since: str = nextcord.SlashOption(
+            description="Only show cases from the last period (e.g. 1h, 2d, 30d)",
+            required=False
+        ),
+        until: str = nextcord.SlashOption(
+            description="Only show cases older than this period (e.g. 1h, 2d)",
+            required=False
+        )
+    ):
+        """Search moderation cases with filters"""
+        # Check if the user has permission to view moderation history
+        if not interaction.user.guild_permissions.moderate_members:
+            await interaction.response.send_message(
+                embed=EmbedHelper.permission_error_embed("Moderate Members"),
+                ephemeral=True
+            )
+            return
+
+        # Parse the time range
+        now = time.time()
+        time_range = {}
+        for name, value in (("since", since), ("until", until)):
+            if not value:
+                continue
+            seconds = TimeHelper.parse_time(value)
+            if seconds is None:
+                await interaction.response.send_message(
+                    embed=EmbedHelper.error_embed(
+                        "Invalid Duration",
+                        "Please provide a valid duration format (e.g. 30s, 5m, 2h, 7d)."
+                    ),
+                    ephemeral=True
+                )
+                return
+            time_range[name] = now - seconds
+
+        # Defer response since searching might take time
+        await interaction.response.defer(ephemeral=True)
+
+        filters = {
+            "user_id": user.id if user else None,
+            "moderator_id": moderator.id if moderator else None,
+            "action": action,
+            "since": time_range.get("since"),
+            "until": time_range.get("until")
+        }
+
+        try:
+            # Cases queued in the last few seconds should show up too
+            await self.bot.case_store.flush()
+
+            # Totals per action when looking at one user's history
+            totals = await self.bot.case_store.count_actions(interaction.guild.id, user.id) if user else None
+
+            view = CasesView(self.bot.case_store, interaction, filters, totals)
+            embed = await view.load_page()
+
+            if not view.results:
+                await interaction.followup.send(
+                    embed=EmbedHelper.info_embed(
+                        "No Cases",
+                        "No moderation cases matched your search."
+                    ),
+                    ephemeral=True
+                )
+                return
+
+            await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+
+        except Exception as e:
+            await self.error_handler.handle_command_error(interaction, e, "cases", True)
+#=============================================================================================================================================================
+class CasesView(nextcord.ui.View):
+    """Paginated results for /cases"""
+
+    def __init__(self, store, interaction, filters, totals=None):
+        super().__init__(timeout=300)
+        self.store = store
+        self.interaction = interaction
+        self.filters = filters
+        self.totals = totals
+        self.cursors = [None]  # (created_at, id) keyset for each page visited so far
+        self.page = 0
+        self.results = []
+
+    async def load_page(self):
+        """Fetch the current page and return its embed"""
+        # Fetch one extra row to know whether there is a next page
+        rows = await self.store.search(
+            self.interaction.guild.id,
+            before=self.cursors[self.page],
+            limit=CASES_PAGE_SIZE + 1,
+            **self.filters
+        )
+        has_next = len(rows) > CASES_PAGE_SIZE
+        self.results = rows[:CASES_PAGE_SIZE]
+
+        if has_next and len(self.cursors) == self.page + 1:
+            self.cursors.append((self.results[-1]["created_at"], self.results[-1]["id"]))
+
+        self.previous_button.disabled = self.page == 0
+        self.next_button.disabled = not has_next
+        return self.build_embed()
+
+    def build_embed(self):
+        """Create the embed for the current page"""
+        embed = nextcord.Embed(
+            title="Moderation Cases",
+            color=EmbedColors.MODERATION,
+            timestamp=datetime.datetime.now()
+        )
+
+        lines = []
+        for row in self.results:
+            target = f"<@{row['user_id']}>" if row["user_id"] else f"<#{row['channel_id']}>" if row["channel_id"] else "the server"
+            moderator = f"<@{row['moderator_id']}>" if row["moderator_id"] else "Unknown"
+            header = f"**#{row['id']} {row['action'].capitalize()}** {target} by {moderator} <t:{int(row['created_at'])}:R>"
+
+            details = []
+            if row["duration"]:
+                details.append(f"Duration: {TimeHelper.format_duration(row['duration'])}")
+            if row["details"]:
+                details.append(row["details"])
+            if row["reason"]:
+                details.append(f"Reason: {row['reason'][:200]}")
+
+            lines.append(header + ("\n" + " | ".join(details) if details else ""))
+
+        embed.description = "\n\n".join(lines)[:4096]
+
+        if self.totals:
+            embed.add_field(
+                name="Totals for this user",
+                value=", ".join(f"{action.capitalize()}: {count}" for action, count in sorted(self.totals.items())),
+                inline=False
+            )
+
+        embed.set_footer(text=f"Page {self.page + 1}")
+        return embed
+
+    async def interaction_check(self, interaction: nextcord.Interaction) -> bool:
+        """Only the user who ran the search can page through it"""
+        if interaction.user.id != self.interaction.user.id:
+            await interaction.response.send_message("You cannot use these buttons.", ephemeral=True)
+            return False
+        return True
+    #=============================================================================================================================================================
+    @nextcord.ui.button(label="Previous", style=nextcord.ButtonStyle.secondary)
+    async def previous_button(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        """Go to the previous page"""
+        self.page = max(self.page - 1, 0)
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
+    #=============================================================================================================================================================
+    @nextcord.ui.button(label="Next", style=nextcord.ButtonStyle.primary)
+    async def next_button(self, button: nextcord.ui.Button, interaction: nextcord.Interaction):
+        """Go to the next page"""
+        if self.page + 1 < len(self.cursors):
+            self.page += 1
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def on_timeout(self):
+        """Handle timeout"""
+        # Disable all buttons
+        for child in self.children:
+            child.disabled = True
+
+        try:
+            await self.interaction.edit_original_message(view=self)
+        except:
+            pass
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(CaseCommands(bot))
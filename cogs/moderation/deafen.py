@@ -5,6 +5,7 @@ import asyncio
 from utils.embed_helper import EmbedHelper
 from utils.time_helper import TimeHelper
 from utils.error_handler import ErrorHandler
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class DeafenCommands(commands.Cog):
     """Commands for deafening and undeafening users in voice channels"""
@@ -151,26 +152,23 @@ class DeafenCommands(commands.Cog):
         else:
             deafen_embed.add_field(name="Duration", value="Indefinite", inline=True)
             
-        # Try to DM the user before deafening
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Deafened",
-                f"You have been deafened in voice channels in **{interaction.guild.name}**",
-                emoji="🔇",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user before deafening
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Deafened",
+            f"You have been deafened in voice channels in **{interaction.guild.name}**",
+            emoji="🔇",
+            moderator=interaction.user,
+            reason=reason
+        )
             
-            if expiry_time:
-                dm_embed.add_field(name="Duration", value=duration_text, inline=True)
-                dm_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
-            else:
-                dm_embed.add_field(name="Duration", value="Indefinite", inline=True)
+        if expiry_time:
+            dm_embed.add_field(name="Duration", value=duration_text, inline=True)
+            dm_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
+        else:
+            dm_embed.add_field(name="Duration", value="Indefinite", inline=True)
                 
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            deafen_embed.add_field(name="Note", value="Could not DM user about the deafen action", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed)
+        self.bot.dm_outbox.add_status_field(deafen_embed, dm)
             
         # Deafen the user
         try:
@@ -179,6 +177,9 @@ class DeafenCommands(commands.Cog):
                 reason=f"Deafened by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "deafen", interaction.user.id, user_id=user.id, reason=reason, duration=seconds if expiry_time else None)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=deafen_embed)
             
@@ -186,7 +187,9 @@ class DeafenCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=deafen_embed)
+                    with rest_lane("logging"):
+                        log_message = await log_channel.send(embed=deafen_embed)
+                    self.bot.dm_outbox.report(dm, log_message, deafen_embed)
             except:
                 pass
                 
@@ -270,20 +273,17 @@ class DeafenCommands(commands.Cog):
             reason=reason
         )
         
-        # Try to DM the user about undeafening
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Undeafened",
-                f"You have been undeafened in voice channels in **{interaction.guild.name}**",
-                emoji="🔊",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user about undeafening
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Undeafened",
+            f"You have been undeafened in voice channels in **{interaction.guild.name}**",
+            emoji="🔊",
+            moderator=interaction.user,
+            reason=reason
+        )
             
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            undeafen_embed.add_field(name="Note", value="Could not DM user about the undeafen action", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed)
+        self.bot.dm_outbox.add_status_field(undeafen_embed, dm)
             
         # Undeafen the user
         try:
@@ -292,6 +292,9 @@ class DeafenCommands(commands.Cog):
                 reason=f"Undeafened by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "undeafen", interaction.user.id, user_id=user.id, reason=reason)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=undeafen_embed)
             
@@ -299,7 +302,9 @@ class DeafenCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=undeafen_embed)
+                    with rest_lane("logging"):
+                        log_message = await log_channel.send(embed=undeafen_embed)
+                    self.bot.dm_outbox.report(dm, log_message, undeafen_embed)
             except:
                 pass
                 
@@ -349,25 +354,29 @@ class DeafenCommands(commands.Cog):
                 reason=f"Duration expired (Originally deafened for: {original_reason})"
             )
             
+            # Record the case
+            self.bot.case_store.record(guild.id, "undeafen", self.bot.user.id, user_id=user.id, reason="Duration expired", details=f"Automatic, originally deafened by {moderator}")
+            
             # Try to send to mod-logs channel if it exists
             log_channel = nextcord.utils.get(guild.channels, name="mod-logs")
             if log_channel:
-                await log_channel.send(embed=undeafen_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=undeafen_embed)
                 
-            # Try to DM the user about undeafening
-            try:
-                dm_embed = EmbedHelper.moderation_embed(
-                    "You've Been Undeafened",
-                    f"You have been automatically undeafened in **{guild.name}** after the set duration.",
-                    emoji="🔊",
-                    reason=f"Duration expired (Originally deafened for: {original_reason})"
-                )
+            # Queue a DM to the user about undeafening
+            dm_embed = EmbedHelper.moderation_embed(
+                "You've Been Undeafened",
+                f"You have been automatically undeafened in **{guild.name}** after the set duration.",
+                emoji="🔊",
+                reason=f"Duration expired (Originally deafened for: {original_reason})"
+            )
                 
-                await user.send(embed=dm_embed)
-            except:
-                pass
+            self.bot.dm_outbox.send(user, dm_embed)
                 
         except:
             # If there's an error, just silently fail
             pass
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(DeafenCommands(bot))
@@ -4,6 +4,7 @@ import time
 from utils.embed_helper import EmbedHelper
 from utils.error_handler import ErrorHandler
 from utils.time_helper import TimeHelper
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class KickCommands(commands.Cog):
     """Commands for kicking users from the server"""
@@ -111,34 +112,33 @@ class KickCommands(commands.Cog):
             reason=reason
         )
         
-        # Try to DM the user before kicking
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Kicked",
-                f"You have been kicked from **{interaction.guild.name}**",
-                emoji="👢",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user before kicking
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Kicked",
+            f"You have been kicked from **{interaction.guild.name}**",
+            emoji="👢",
+            moderator=interaction.user,
+            reason=reason
+        )
             
-            # Add server icon if available
-            if interaction.guild.icon:
-                dm_embed.set_thumbnail(url=interaction.guild.icon.url)
+        # Add server icon if available
+        if interaction.guild.icon:
+            dm_embed.set_thumbnail(url=interaction.guild.icon.url)
                 
-            # Add invitation link if the bot has permission to create invites
-            if interaction.guild.me.guild_permissions.create_instant_invite:
-                try:
-                    # Try to get an invite from the system channel or first text channel
-                    invite_channel = interaction.guild.system_channel or interaction.guild.text_channels[0]
-                    invite = await invite_channel.create_invite(max_age=86400, max_uses=1, reason="Kick command - temporary invite")
-                    dm_embed.add_field(name="Rejoin Server", value=f"[Click here to rejoin]({invite})", inline=False)
-                except:
-                    pass
+        # Add invitation link if the bot has permission to create invites
+        if interaction.guild.me.guild_permissions.create_instant_invite:
+            try:
+                # Try to get an invite from the system channel or first text channel
+                invite_channel = interaction.guild.system_channel or interaction.guild.text_channels[0]
+                invite = await invite_channel.create_invite(max_age=86400, max_uses=1, reason="Kick command - temporary invite")
+                dm_embed.add_field(name="Rejoin Server", value=f"[Click here to rejoin]({invite})", inline=False)
+            except:
+                pass
                     
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            kick_embed.add_field(name="Note", value="Could not DM user about the kick", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed, removal=True)
+        # A kicked user can no longer be messaged, so give the DM a bounded head start
+        await self.bot.dm_outbox.wait(dm)
+        self.bot.dm_outbox.add_status_field(kick_embed, dm)
             
         # Kick the user
         try:
@@ -147,6 +147,9 @@ class KickCommands(commands.Cog):
                 reason=f"Kicked by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "kick", interaction.user.id, user_id=user.id, reason=reason)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=kick_embed)
             
@@ -154,7 +157,9 @@ class KickCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=kick_embed)
+                    with rest_lane("logging"):
+                        log_message = await log_channel.send(embed=kick_embed)
+                    self.bot.dm_outbox.report(dm, log_message, kick_embed)
             except:
                 pass
                 
@@ -269,34 +274,33 @@ class KickCommands(commands.Cog):
             reason=reason
         )
         
-        # Try to DM the user before softbanning
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Softbanned",
-                f"You have been softbanned from **{interaction.guild.name}**\nA softban is a kick that also removes your recent messages.",
-                emoji="🧹",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user before softbanning
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Softbanned",
+            f"You have been softbanned from **{interaction.guild.name}**\nA softban is a kick that also removes your recent messages.",
+            emoji="🧹",
+            moderator=interaction.user,
+            reason=reason
+        )
             
-            # Add server icon if available
-            if interaction.guild.icon:
-                dm_embed.set_thumbnail(url=interaction.guild.icon.url)
+        # Add server icon if available
+        if interaction.guild.icon:
+            dm_embed.set_thumbnail(url=interaction.guild.icon.url)
                 
-            # Add invitation link if the bot has permission to create invites
-            if interaction.guild.me.guild_permissions.create_instant_invite:
-                try:
-                    # Try to get an invite from the system channel or first text channel
-                    invite_channel = interaction.guild.system_channel or interaction.guild.text_channels[0]
-                    invite = await invite_channel.create_invite(max_age=86400, max_uses=1, reason="Softban command - temporary invite")
-                    dm_embed.add_field(name="Rejoin Server", value=f"[Click here to rejoin]({invite})", inline=False)
-                except:
-                    pass
+        # Add invitation link if the bot has permission to create invites
+        if interaction.guild.me.guild_permissions.create_instant_invite:
+            try:
+                # Try to get an invite from the system channel or first text channel
+                invite_channel = interaction.guild.system_channel or interaction.guild.text_channels[0]
+                invite = await invite_channel.create_invite(max_age=86400, max_uses=1, reason="Softban command - temporary invite")
+                dm_embed.add_field(name="Rejoin Server", value=f"[Click here to rejoin]({invite})", inline=False)
+            except:
+                pass
                     
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            softban_embed.add_field(name="Note", value="Could not DM user about the softban", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed, removal=True)
+        # A softbanned user can no longer be messaged, so give the DM a bounded head start
+        await self.bot.dm_outbox.wait(dm)
+        self.bot.dm_outbox.add_status_field(softban_embed, dm)
             
         # Softban the user (ban and immediately unban)
         try:
@@ -313,6 +317,9 @@ class KickCommands(commands.Cog):
                 reason=f"Softban removal - Originally softbanned by {interaction.user} ({interaction.user.id})"
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "softban", interaction.user.id, user_id=user.id, reason=reason)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=softban_embed)
             
@@ -320,10 +327,15 @@ class KickCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=softban_embed)
+                    with rest_lane("logging"):
+                        log_message = await log_channel.send(embed=softban_embed)
+                    self.bot.dm_outbox.report(dm, log_message, softban_embed)
             except:
                 pass
                 
         except Exception as e:
             await self.error_handler.handle_command_error(interaction, e, "softban", True)
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(KickCommands(bot))
@@ -5,6 +5,7 @@ import asyncio
 from utils.embed_helper import EmbedHelper
 from utils.time_helper import TimeHelper
 from utils.error_handler import ErrorHandler
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class LockCommands(commands.Cog):
     """Commands for locking and unlocking channels"""
@@ -145,6 +146,9 @@ class LockCommands(commands.Cog):
                     reason
                 ))
                 
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "lock", interaction.user.id, channel_id=channel.id, reason=reason, duration=seconds if expiry_time else None)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=lock_embed)
             
@@ -170,7 +174,8 @@ class LockCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=lock_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=lock_embed)
             except:
                 pass
                 
@@ -275,6 +280,9 @@ class LockCommands(commands.Cog):
             if channel.id in self.locked_channels:
                 del self.locked_channels[channel.id]
                 
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "unlock", interaction.user.id, channel_id=channel.id, reason=reason)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=unlock_embed)
             
@@ -294,7 +302,8 @@ class LockCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=unlock_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=unlock_embed)
             except:
                 pass
                 
@@ -407,69 +416,70 @@ class LockCommands(commands.Cog):
         already_locked = 0
         failed_count = 0
         
-        for channel in channels_to_lock:
-            try:
-                # Check if already locked
-                current_perms = channel.overwrites_for(default_role)
-                if current_perms.send_messages is False:
-                    already_locked += 1
-                    continue
+        with rest_lane("bulk"):
+            for channel in channels_to_lock:
+                try:
+                    # Check if already locked
+                    current_perms = channel.overwrites_for(default_role)
+                    if current_perms.send_messages is False:
+                        already_locked += 1
+                        continue
                     
-                # Store the original permissions
-                original_perms = channel.overwrites_for(default_role)
+                    # Store the original permissions
+                    original_perms = channel.overwrites_for(default_role)
                 
-                # Create new permission overwrite
-                new_perms = nextcord.PermissionOverwrite(**{k: v for k, v in original_perms._values.items()})
-                new_perms.send_messages = False
+                    # Create new permission overwrite
+                    new_perms = nextcord.PermissionOverwrite(**{k: v for k, v in original_perms._values.items()})
+                    new_perms.send_messages = False
                 
-                # Apply the new permissions
-                await channel.set_permissions(
-                    default_role,
-                    overwrite=new_perms,
-                    reason=f"Lockdown by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
-                )
+                    # Apply the new permissions
+                    await channel.set_permissions(
+                        default_role,
+                        overwrite=new_perms,
+                        reason=f"Lockdown by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
+                    )
                 
-                # Store the lock information for temporary locks
-                if expiry_time:
-                    self.locked_channels[channel.id] = {
-                        'guild_id': interaction.guild.id,
-                        'channel_id': channel.id,
-                        'expiry': expiry_time,
-                        'original_perms': original_perms,
-                        'moderator_id': interaction.user.id,
-                        'reason': reason
-                    }
+                    # Store the lock information for temporary locks
+                    if expiry_time:
+                        self.locked_channels[channel.id] = {
+                            'guild_id': interaction.guild.id,
+                            'channel_id': channel.id,
+                            'expiry': expiry_time,
+                            'original_perms': original_perms,
+                            'moderator_id': interaction.user.id,
+                            'reason': reason
+                        }
                     
-                    # Schedule the unlock task
-                    self.bot.loop.create_task(self.schedule_unlock(
-                        channel.id,
-                        interaction.guild.id,
-                        expiry_time,
-                        interaction.user.id,
-                        reason
-                    ))
+                        # Schedule the unlock task
+                        self.bot.loop.create_task(self.schedule_unlock(
+                            channel.id,
+                            interaction.guild.id,
+                            expiry_time,
+                            interaction.user.id,
+                            reason
+                        ))
                     
-                locked_count += 1
+                    locked_count += 1
                 
-                # Send notification to the channel
-                notification_embed = EmbedHelper.moderation_embed(
-                    "Channel Locked",
-                    f"This channel has been locked as part of a lockdown by {interaction.user.mention}.",
-                    emoji="🔒",
-                    moderator=interaction.user,
-                    reason=reason
-                )
+                    # Send notification to the channel
+                    notification_embed = EmbedHelper.moderation_embed(
+                        "Channel Locked",
+                        f"This channel has been locked as part of a lockdown by {interaction.user.mention}.",
+                        emoji="🔒",
+                        moderator=interaction.user,
+                        reason=reason
+                    )
                 
-                if expiry_time:
-                    notification_embed.add_field(name="Duration", value=duration_text, inline=True)
-                    notification_embed.add_field(name="Unlocks At", value=f"<t:{int(expiry_time)}:F>", inline=True)
-                else:
-                    notification_embed.add_field(name="Duration", value="Indefinite", inline=True)
+                    if expiry_time:
+                        notification_embed.add_field(name="Duration", value=duration_text, inline=True)
+                        notification_embed.add_field(name="Unlocks At", value=f"<t:{int(expiry_time)}:F>", inline=True)
+                    else:
+                        notification_embed.add_field(name="Duration", value="Indefinite", inline=True)
                     
-                await channel.send(embed=notification_embed)
+                    await channel.send(embed=notification_embed)
                 
-            except:
-                failed_count += 1
+                except:
+                    failed_count += 1
                 
         # Add the results to the embed
         lockdown_embed.add_field(
@@ -478,6 +488,9 @@ class LockCommands(commands.Cog):
             inline=False
         )
         
+        # Record the case
+        self.bot.case_store.record(interaction.guild.id, "lockdown", interaction.user.id, reason=reason, duration=seconds if expiry_time else None, details=f"{locked_count} channels locked")
+        
         # Send confirmation
         await interaction.followup.send(embed=lockdown_embed)
         
@@ -485,7 +498,8 @@ class LockCommands(commands.Cog):
         try:
             log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
             if log_channel:
-                await log_channel.send(embed=lockdown_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=lockdown_embed)
         except:
             pass
     #=============================================================================================================================================================        
@@ -567,58 +581,59 @@ class LockCommands(commands.Cog):
         already_unlocked = 0
         failed_count = 0
         
-        for channel in channels_to_unlock:
-            try:
-                # Check if actually locked
-                current_perms = channel.overwrites_for(default_role)
-                if current_perms.send_messages is not False:
-                    already_unlocked += 1
-                    continue
+        with rest_lane("bulk"):
+            for channel in channels_to_unlock:
+                try:
+                    # Check if actually locked
+                    current_perms = channel.overwrites_for(default_role)
+                    if current_perms.send_messages is not False:
+                        already_unlocked += 1
+                        continue
                     
-                # Create new permission overwrite
-                new_perms = nextcord.PermissionOverwrite(**{k: v for k, v in current_perms._values.items()})
-                new_perms.send_messages = None  # Reset to default
+                    # Create new permission overwrite
+                    new_perms = nextcord.PermissionOverwrite(**{k: v for k, v in current_perms._values.items()})
+                    new_perms.send_messages = None  # Reset to default
                 
-                # If there are no other permission overwrites, remove the overwrite entirely
-                should_remove = True
-                for perm, value in new_perms._values.items():
-                    if value is not None and perm != 'send_messages':
-                        should_remove = False
-                        break
+                    # If there are no other permission overwrites, remove the overwrite entirely
+                    should_remove = True
+                    for perm, value in new_perms._values.items():
+                        if value is not None and perm != 'send_messages':
+                            should_remove = False
+                            break
                         
-                # Apply the new permissions
-                if should_remove:
-                    await channel.set_permissions(
-                        default_role,
-                        overwrite=None,
-                        reason=f"Lockdown ended by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
-                    )
-                else:
-                    await channel.set_permissions(
-                        default_role,
-                        overwrite=new_perms,
-                        reason=f"Lockdown ended by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
-                    )
+                    # Apply the new permissions
+                    if should_remove:
+                        await channel.set_permissions(
+                            default_role,
+                            overwrite=None,
+                            reason=f"Lockdown ended by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
+                        )
+                    else:
+                        await channel.set_permissions(
+                            default_role,
+                            overwrite=new_perms,
+                            reason=f"Lockdown ended by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
+                        )
                     
-                # Remove from locked channels if it was temporarily locked
-                if channel.id in self.locked_channels:
-                    del self.locked_channels[channel.id]
+                    # Remove from locked channels if it was temporarily locked
+                    if channel.id in self.locked_channels:
+                        del self.locked_channels[channel.id]
                     
-                unlocked_count += 1
+                    unlocked_count += 1
                 
-                # Send notification to the channel
-                notification_embed = EmbedHelper.moderation_embed(
-                    "Channel Unlocked",
-                    f"This channel has been unlocked by {interaction.user.mention}. The lockdown has ended.",
-                    emoji="🔓",
-                    moderator=interaction.user,
-                    reason=reason
-                )
+                    # Send notification to the channel
+                    notification_embed = EmbedHelper.moderation_embed(
+                        "Channel Unlocked",
+                        f"This channel has been unlocked by {interaction.user.mention}. The lockdown has ended.",
+                        emoji="🔓",
+                        moderator=interaction.user,
+                        reason=reason
+                    )
                 
-                await channel.send(embed=notification_embed)
+                    await channel.send(embed=notification_embed)
                 
-            except:
-                failed_count += 1
+                except:
+                    failed_count += 1
                 
         # Add the results to the embed
         unlockdown_embed.add_field(
@@ -627,6 +642,9 @@ class LockCommands(commands.Cog):
             inline=False
         )
         
+        # Record the case
+        self.bot.case_store.record(interaction.guild.id, "unlockdown", interaction.user.id, reason=reason, details=f"{unlocked_count} channels unlocked")
+        
         # Send confirmation
         await interaction.followup.send(embed=unlockdown_embed)
         
@@ -634,7 +652,8 @@ class LockCommands(commands.Cog):
         try:
             log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
             if log_channel:
-                await log_channel.send(embed=unlockdown_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=unlockdown_embed)
         except:
             pass
     #=============================================================================================================================================================        
@@ -714,6 +733,9 @@ class LockCommands(commands.Cog):
             # Send notification to the channel
             await channel.send(embed=unlock_embed)
             
+            # Record the case
+            self.bot.case_store.record(guild.id, "unlock", self.bot.user.id, channel_id=channel.id, reason="Duration expired", details=f"Automatic, originally locked by {moderator}")
+            
             # Try to send to mod-logs channel if it exists
             log_channel = nextcord.utils.get(guild.channels, name="mod-logs")
             if log_channel:
@@ -724,9 +746,13 @@ class LockCommands(commands.Cog):
                     reason=f"Duration expired (Originally locked for: {original_reason})"
                 )
                 
-                await log_channel.send(embed=log_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=log_embed)
                 
         except:
             # If there's an error, just silently fail
             pass
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(LockCommands(bot))
@@ -5,6 +5,7 @@ import asyncio
 from utils.embed_helper import EmbedHelper
 from utils.time_helper import TimeHelper
 from utils.error_handler import ErrorHandler
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class MuteCommands(commands.Cog):
     """Commands for muting and unmuting users in text channels"""
@@ -12,6 +13,7 @@ class MuteCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.error_handler = ErrorHandler(bot)
+        self.role_locks = {}  # guild_id -> lock held while the Muted role is being created
     #=============================================================================================================================================================    
     @nextcord.slash_command(
         name="mute",
@@ -96,35 +98,11 @@ class MuteCommands(commands.Cog):
         await interaction.response.defer(ephemeral=False)
         
         # Find or create muted role
-        muted_role = nextcord.utils.get(interaction.guild.roles, name="Muted")
-        if not muted_role:
-            try:
-                # Create the muted role if it doesn't exist
-                muted_role = await interaction.guild.create_role(
-                    name="Muted",
-                    reason="Creating Muted role for mute command",
-                    color=nextcord.Color.dark_gray()
-                )
-                
-                # Set permissions for the muted role in all text channels
-                for channel in interaction.guild.channels:
-                    if isinstance(channel, nextcord.TextChannel):
-                        await channel.set_permissions(
-                            muted_role,
-                            send_messages=False,
-                            add_reactions=False,
-                            create_public_threads=False,
-                            create_private_threads=False,
-                            send_messages_in_threads=False
-                        )
-                    elif isinstance(channel, nextcord.VoiceChannel):
-                        await channel.set_permissions(
-                            muted_role,
-                            speak=False
-                        )
-            except Exception as e:
-                await self.error_handler.handle_command_error(interaction, e, "mute", True)
-                return
+        try:
+            muted_role = await self.get_muted_role(interaction.guild)
+        except Exception as e:
+            await self.error_handler.handle_command_error(interaction, e, "mute", True)
+            return
                 
         # Check if user already has the muted role
         if muted_role in user.roles:
@@ -138,8 +116,7 @@ class MuteCommands(commands.Cog):
             return
             
         # Parse duration if provided
-        expiry_time = None
-        duration_text = "Indefinite"
+        seconds = None
         if duration:
             seconds = TimeHelper.parse_time(duration)
             if seconds is None:
@@ -152,77 +129,132 @@ class MuteCommands(commands.Cog):
                 )
                 return
                 
-            expiry_time = time.time() + seconds
-            duration_text = TimeHelper.format_time_remaining(expiry_time)
+        # Mute the user
+        try:
+            await self.mute_member(interaction.guild, user, interaction.user, reason, seconds, muted_role, interaction)
+        except Exception as e:
+            await self.error_handler.handle_command_error(interaction, e, "mute", True)
+    #=============================================================================================================================================================
+    async def get_muted_role(self, guild):
+        """Find the Muted role, creating it and its channel overwrites if it doesn't exist"""
+        muted_role = nextcord.utils.get(guild.roles, name="Muted")
+        if muted_role:
+            return muted_role
+
+        # Concurrent mutes (e.g. anti-spam during a raid) wait for one creation instead of each making a role
+        async with self.role_locks.setdefault(guild.id, asyncio.Lock()):
+            muted_role = nextcord.utils.get(guild.roles, name="Muted")
+            if muted_role:
+                return muted_role
+
+            with rest_lane("bulk"):
+                # Create the muted role if it doesn't exist
+                muted_role = await guild.create_role(
+                    name="Muted",
+                    reason="Creating Muted role for mute command",
+                    color=nextcord.Color.dark_gray()
+                )
+                # Cache it now rather than waiting for the role create event, so waiters find it
+                guild._add_role(muted_role)
+
+                # Set permissions for the muted role in all text channels
+                for channel in guild.channels:
+                    if isinstance(channel, nextcord.TextChannel):
+                        await channel.set_permissions(
+                            muted_role,
+                            send_messages=False,
+                            add_reactions=False,
+                            create_public_threads=False,
+                            create_private_threads=False,
+                            send_messages_in_threads=False
+                        )
+                    elif isinstance(channel, nextcord.VoiceChannel):
+                        await channel.set_permissions(
+                            muted_role,
+                            speak=False
+                        )
+            return muted_role
+    #=============================================================================================================================================================
+    async def mute_member(self, guild, user, moderator, reason, seconds=None, muted_role=None, interaction=None):
+        """
+        Mute a member, DM them, record the case, log it and schedule the unmute
+        Shared by /mute and the anti-spam filter; the confirmation goes to ``interaction`` when given
+        """
+        if muted_role is None:
+            muted_role = await self.get_muted_role(guild)
             
+        expiry_time = time.time() + seconds if seconds else None
+        
         # Create mute embed for the server logs
         mute_embed = EmbedHelper.moderation_embed(
             "User Muted",
             f"{user.mention} has been muted in text channels.",
             emoji="🔇",
             member=user,
-            moderator=interaction.user,
+            moderator=moderator,
             reason=reason
         )
         
         if expiry_time:
+            duration_text = TimeHelper.format_time_remaining(expiry_time)
             mute_embed.add_field(name="Duration", value=duration_text, inline=True)
             mute_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
         else:
             mute_embed.add_field(name="Duration", value="Indefinite", inline=True)
             
-        # Try to DM the user before muting
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Muted",
-                f"You have been muted in **{interaction.guild.name}**",
-                emoji="🔇",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user before muting
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Muted",
+            f"You have been muted in **{guild.name}**",
+            emoji="🔇",
+            moderator=moderator,
+            reason=reason
+        )
             
-            if expiry_time:
-                dm_embed.add_field(name="Duration", value=duration_text, inline=True)
-                dm_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
-            else:
-                dm_embed.add_field(name="Duration", value="Indefinite", inline=True)
+        if expiry_time:
+            dm_embed.add_field(name="Duration", value=duration_text, inline=True)
+            dm_embed.add_field(name="Expires", value=f"<t:{int(expiry_time)}:F>", inline=True)
+        else:
+            dm_embed.add_field(name="Duration", value="Indefinite", inline=True)
                 
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            mute_embed.add_field(name="Note", value="Could not DM user about the mute action", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed)
+        self.bot.dm_outbox.add_status_field(mute_embed, dm)
             
         # Mute the user
+        await user.add_roles(
+            muted_role,
+            reason=f"Muted by {moderator} ({moderator.id}) | Reason: {reason}"
+        )
+        
+        # Record the case
+        self.bot.case_store.record(guild.id, "mute", moderator.id, user_id=user.id, reason=reason, duration=seconds)
+        
+        # Send confirmation to the channel
+        if interaction is not None:
+            await interaction.followup.send(embed=mute_embed)
+        
+        # Try to send to mod-logs channel if it exists
         try:
-            await user.add_roles(
-                muted_role,
-                reason=f"Muted by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
-            )
+            log_channel = nextcord.utils.get(guild.channels, name="mod-logs")
+            if log_channel:
+                with rest_lane("logging"):
+                    log_message = await log_channel.send(embed=mute_embed)
+                self.bot.dm_outbox.report(dm, log_message, mute_embed)
+        except:
+            pass
             
-            # Send confirmation to the channel
-            await interaction.followup.send(embed=mute_embed)
+        # If duration is set, schedule unmute
+        if expiry_time:
+            # Schedule the unmute task
+            self.bot.loop.create_task(self.schedule_unmute(
+                user.id, 
+                guild.id, 
+                expiry_time, 
+                moderator.id, 
+                reason
+            ))
             
-            # Try to send to mod-logs channel if it exists
-            try:
-                log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
-                if log_channel:
-                    await log_channel.send(embed=mute_embed)
-            except:
-                pass
-                
-            # If duration is set, schedule unmute
-            if expiry_time:
-                # Schedule the unmute task
-                self.bot.loop.create_task(self.schedule_unmute(
-                    user.id, 
-                    interaction.guild.id, 
-                    expiry_time, 
-                    interaction.user.id, 
-                    reason
-                ))
-                
-        except Exception as e:
-            await self.error_handler.handle_command_error(interaction, e, "mute", True)
+        return mute_embed
     #=============================================================================================================================================================        
     @nextcord.slash_command(
         name="unmute",
@@ -291,20 +323,17 @@ class MuteCommands(commands.Cog):
             reason=reason
         )
         
-        # Try to DM the user about unmuting
-        try:
-            dm_embed = EmbedHelper.moderation_embed(
-                "You've Been Unmuted",
-                f"You have been unmuted in **{interaction.guild.name}**",
-                emoji="🔊",
-                moderator=interaction.user,
-                reason=reason
-            )
+        # Queue a DM to the user about unmuting
+        dm_embed = EmbedHelper.moderation_embed(
+            "You've Been Unmuted",
+            f"You have been unmuted in **{interaction.guild.name}**",
+            emoji="🔊",
+            moderator=interaction.user,
+            reason=reason
+        )
             
-            await user.send(embed=dm_embed)
-        except:
-            # User might have DMs disabled
-            unmute_embed.add_field(name="Note", value="Could not DM user about the unmute action", inline=False)
+        dm = self.bot.dm_outbox.send(user, dm_embed)
+        self.bot.dm_outbox.add_status_field(unmute_embed, dm)
             
         # Unmute the user
         try:
@@ -313,6 +342,9 @@ class MuteCommands(commands.Cog):
                 reason=f"Unmuted by {interaction.user} ({interaction.user.id}) | Reason: {reason}"
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "unmute", interaction.user.id, user_id=user.id, reason=reason)
+            
             # Send confirmation to the channel
             await interaction.followup.send(embed=unmute_embed)
             
@@ -320,7 +352,9 @@ class MuteCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=unmute_embed)
+                    with rest_lane("logging"):
+                        log_message = await log_channel.send(embed=unmute_embed)
+                    self.bot.dm_outbox.report(dm, log_message, unmute_embed)
             except:
                 pass
                 
@@ -342,8 +376,8 @@ class MuteCommands(commands.Cog):
         if not guild:
             return
             
-        # Get the user
-        user = guild.get_member(user_id)
+        # Get the user (fetched if the guild's members aren't cached)
+        user = await self.bot.member_cache.get_member(guild, user_id)
         if not user:
             return
             
@@ -371,25 +405,29 @@ class MuteCommands(commands.Cog):
                 reason=f"Duration expired (Originally muted for: {original_reason})"
             )
             
+            # Record the case
+            self.bot.case_store.record(guild.id, "unmute", self.bot.user.id, user_id=user.id, reason="Duration expired", details=f"Automatic, originally muted by {moderator}")
+            
             # Try to send to mod-logs channel if it exists
             log_channel = nextcord.utils.get(guild.channels, name="mod-logs")
             if log_channel:
-                await log_channel.send(embed=unmute_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=unmute_embed)
                 
-            # Try to DM the user about unmuting
-            try:
-                dm_embed = EmbedHelper.moderation_embed(
-                    "You've Been Unmuted",
-                    f"You have been automatically unmuted in **{guild.name}** after the set duration.",
-                    emoji="🔊",
-                    reason=f"Duration expired (Originally muted for: {original_reason})"
-                )
+            # Queue a DM to the user about unmuting
+            dm_embed = EmbedHelper.moderation_embed(
+                "You've Been Unmuted",
+                f"You have been automatically unmuted in **{guild.name}** after the set duration.",
+                emoji="🔊",
+                reason=f"Duration expired (Originally muted for: {original_reason})"
+            )
                 
-                await user.send(embed=dm_embed)
-            except:
-                pass
+            self.bot.dm_outbox.send(user, dm_embed)
                 
         except:
             # If there's an error, just silently fail
             pass
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(MuteCommands(bot))
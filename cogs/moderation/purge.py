@@ -6,6 +6,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Union, List
 from utils.embed_helper import EmbedHelper
 from utils.error_handler import ErrorHandler
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class PurgeCommands(commands.Cog):
     """Commands for bulk message deletion"""
@@ -146,20 +147,21 @@ class PurgeCommands(commands.Cog):
             recent_messages = [msg for msg in messages if msg.created_at.replace(tzinfo=timezone.utc) > two_weeks_ago]
             old_messages = [msg for msg in messages if msg.created_at.replace(tzinfo=timezone.utc) <= two_weeks_ago]
             
-            # Delete recent messages in bulk if possible
+            # Deletions go through the bulk REST lane, which also waits out the route's rate limit
             deleted_count = 0
-            if recent_messages:
-                await interaction.channel.delete_messages(recent_messages)
-                deleted_count += len(recent_messages)
-                
-            # Delete older messages individually
-            for message in old_messages:
-                try:
-                    await message.delete()
-                    deleted_count += 1
-                    await asyncio.sleep(0.5)  # Add small delay to avoid rate limits
-                except:
-                    pass
+            with rest_lane("bulk"):
+                # Delete recent messages in bulk if possible
+                if recent_messages:
+                    await interaction.channel.delete_messages(recent_messages)
+                    deleted_count += len(recent_messages)
+                    
+                # Delete older messages individually
+                for message in old_messages:
+                    try:
+                        await message.delete()
+                        deleted_count += 1
+                    except:
+                        pass
                     
             # Create success embed
             success_embed = EmbedHelper.success_embed(
@@ -187,6 +189,9 @@ class PurgeCommands(commands.Cog):
             if filter_parts:
                 success_embed.add_field(name="Filters Applied", value="\n".join(f"• {part}" for part in filter_parts), inline=False)
                 
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "purge", interaction.user.id, user_id=user.id if user else None, channel_id=interaction.channel.id, details=f"{deleted_count} messages deleted")
+            
             # Send success message
             await interaction.followup.send(embed=success_embed, ephemeral=True)
             
@@ -221,7 +226,8 @@ class PurgeCommands(commands.Cog):
                     if filter_parts:
                         log_embed.add_field(name="Filters Applied", value="\n".join(f"• {part}" for part in filter_parts), inline=False)
                         
-                    await log_channel.send(embed=log_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=log_embed)
             except:
                 pass
                 
@@ -351,6 +357,9 @@ class PurgeCommands(commands.Cog):
                 )
             )
             
+            # Record the case
+            self.bot.case_store.record(interaction.guild.id, "clear", interaction.user.id, channel_id=new_channel.id, details=f"Previously #{channel_name}")
+            
             # Try to send to mod-logs channel if it exists
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
@@ -362,7 +371,8 @@ class PurgeCommands(commands.Cog):
                         moderator=interaction.user
                     )
                         
-                    await log_channel.send(embed=log_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=log_embed)
             except:
                 pass
                 
@@ -378,4 +388,7 @@ class PurgeCommands(commands.Cog):
                 
         except Exception as e:
             await self.error_handler.handle_command_error(interaction, e, "clear", True)
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(PurgeCommands(bot))
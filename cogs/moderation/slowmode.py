@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from utils.embed_helper import EmbedHelper
 from utils.error_handler import ErrorHandler
 from utils.time_helper import TimeHelper
+from utils.rest_scheduler import rest_lane
 #=============================================================================================================================================================
 class SlowmodeCommands(commands.Cog):
     """Commands for managing channel slowmode"""
@@ -191,7 +192,8 @@ class SlowmodeCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=slowmode_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=slowmode_embed)
             except:
                 pass
                 
@@ -455,7 +457,8 @@ class SlowmodeCommands(commands.Cog):
         try:
             log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
             if log_channel:
-                await log_channel.send(embed=bulk_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=bulk_embed)
         except:
             pass
     #=============================================================================================================================================================
@@ -555,7 +558,8 @@ class SlowmodeCommands(commands.Cog):
             try:
                 log_channel = nextcord.utils.get(interaction.guild.channels, name="mod-logs")
                 if log_channel:
-                    await log_channel.send(embed=slowmode_embed)
+                    with rest_lane("logging"):
+                        await log_channel.send(embed=slowmode_embed)
             except:
                 pass
                 
@@ -625,9 +629,13 @@ class SlowmodeCommands(commands.Cog):
                     reason=f"Duration expired (Originally set for: {original_reason})"
                 )
                 
-                await log_channel.send(embed=log_embed)
+                with rest_lane("logging"):
+                    await log_channel.send(embed=log_embed)
                 
         except:
             # If there's an error, just silently fail
             pass
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(SlowmodeCommands(bot))
@@ -15,7 +15,7 @@ class ActivityManager(commands.Cog):
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.last_activity_index: int = -1  # Start with -1 so first activity will be at index 0
+        self.last_activity_index: Dict[Optional[int], int] = {}  # Last activity shown, per shard (None when not sharded)
         self.change_activity_task: Optional[tasks.Loop] = None
         self.update_interval: int = 120  # Update status every 2 minutes
         
@@ -41,9 +41,13 @@ class ActivityManager(commands.Cog):
         Generate a list of dynamic activities with current stats.
         Returns a list of activity dictionaries with up-to-date information.
         """
-        # Calculate stats
-        server_count = len(self.bot.guilds)
-        user_count = sum(guild.member_count for guild in self.bot.guilds)
+        # Current stats, kept up to date from gateway events by BotStats (across all clusters when clustered)
+        if self.bot.cluster:
+            server_count = self.bot.cluster.total_guilds
+            user_count = self.bot.cluster.total_members
+        else:
+            server_count = self.bot.bot_stats.guilds
+            user_count = self.bot.bot_stats.members
         
         return [
             # Watching activities
@@ -80,28 +84,47 @@ class ActivityManager(commands.Cog):
             # Get fresh activities with current stats
             activities = self.get_dynamic_activities()
             
-            # Select a new random activity (but not the same as last time)
-            available_indices = list(range(len(activities)))
-            if self.last_activity_index in available_indices and len(available_indices) > 1:
-                available_indices.remove(self.last_activity_index)
-                
-            new_index = random.choice(available_indices)
-            self.last_activity_index = new_index
-            
-            activity_data = activities[new_index]
-            
-            # Create and set the activity
-            activity = nextcord.Activity(
-                type=activity_data["type"],
-                name=activity_data["name"]
-            )
+            # Each shard rotates on its own; shards that are down are skipped
+            if isinstance(self.bot, nextcord.AutoShardedClient):
+                shard_ids = [shard_id for shard_id, shard in self.bot.shards.items() if not shard.is_closed()]
+            else:
+                shard_ids = [None]
             
-            await self.bot.change_presence(activity=activity)
-            logger.debug(f"Changed activity to: {activity_data['type']} {activity_data['name']}")
+            for shard_id in shard_ids:
+                await self.set_shard_activity(activities, shard_id)
             
         except Exception as e:
             logger.error(f"Error changing activity status: {e}")
     
+    async def set_shard_activity(self, activities: List[Dict[str, Any]], shard_id: Optional[int]) -> None:
+        """Pick a new activity for one shard (or the whole bot when not sharded) and apply it."""
+        # Select a new random activity (but not the same as last time)
+        available_indices = list(range(len(activities)))
+        last_index = self.last_activity_index.get(shard_id, -1)
+        if last_index in available_indices and len(available_indices) > 1:
+            available_indices.remove(last_index)
+            
+        new_index = random.choice(available_indices)
+        self.last_activity_index[shard_id] = new_index
+        
+        activity_data = activities[new_index]
+        
+        # Create and set the activity
+        activity = nextcord.Activity(
+            type=activity_data["type"],
+            name=activity_data["name"]
+        )
+        
+        try:
+            if shard_id is None:
+                await self.bot.change_presence(activity=activity)
+            else:
+                await self.bot.change_presence(activity=activity, shard_id=shard_id)
+            logger.debug(f"Changed activity on shard {shard_id} to: {activity_data['type']} {activity_data['name']}")
+        except Exception as e:
+            # One shard failing shouldn't stop the others from rotating
+            logger.error(f"Error changing activity status on shard {shard_id}: {e}")
+    
     @change_activity.before_loop
     async def before_change_activity(self) -> None:
         """Ensure the bot is ready before starting the activity loop."""
@@ -121,4 +144,7 @@ class ActivityManager(commands.Cog):
         except Exception as e:
             logger.error(f"Error forcing status update: {e}")
             await ctx.send(f"Error: {e}")
-#=================================================================================================================================================================
\ No newline at end of file
+#=================================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(ActivityManager(bot))
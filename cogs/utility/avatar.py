@@ -35,4 +35,6 @@ class Avatar(commands.Cog):
         
         await interaction.response.send_message(embed=embed)
     #=============================================================================================================================================================
-        
\ No newline at end of file
+
+def setup(bot):
+    bot.add_cog(Avatar(bot))
@@ -3,6 +3,8 @@ from nextcord import Interaction, SlashOption
 from nextcord.ext import commands
 import logging
 from datetime import datetime
+
+from utils.help_catalog import HelpCatalog
 #=============================================================================================================================================================
 class HelpCommand(commands.Cog):
     """Clean and professional help command for displaying available bot commands"""
@@ -17,6 +19,38 @@ class HelpCommand(commands.Cog):
             "moderation": "Moderation Commands", 
             "utility": "Utility Commands"
         }
+        # (summary in the overview, description on the category page)
+        self.category_descriptions = {
+            "admin": ("Server management and configuration", "Commands for server configuration and management"),
+            "moderation": ("User moderation and channel management", "Commands for moderating users and managing channels"),
+            "utility": ("Information and utility features", "Utility commands for information and server assistance")
+        }
+        
+        # Catalog of the registered slash commands and the embeds rendered from it,
+        # rebuilt whenever the command tree is synced (startup and extension reloads)
+        self.catalog = HelpCatalog(bot)
+        self.category_embeds = {}
+        self.command_embeds = {}
+    
+    @commands.Cog.listener()
+    async def on_commands_synced(self):
+        """Rebuild the catalog once the command tree is final"""
+        self._build_catalog()
+    
+    def _build_catalog(self):
+        """Introspect the registered commands and render every help embed once"""
+        self.catalog.rebuild()
+        self.category_embeds = {category: self._create_help_embed(category) for category in self.categories}
+        self.command_embeds = {name: self._create_command_info_embed(info) for name, info in self.catalog.entries.items()}
+    
+    def _get_category_embed(self, category, user):
+        """Copy of a prerendered category embed for a requester"""
+        if not self.category_embeds:
+            self._build_catalog()
+        embed = self.category_embeds[category].copy()
+        embed.set_footer(text=f"Requested by {user.name}")
+        embed.timestamp = datetime.now()
+        return embed
 #=============================================================================================================================================================        
     @nextcord.slash_command(
         name="help", 
@@ -52,7 +86,9 @@ class HelpCommand(commands.Cog):
             
             # If a specific command was requested
             if command:
-                command_info = self._find_command_info(command)
+                if not self.category_embeds:
+                    self._build_catalog()
+                command_info = self.catalog.get(command)
                 if not command_info:
                     await interaction.followup.send(
                         f"Command `/{command}` not found. Use `/help` to see all available commands.",
@@ -61,17 +97,18 @@ class HelpCommand(commands.Cog):
                     return
                 
                 # Send command-specific help
-                embed = self._create_command_info_embed(command, command_info)
+                embed = self.command_embeds[command_info["name"]].copy()
+                embed.timestamp = datetime.now()
                 await interaction.followup.send(embed=embed)
-                self.logger.info(f"Command info requested by {interaction.user} for /{command}")
+                self.logger.info(f"Command info requested by {interaction.user} for /{command_info['name']}")
                 return
             
             # Default to showing all categories if none specified
             if not category:
                 category = "all"
                 
-            # Create the help embed
-            embed = self._create_help_embed(category, interaction.user)
+            # Copy the prerendered help embed
+            embed = self._get_category_embed(category, interaction.user)
             
             # Send the embed with pagination if needed
             if category == "all":
@@ -90,6 +127,13 @@ class HelpCommand(commands.Cog):
                 ephemeral=True
             )
     
+    @help.on_autocomplete("command")
+    async def help_command_autocomplete(self, interaction: Interaction, command: str):
+        """Suggest command names matching what has been typed so far"""
+        if not self.catalog.entries:
+            self._build_catalog()
+        await interaction.response.send_autocomplete(self.catalog.search(command or ""))
+    
     def _create_category_select_view(self, user):
         """Create dropdown menu for category selection"""
         view = nextcord.ui.View(timeout=180)
@@ -107,15 +151,15 @@ class HelpCommand(commands.Cog):
         
         async def select_callback(interaction: Interaction):
             category = select.values[0]
-            embed = self._create_help_embed(category, user)
-            await interaction.response.edit_message(embed=embed, view=self._create_category_select_view(user))
+            embed = self._get_category_embed(category, user)
+            await interaction.response.edit_message(embed=embed, view=view)
         
         select.callback = select_callback
         view.add_item(select)
         
         return view
     
-    def _create_help_embed(self, category, user):
+    def _create_help_embed(self, category):
         """Create a rich embed with command information"""
         if category == "all":
             title = "Bot Command Guide"
@@ -131,69 +175,47 @@ class HelpCommand(commands.Cog):
         )
         
         # Set author with bot information
-        embed.set_author(
-            name=f"{self.bot.user.name} Help System",
-            icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None
-        )
+        if self.bot.user:
+            embed.set_author(
+                name=f"{self.bot.user.name} Help System",
+                icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None
+            )
         
         # Add commands based on category
         if category == "all":
             # Summary of all command categories
-            admin_commands = self._get_admin_commands(as_list=True)
-            mod_commands = self._get_moderation_commands(as_list=True)
-            utility_commands = self._get_utility_commands(as_list=True)
-            
-            embed.add_field(
-                name="Admin Commands",
-                value=f"{len(admin_commands)} commands - Server management and configuration",
-                inline=False
-            )
-            embed.add_field(
-                name="Moderation Commands",
-                value=f"{len(mod_commands)} commands - User moderation and channel management",
-                inline=False
-            )
-            embed.add_field(
-                name="Utility Commands",
-                value=f"{len(utility_commands)} commands - Information and utility features",
-                inline=False
-            )
+            for name, (summary, _) in self.category_descriptions.items():
+                embed.add_field(
+                    name=self.categories[name],
+                    value=f"{len(self.catalog.by_category(name))} commands - {summary}",
+                    inline=False
+                )
             
             # Add tips field
             embed.add_field(
                 name="Tips",
                 value="• Commands with subcommands will show additional options when selected\n"
                       "• Use `/help command:[command_name]` to see detailed information about a specific command\n"
-                      "• Required parameters are marked with `*`",
+                      "• Required parameters are shown as `<name>`, optional ones as `[name]`",
                 inline=False
             )
         else:
             # Add the requested category commands
             self._add_category_commands(embed, category)
         
-        # Set footer and timestamp
-        embed.set_footer(text=f"Requested by {user.name}")
-        embed.timestamp = datetime.now()
-        
         return embed
     
     def _add_category_commands(self, embed, category):
         """Add appropriate command list to an embed based on category"""
-        if category == "admin":
-            commands = self._get_admin_commands()
-            description = "Commands for server configuration and management"
-        elif category == "moderation":
-            commands = self._get_moderation_commands()
-            description = "Commands for moderating users and managing channels"
-        elif category == "utility":
-            commands = self._get_utility_commands()
-            description = "Utility commands for information and server assistance"
-        else:
+        if category not in self.category_descriptions:
             return
+        commands = "\n".join(
+            f"• `/{info['name']}` - {info['description']}" for info in self.catalog.by_category(category)
+        ) or "No commands loaded"
             
         embed.add_field(
             name=f"{self.categories[category]}",
-            value=description,
+            value=self.category_descriptions[category][1],
             inline=False
         )
         
@@ -234,137 +256,45 @@ class HelpCommand(commands.Cog):
             
         return parts
     
-    def _get_admin_commands(self, as_list=False):
-        """Get formatted list of admin commands"""
-        commands = [
-            "• `/role` - Manage server roles",
-            "• `/role add` - Add a role to users with optional reason",
-            "• `/role remove` - Remove a role from users with optional reason",
-            "• `/role info` - Get detailed information about a role",
-            "• `/logs` - Set up logging channels for moderation actions",
-            "• `/logs set` - Configure which channel receives specific log events",
-            "• `/logs status` - View current logging configuration",
-            "• `/autorole` - Configure automatic role assignment for new members",
-            "• `/autorole add` - Add a role to the autorole list",
-            "• `/autorole remove` - Remove a role from the autorole list",
-            "• `/autorole list` - View all autoroles"
-        ]
-        
-        return commands if as_list else "\n".join(commands)
-    
-    def _get_moderation_commands(self, as_list=False):
-        """Get formatted list of moderation commands"""
-        commands = [
-            "• `/ban` - Ban a user from the server with optional duration and reason",
-            "• `/unban` - Unban a user from the server",
-            "• `/baninfo` - Get information about a banned user",
-            "• `/banlist` - View all banned users",
-            "• `/kick` - Kick a user from the server with optional reason",
-            "• `/softban` - Ban and immediately unban a user to delete their messages",
-            "• `/mute` - Mute a user in text channels with optional duration",
-            "• `/unmute` - Unmute a previously muted user",
-            "• `/deafen` - Deafen a user in voice channels",
-            "• `/undeafen` - Undeafen a user in voice channels",
-            "• `/lock` - Lock a channel to prevent messages from specific roles",
-            "• `/unlock` - Unlock a previously locked channel",
-            "• `/slowmode` - Set slowmode cooldown in a channel",
-            "• `/purge` - Delete multiple messages with filters",
-            "• `/clear` - Clear all messages in a channel with confirmation"
-        ]
-        
-        return commands if as_list else "\n".join(commands)
-    
-    def _get_utility_commands(self, as_list=False):
-        """Get formatted list of utility commands"""
-        commands = [
-            "• `/serverinfo` - Get detailed information about the server",
-            "• `/userinfo` - Get information about a user",
-            "• `/avatar` - View a user's avatar in full size with download options",
-            "• `/activity` - Set a custom status for the bot (admin only)",
-            "• `/ping` - Check the bot's response time and API latency",
-            "• `/debug` - Show detailed bot diagnostics (admin only)",
-            "• `/help` - Display this help message with detailed command information"
-        ]
-        
-        return commands if as_list else "\n".join(commands)
-    
-    def _find_command_info(self, command_name):
-        """Find detailed information about a specific command"""
-        # Remove leading slash if provided
-        if command_name.startswith('/'):
-            command_name = command_name[1:]
-            
-        # This would be dynamically generated in a real bot
-        # Just showing a simplified example here
-        command_details = {
-            "ban": {
-                "category": "moderation",
-                "description": "Ban a user from the server",
-                "usage": "/ban [user] <duration> <reason>",
-                "examples": [
-                    "/ban @User Breaking server rules",
-                    "/ban @User 7d Repeated violations"
-                ],
-                "permissions": ["BAN_MEMBERS"],
-                "parameters": [
-                    {"name": "user", "description": "The user to ban", "required": True},
-                    {"name": "duration", "description": "Duration of the ban (e.g. 1d, 1w)", "required": False},
-                    {"name": "reason", "description": "Reason for the ban", "required": False}
-                ]
-            },
-            "help": {
-                "category": "utility",
-                "description": "Display all available commands",
-                "usage": "/help <category> <command>",
-                "examples": [
-                    "/help",
-                    "/help category:moderation",
-                    "/help command:ban"
-                ],
-                "permissions": [],
-                "parameters": [
-                    {"name": "category", "description": "Command category to display", "required": False},
-                    {"name": "command", "description": "Specific command to get help for", "required": False}
-                ]
-            },
-            # Add more commands as needed
-        }
-        
-        return command_details.get(command_name.lower())
+    def _format_usage(self, info):
+        """Usage line with required parameters as <name> and optional ones as [name]"""
+        params = " ".join(
+            f"<{param['name']}>" if param["required"] else f"[{param['name']}]" for param in info["options"]
+        )
+        return f"/{info['name']} {params}".rstrip()
     
-    def _create_command_info_embed(self, command_name, info):
+    def _create_command_info_embed(self, info):
         """Create a detailed embed for a specific command"""
         embed = nextcord.Embed(
-            title=f"Command: /{command_name}",
+            title=f"Command: /{info['name']}",
             description=info["description"],
             color=self.embed_color
         )
         
-        # Add usage information
-        embed.add_field(
-            name="Usage",
-            value=f"`{info['usage']}`",
-            inline=False
-        )
-        
-        # Add examples
-        if info["examples"]:
+        # Commands with subcommands can't be used on their own
+        if info["subcommands"]:
             embed.add_field(
-                name="Examples",
-                value="\n".join([f"`{example}`" for example in info["examples"]]),
+                name="Subcommands",
+                value="\n".join(f"`/{name}` - {self.catalog.entries[name]['description']}" for name in info["subcommands"]),
+                inline=False
+            )
+        else:
+            embed.add_field(
+                name="Usage",
+                value=f"`{self._format_usage(info)}`",
                 inline=False
             )
         
         # Add parameters
-        if info["parameters"]:
+        if info["options"]:
             param_text = ""
-            for param in info["parameters"]:
+            for param in info["options"]:
                 required = "Required" if param["required"] else "Optional"
                 param_text += f"• **{param['name']}** - {param['description']} ({required})\n"
                 
             embed.add_field(
                 name="Parameters",
-                value=param_text,
+                value=param_text[:1024],
                 inline=False
             )
         
@@ -379,7 +309,7 @@ class HelpCommand(commands.Cog):
         else:
             embed.add_field(
                 name="Required Permissions",
-                value="None - Anyone can use this command",
+                value="None by default - the command checks permissions when used",
                 inline=False
             )
             
@@ -391,7 +321,9 @@ class HelpCommand(commands.Cog):
         )
         
         embed.set_footer(text="Type /help for a list of all commands")
-        embed.timestamp = datetime.now()
         
         return embed
-#=============================================================================================================================================================
\ No newline at end of file
+#=============================================================================================================================================================
+
+def setup(bot):
+    bot.add_cog(HelpCommand(bot))
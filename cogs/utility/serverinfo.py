@@ -5,6 +5,8 @@ from datetime import datetime
 import time
 import logging
 
+from utils.response_cache import ResponseCache
+
 class ServerInfo(commands.Cog):
     """Cog for retrieving and displaying detailed server information"""
     
@@ -18,6 +20,12 @@ class ServerInfo(commands.Cog):
     )
     async def serverinfo(self, interaction: Interaction):
         """Display comprehensive information about the current Discord server"""
+        # Per-user and per-guild cooldown
+        retry_after = self.bot.response_cache.retry_after(interaction.user.id, interaction.guild_id)
+        if retry_after:
+            await interaction.response.send_message(embed=ResponseCache.cooldown_embed(retry_after), ephemeral=True)
+            return
+        
         try:
             # Defer response to allow time for processing
             await interaction.response.defer()
@@ -26,12 +34,15 @@ class ServerInfo(commands.Cog):
             if not guild:
                 await interaction.followup.send("This command can only be used in a server.")
                 return
-                
-            # Collect server statistics
-            stats = self._collect_server_stats(guild)
             
-            # Create and send the embed
-            embed = self._create_server_info_embed(guild, stats, interaction.user)
+            # Reuse the rendered embed until the server changes or it expires
+            embed = self.bot.response_cache.get("serverinfo", guild.id)
+            if embed is None:
+                stats = await self._get_server_stats(guild)
+                embed = self._create_server_info_embed(guild, stats)
+                self.bot.response_cache.put("serverinfo", guild.id, embed)
+            
+            embed.set_footer(text=f"Requested by {interaction.user.name}")
             await interaction.followup.send(embed=embed)
             
             self.logger.info(f"Server info displayed for {guild.name} (ID: {guild.id}) - requested by {interaction.user}")
@@ -40,11 +51,28 @@ class ServerInfo(commands.Cog):
             self.logger.error(f"Error in serverinfo command: {str(e)}", exc_info=True)
             await interaction.followup.send("Sorry, I couldn't retrieve the server information. Please try again later.")
     
-    def _collect_server_stats(self, guild):
+    async def _get_server_stats(self, guild):
+        """Collect stats for the server, with member and online counts from the API"""
+        # Approximate member and online counts come from the API, so no members have to be cached or walked
+        try:
+            counts = await self.bot.fetch_guild(guild.id, with_counts=True)
+            total_members = counts.approximate_member_count or guild.member_count
+            online_members = counts.approximate_presence_count
+        except nextcord.HTTPException as e:
+            self.logger.warning(f"Could not fetch member counts for {guild.name} (ID: {guild.id}): {e}")
+            total_members, online_members = guild.member_count, None
+        
+        stats = self._collect_server_stats(guild, total_members, online_members)
+        
+        # The owner may not be cached when the member cache is lazy
+        stats["owner"] = await self.bot.member_cache.get_member(guild, guild.owner_id)
+        return stats
+    
+    def _collect_server_stats(self, guild, total_members, online_members):
         """Collect all statistics about the server"""
         stats = {
-            "total_members": guild.member_count,
-            "online_members": sum(1 for member in guild.members if member.status != nextcord.Status.offline) if guild.members else 0,
+            "total_members": total_members,
+            "online_members": online_members,
             "total_text_channels": len(guild.text_channels),
             "total_voice_channels": len(guild.voice_channels),
             "total_categories": len(guild.categories),
@@ -68,7 +96,7 @@ class ServerInfo(commands.Cog):
         }
         return levels.get(level, str(level).capitalize())
         
-    def _create_server_info_embed(self, guild, stats, user):
+    def _create_server_info_embed(self, guild, stats):
         """Create a rich embed with the server information"""
         embed = nextcord.Embed(
             title=f"{guild.name} Server Information",
@@ -85,19 +113,22 @@ class ServerInfo(commands.Cog):
             embed.set_image(url=guild.banner.url)
         
         # Section 1: General Info
-        owner = guild.owner
+        owner = stats["owner"]
+        owner_text = f"{owner.mention} (`{owner.name}`)" if owner else f"<@{guild.owner_id}>"
         embed.add_field(
             name="📋 General",
-            value=f"**Owner:** {owner.mention} (`{owner.name}`)\n"
+            value=f"**Owner:** {owner_text}\n"
                   f"**Created:** <t:{stats['creation_timestamp']}:F>\n"
                   f"**Age:** <t:{stats['creation_timestamp']}:R>",
             inline=False
         )
         
         # Section 2: Server Population
+        online = f"{stats['online_members']:,}" if stats['online_members'] is not None else "Unknown"
         embed.add_field(
             name="👥 Population",
             value=f"**Members:** {stats['total_members']:,}\n"
+                  f"**Online:** {online}\n"
                   f"**Roles:** {stats['total_roles']:,}\n"
                   f"**Boost Level:** {guild.premium_tier} "
                   f"({guild.premium_subscription_count:,} boosts)",
@@ -138,8 +169,8 @@ class ServerInfo(commands.Cog):
                 inline=False
             )
         
-        # Finishing touches
-        embed.set_footer(text=f"Requested by {user.name}")
         embed.timestamp = datetime.now()
-        
-        return embed
\ No newline at end of file
+        return embed
+
+def setup(bot):
+    bot.add_cog(ServerInfo(bot))
@@ -1,12 +1,15 @@
 import nextcord
 from nextcord.ext import commands
 import time
-import psutil
-import os
 import platform
 import logging
 from typing import Optional
 import sys
+import math
+
+from utils.guild_features import GuildFeature
+from utils.response_cache import ResponseCache
+from utils.system_sampler import SystemSampler
 
 # Bot version & configuration
 BOT_VERSION = 'v1.0.0'  # Update this when you update your bot
@@ -16,6 +19,8 @@ CONFIG = {
     "GITHUB_URL": "https://github.com/PixelMCN/Stellaris-Alpha",
     "BANNER_URL": "https://raw.githubusercontent.com/PixelMCN/Stellaris-Alpha/refs/heads/main/assets/banner.png"
 }
+MAX_SHARD_LINES = 15  # Shards listed in /status, slowest first
+MAX_CLUSTER_LINES = 10  # Clusters listed in /status
 
 class StatusPanelView(nextcord.ui.View):
     """UI View containing support links and resources"""
@@ -48,6 +53,14 @@ class Status(commands.Cog):
         self.bot = bot
         self.logger = logging.getLogger('bot.Status')
         self.start_time = time.time()
+        
+        # Sample system resources in the background so /status never blocks on psutil
+        self.sampler = SystemSampler()
+        self.sampler.start()
+    
+    def cog_unload(self):
+        """Stop the background sampler when the cog is unloaded"""
+        self.sampler.stop()
     
     @nextcord.slash_command(
         name="status", 
@@ -55,15 +68,18 @@ class Status(commands.Cog):
     )
     async def status(self, interaction: nextcord.Interaction):
         """Displays diagnostic information about the bot and system resources"""
+        # Per-user and per-guild cooldown
+        retry_after = self.bot.response_cache.retry_after(interaction.user.id, interaction.guild_id)
+        if retry_after:
+            await interaction.response.send_message(embed=ResponseCache.cooldown_embed(retry_after), ephemeral=True)
+            return
+        
         try:
             # Defer response to allow time for resource collection
             await interaction.response.defer()
             
-            # Collect system and bot metrics
-            metrics = self._collect_metrics()
-            
-            # Create and send the embed with metrics
-            embed = self._create_status_embed(metrics, interaction.user)
+            # Collect metrics and create the embed (or reuse a recent one)
+            embed = self._get_status_embed(interaction.user)
             view = StatusPanelView()
             
             await interaction.followup.send(embed=embed, view=view)
@@ -80,14 +96,17 @@ class Status(commands.Cog):
     )
     async def status_prefix(self, ctx):
         """Legacy prefix command version of the status command"""
+        # Per-user and per-guild cooldown
+        retry_after = self.bot.response_cache.retry_after(ctx.author.id, ctx.guild.id if ctx.guild else None)
+        if retry_after:
+            await ctx.send(embed=ResponseCache.cooldown_embed(retry_after))
+            return
+        
         try:
             # Show typing indicator while collecting metrics
             async with ctx.typing():
-                # Collect system and bot metrics
-                metrics = self._collect_metrics()
-                
-                # Create and send the embed with metrics
-                embed = self._create_status_embed(metrics, ctx.author)
+                # Collect metrics and create the embed (or reuse a recent one)
+                embed = self._get_status_embed(ctx.author)
                 view = StatusPanelView()
                 
                 await ctx.send(embed=embed, view=view)
@@ -98,53 +117,117 @@ class Status(commands.Cog):
             self.logger.error(f"Error in status prefix command: {str(e)}", exc_info=True)
             await ctx.send("Failed to retrieve system diagnostics. Please try again later.")
     
+    def _get_status_embed(self, user):
+        """Status embed for a requester, reusing one rendered in the last few seconds"""
+        embed = self.bot.response_cache.get("status", "global")
+        if embed is None:
+            embed = self._create_status_embed(self._collect_metrics())
+            self.bot.response_cache.put("status", "global", embed)
+        
+        # Set footer with user information
+        avatar_url = user.avatar.url if user.avatar else None
+        embed.set_footer(text=f'Requested by {user}', icon_url=avatar_url)
+        return embed
+    
     def _collect_metrics(self):
         """Collect all system and bot metrics in a structured format"""
-        # Get process information
-        process = psutil.Process()
+        # Latest background sample; only sampled inline before the first one exists
+        snapshot = self.sampler.latest or self.sampler.sample_now()
         
         # System resources data
-        system_data = {
-            "cpu_usage": psutil.cpu_percent(interval=0.5),  # Short interval for responsiveness
-            "memory_total": round(psutil.virtual_memory().total / (1024 * 1024)),
-            "memory_available": round(psutil.virtual_memory().available / (1024 * 1024)),
-            "disk_free": round(psutil.disk_usage('/').free / (1024 * 1024 * 1024)),
-            "disk_total": round(psutil.disk_usage('/').total / (1024 * 1024 * 1024)),
-            "platform": f"{platform.system()} {platform.release()}",
-            "cpu_cores": f"{psutil.cpu_count(logical=False)} physical ({psutil.cpu_count(logical=True)} logical)",
-            "arch": platform.machine()
-        }
+        system_data = dict(self.sampler.static)
+        system_data.update({key: snapshot[key] for key in (
+            "cpu_usage", "memory_total", "memory_used", "memory_percent", "disk_free", "disk_total", "disk_percent"
+        )})
         
-        # Calculate memory percentage
-        system_data["memory_used"] = system_data["memory_total"] - system_data["memory_available"]
-        system_data["memory_percent"] = round((system_data["memory_used"] / system_data["memory_total"]) * 100)
-        system_data["disk_percent"] = round((system_data["disk_free"] / system_data["disk_total"]) * 100)
+        # Min/avg/max over the last hour
+        history_data = {
+            "cpu_usage": self.sampler.summary("cpu_usage"),
+            "memory_percent": self.sampler.summary("memory_percent"),
+            "rss": self.sampler.summary("rss"),
+            "samples": len(self.sampler.history)
+        }
         
-        # Bot information
+        # Bot information (population totals are maintained incrementally by BotStats)
         bot_data = {
             "version": BOT_VERSION,
             "nextcord_version": nextcord.__version__,
             "python_version": platform.python_version(),
             "uptime": self._format_uptime(self.start_time),
             "latency": round(self.bot.latency * 1000),
-            "guilds": len(self.bot.guilds),
-            "users": sum(guild.member_count for guild in self.bot.guilds),
-            "channels": sum(len(guild.channels) for guild in self.bot.guilds),
-            "process_id": os.getpid()
+            "guilds": self.bot.bot_stats.guilds,
+            "users": self.bot.bot_stats.members,
+            "channels": self.bot.bot_stats.channels,
+            "process_id": self.sampler.static["process_id"]
         }
         
+        # Per-shard latency and guild counts (only when sharded)
+        shard_data = None
+        if isinstance(self.bot, nextcord.AutoShardedClient):
+            stats = self.bot.bot_stats
+            shard_data = {
+                "count": self.bot.shard_count,
+                "shards": [
+                    (shard_id, round(latency * 1000) if math.isfinite(latency) else None, stats.shard_guilds[shard_id])
+                    for shard_id, latency in self.bot.latencies
+                ]
+            }
+        
+        # Stats reported by every cluster (only when running under launcher.py)
+        cluster_data = None
+        if self.bot.cluster and self.bot.cluster.clusters:
+            clusters = self.bot.cluster.clusters
+            cluster_data = {
+                "current": self.bot.cluster.cluster_id,
+                # Totals leave out clusters that stopped reporting
+                "guilds": self.bot.cluster.total_guilds,
+                "members": self.bot.cluster.total_members,
+                "clusters": sorted(clusters.items())
+            }
+        
         # Process-specific memory info
-        process_data = {
-            "rss": round(process.memory_info().rss / (1024 * 1024)),
-            "vms": round(process.memory_info().vms / (1024 * 1024)),
-            "threads": process.num_threads()
+        process_data = {key: snapshot[key] for key in ("rss", "vms", "threads", "process_cpu")}
+        
+        # Member cache policy and the guilds holding the most cached members
+        member_cache = self.bot.member_cache
+        counts = member_cache.counts()
+        cache_data = {
+            "mode": member_cache.mode,
+            "cached": sum(count for _, count in counts),
+            "chunked": sum(1 for guild, _ in counts if guild.chunked),
+            "chunks": member_cache.chunks,
+            "evictions": member_cache.evictions,
+            "top_guilds": counts[:3]
         }
         
+        # Guild feature flags and the listener events they short-circuited
+        features = self.bot.guild_features
+        feature_data = {
+            "message_logs": features.count(GuildFeature.MESSAGE_LOGS),
+            "autorole": features.count(GuildFeature.AUTOROLE),
+            "anti_raid": features.count(GuildFeature.ANTI_RAID),
+            "skipped": sum(features.skipped.values()),
+            "top_skipped": features.skipped.most_common(3)
+        }
+        
+        # Response cache hit rates per command
+        responses = self.bot.response_cache
+        response_data = [
+            (command, responses.hits[command], responses.hits[command] + responses.misses[command], responses.hit_rate(command))
+            for command in responses.ttls
+        ]
+        
         # Combine all metrics
         return {
             "system": system_data,
+            "history": history_data,
             "bot": bot_data,
-            "process": process_data
+            "shards": shard_data,
+            "clusters": cluster_data,
+            "process": process_data,
+            "member_cache": cache_data,
+            "features": feature_data,
+            "responses": response_data
         }
     
     def _format_uptime(self, start_time):
@@ -165,7 +248,7 @@ class Status(commands.Cog):
         else:
             return f"{seconds}s"
     
-    def _create_status_embed(self, metrics, user):
+    def _create_status_embed(self, metrics):
         """Create a rich embed with all diagnostic information"""
         embed = nextcord.Embed(
             color=0x5865F2,  # Discord Blurple
@@ -194,6 +277,19 @@ class Status(commands.Cog):
             inline=False
         )
         
+        # Last Hour Field (min / avg / max of the background samples)
+        hist = metrics["history"]
+        embed.add_field(
+            name='Last Hour (min / avg / max)',
+            value=f'```ansi\n'
+                  f'CPU Usage   : {self._format_range(hist["cpu_usage"], "%")}\n'
+                  f'Memory      : {self._format_range(hist["memory_percent"], "%")}\n'
+                  f'RSS Memory  : {self._format_range(hist["rss"], "MB")}\n'
+                  f'Samples     : {hist["samples"]:,}\n'
+                  f'```',
+            inline=False
+        )
+        
         # Bot Statistics Field
         bot = metrics["bot"]
         embed.add_field(
@@ -212,6 +308,41 @@ class Status(commands.Cog):
             inline=False
         )
         
+        # Shards Field, slowest shards first
+        shards = metrics["shards"]
+        if shards:
+            ordered = sorted(shards["shards"], key=lambda shard: math.inf if shard[1] is None else shard[1], reverse=True)
+            lines = "".join(
+                f'Shard {shard_id:<6}: '
+                + (f'{self._get_ansi_status(latency, 100, 200)}{latency}ms\u001b[0m' if latency is not None else '\u001b[31;1moffline\u001b[0m')
+                + f' | {guilds:,} servers\n'
+                for shard_id, latency, guilds in ordered[:MAX_SHARD_LINES]
+            )
+            if len(ordered) > MAX_SHARD_LINES:
+                lines += f'... and {len(ordered) - MAX_SHARD_LINES} more\n'
+            embed.add_field(
+                name=f'Shards ({len(shards["shards"])} of {shards["count"]} in this process)',
+                value=f'```ansi\n{lines}```',
+                inline=False
+            )
+        
+        # Clusters Field
+        clusters = metrics["clusters"]
+        if clusters:
+            lines = ""
+            for cluster_id, cluster in clusters["clusters"][:MAX_CLUSTER_LINES]:
+                health = '\u001b[32;1mup\u001b[0m' if cluster["healthy"] else f'\u001b[31;1mstale {cluster["age"]:.0f}s\u001b[0m'
+                marker = '*' if cluster_id == clusters["current"] else ' '
+                lines += (f'{marker}Cluster {cluster_id:<3}: {health} | {cluster["guilds"]:,} servers | '
+                          f'{len(cluster["shards"])} shards | {cluster["restarts"]} restarts\n')
+            if len(clusters["clusters"]) > MAX_CLUSTER_LINES:
+                lines += f'... and {len(clusters["clusters"]) - MAX_CLUSTER_LINES} more\n'
+            embed.add_field(
+                name=f'Clusters ({clusters["guilds"]:,} servers, {clusters["members"]:,} users in total)',
+                value=f'```ansi\n{lines}```',
+                inline=False
+            )
+        
         # Process Memory Usage Field
         proc = metrics["process"]
         embed.add_field(
@@ -219,22 +350,71 @@ class Status(commands.Cog):
             value=f'```ansi\n'
                   f'RSS Memory  : \u001b[33;1m{proc["rss"]:,}MB\u001b[0m\n'
                   f'Virtual Mem : \u001b[33;1m{proc["vms"]:,}MB\u001b[0m\n'
+                  f'Process CPU : \u001b[33;1m{proc["process_cpu"]}%\u001b[0m\n'
                   f'Threads     : \u001b[36;1m{proc["threads"]}\u001b[0m\n'
                   f'```',
             inline=False
         )
         
+        # Member Cache Field
+        cache = metrics["member_cache"]
+        top_guilds = "".join(
+            f'  {guild.name[:22]:<22}: {count:,}\n' for guild, count in cache["top_guilds"]
+        )
+        embed.add_field(
+            name='Member Cache',
+            value=f'```ansi\n'
+                  f'Mode        : \u001b[34;1m{cache["mode"]}\u001b[0m\n'
+                  f'Cached      : \u001b[36;1m{cache["cached"]:,} members\u001b[0m\n'
+                  f'Chunked     : \u001b[36;1m{cache["chunked"]:,} servers\u001b[0m\n'
+                  f'Chunk/Evict : {cache["chunks"]:,} / {cache["evictions"]:,}\n'
+                  f'{top_guilds}'
+                  f'```',
+            inline=False
+        )
+        
+        # Guild Features Field
+        feat = metrics["features"]
+        top_skipped = "".join(
+            f'  {event:<24}: {count:,}\n' for event, count in feat["top_skipped"]
+        )
+        embed.add_field(
+            name='Guild Features',
+            value=f'```ansi\n'
+                  f'Message Logs: \u001b[36;1m{feat["message_logs"]:,} servers\u001b[0m\n'
+                  f'Autorole    : \u001b[36;1m{feat["autorole"]:,} servers\u001b[0m\n'
+                  f'Anti-Raid   : \u001b[36;1m{feat["anti_raid"]:,} servers\u001b[0m\n'
+                  f'Skipped Evts: \u001b[32;1m{feat["skipped"]:,}\u001b[0m\n'
+                  f'{top_skipped}'
+                  f'```',
+            inline=False
+        )
+        
+        # Response Cache Field
+        lines = "".join(
+            f'{command:<12}: \u001b[36;1m{rate:.0%}\u001b[0m ({hits:,} / {total:,})\n'
+            for command, hits, total, rate in metrics["responses"]
+        )
+        embed.add_field(
+            name='Response Cache (hit rate)',
+            value=f'```ansi\n{lines}```',
+            inline=False
+        )
+        
         # Set a banner image if available
         if CONFIG["BANNER_URL"]:
             embed.set_image(url=CONFIG["BANNER_URL"])
         
-        # Set footer with user information and timestamp
-        avatar_url = user.avatar.url if user.avatar else None
-        embed.set_footer(text=f'Requested by {user}', icon_url=avatar_url)
+        # Timestamp of when the metrics were collected
         embed.timestamp = nextcord.utils.utcnow()
         
         return embed
     
+    def _format_range(self, values, unit):
+        """Format a (min, avg, max) tuple"""
+        low, avg, high = values
+        return f'{low:,.0f} / {avg:,.0f} / {high:,.0f}{unit}'
+    
     def _get_ansi_status(self, value, warning_threshold, critical_threshold):
         """Return ANSI color code based on value thresholds"""
         if value < warning_threshold:
@@ -242,4 +422,7 @@ class Status(commands.Cog):
         elif value < critical_threshold:
             return "\u001b[33;1m"  # Yellow
         else:
-            return "\u001b[31;1m"  # Red
\ No newline at end of file
+            return "\u001b[31;1m"  # Red
+
+def setup(bot):
+    bot.add_cog(Status(bot))
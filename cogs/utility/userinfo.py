@@ -6,6 +6,8 @@ from datetime import datetime
 import time
 from typing import Optional
 
+from utils.response_cache import ResponseCache
+
 class UserInfo(commands.Cog):
     """Command for getting information about a user"""
     
@@ -22,6 +24,25 @@ class UserInfo(commands.Cog):
         # If no user is specified, use the command invoker
         user = user or interaction.user
         
+        # Per-user and per-guild cooldown
+        retry_after = self.bot.response_cache.retry_after(interaction.user.id, interaction.guild_id)
+        if retry_after:
+            await interaction.response.send_message(embed=ResponseCache.cooldown_embed(retry_after), ephemeral=True)
+            return
+        
+        # Reuse the rendered embed until the member changes or it expires
+        cache_key = (interaction.guild_id, user.id)
+        embed = self.bot.response_cache.get("userinfo", cache_key)
+        if embed is None:
+            embed = self._build_embed(user)
+            self.bot.response_cache.put("userinfo", cache_key, embed)
+        
+        embed.set_footer(text=f"Requested by {interaction.user.name}")
+        
+        await interaction.response.send_message(embed=embed)
+    
+    def _build_embed(self, user: nextcord.Member) -> nextcord.Embed:
+        """Render the user information embed"""
         # Get account creation date and server join date
         created_at_timestamp = int(time.mktime(user.created_at.timetuple()))
         creation_date = f"<t:{created_at_timestamp}:F>"
@@ -118,7 +139,8 @@ class UserInfo(commands.Cog):
         else:
             embed.add_field(name="Key Permissions", value=permissions_text, inline=False)
         
-        embed.set_footer(text=f"Requested by {interaction.user.name}")
         embed.timestamp = datetime.now()
-        
-        await interaction.response.send_message(embed=embed)
\ No newline at end of file
+        return embed
+
+def setup(bot):
+    bot.add_cog(UserInfo(bot))
@@ -0,0 +1,135 @@
+"""
+Run the bot as several worker processes, each owning a group of shards.
+
+The launcher splits SHARD_COUNT shards over CLUSTER_COUNT workers, starts
+one `main.py` process per cluster and runs the coordinator socket the
+workers report to. A worker that exits is restarted with a backoff while the
+others keep running. Stop everything with Ctrl+C or SIGTERM.
+
+    SHARD_COUNT=16 CLUSTER_COUNT=4 python launcher.py
+"""
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from utils.logging_setup import setup_logging
+from utils.cluster import ClusterCoordinator, DEFAULT_SOCKET
+
+logger = logging.getLogger('bot.Launcher')
+
+# Workers run main.py from next to this file, whatever the current directory is
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+# Restart backoff: doubles per quick crash up to the max, and resets once a worker stays up
+RESTART_BACKOFF_MAX = 60
+STABLE_AFTER = 300
+#=============================================================================================================================================================
+def split_shards(shard_count: int, cluster_count: int):
+    """Spread shard IDs as evenly as possible over clusters, keeping each cluster's IDs contiguous"""
+    size, extra = divmod(shard_count, cluster_count)
+    clusters, start = [], 0
+    for cluster_id in range(cluster_count):
+        end = start + size + (1 if cluster_id < extra else 0)
+        clusters.append(list(range(start, end)))
+        start = end
+    return clusters
+
+def worker_env(cluster_id: int, shard_ids, shard_count: int, socket_path: str) -> dict:
+    """Environment for one worker: its shards plus per-process file names and ports"""
+    env = dict(os.environ)
+    env.update({
+        "CLUSTER_ID": str(cluster_id),
+        "CLUSTER_SOCKET": socket_path,
+        "SHARD_COUNT": str(shard_count),
+        "SHARD_IDS": ",".join(str(shard_id) for shard_id in shard_ids)
+    })
+
+    # Processes can't share a rotating log file or a listening port; the SQLite stores are shared on purpose
+    log_file = os.getenv("LOG_FILE", "./logs/bot.jsonl")
+    if log_file:
+        root, ext = os.path.splitext(log_file)
+        env["LOG_FILE"] = f"{root}-cluster{cluster_id}{ext}"
+    if os.getenv("METRICS_PORT"):
+        env["METRICS_PORT"] = str(int(os.getenv("METRICS_PORT")) + cluster_id)
+    return env
+
+class Launcher:
+    def __init__(self, shard_count: int, cluster_count: int, socket_path: str):
+        self.shard_count = shard_count
+        self.clusters = split_shards(shard_count, cluster_count)
+        self.coordinator = ClusterCoordinator(socket_path)
+        self.processes = {}
+        self.stopping = asyncio.Event()
+
+    async def run_worker(self, cluster_id: int, shard_ids) -> None:
+        """Keep one worker running until the launcher stops"""
+        backoff = 1
+        env = worker_env(cluster_id, shard_ids, self.shard_count, self.coordinator.path)
+        while not self.stopping.is_set():
+            started = time.monotonic()
+            process = await asyncio.create_subprocess_exec(sys.executable, MAIN_SCRIPT, env=env)
+            self.processes[cluster_id] = process
+            logger.info(f"Cluster {cluster_id} started (pid {process.pid}, shards {shard_ids[0]}-{shard_ids[-1]})")
+
+            code = await process.wait()
+            if self.stopping.is_set():
+                break
+
+            # Quick crashes back off further; a worker that stayed up starts over
+            backoff = 1 if time.monotonic() - started > STABLE_AFTER else min(backoff * 2, RESTART_BACKOFF_MAX)
+            self.coordinator.restarts[cluster_id] = self.coordinator.restarts.get(cluster_id, 0) + 1
+            logger.warning(f"Cluster {cluster_id} exited with code {code}, restarting in {backoff}s")
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+
+    def request_stop(self) -> None:
+        # Set right away so workers exiting from the same signal aren't restarted
+        self.stopping.set()
+        asyncio.ensure_future(self.stop())
+
+    async def stop(self) -> None:
+        """Terminate every worker and wait for them to exit"""
+        self.stopping.set()
+        for process in self.processes.values():
+            if process.returncode is None:
+                process.terminate()
+        await asyncio.gather(*(process.wait() for process in self.processes.values()))
+
+    async def run(self) -> None:
+        await self.coordinator.start()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.request_stop)
+
+        logger.info(f"Launching {len(self.clusters)} clusters for {self.shard_count} shards")
+        try:
+            await asyncio.gather(*(
+                self.run_worker(cluster_id, shard_ids)
+                for cluster_id, shard_ids in enumerate(self.clusters)
+                if shard_ids
+            ))
+        finally:
+            await self.coordinator.stop()
+
+def main():
+    setup_logging()
+    shard_count = int(os.getenv("SHARD_COUNT", "0") or 0)
+    cluster_count = int(os.getenv("CLUSTER_COUNT", "0") or 0)
+    if shard_count < 1 or cluster_count < 1:
+        logger.error("Set SHARD_COUNT and CLUSTER_COUNT to positive numbers to run clusters")
+        sys.exit(1)
+
+    launcher = Launcher(shard_count, min(cluster_count, shard_count), os.getenv("CLUSTER_SOCKET", DEFAULT_SOCKET))
+    asyncio.run(launcher.run())
+
+if __name__ == "__main__":
+    main()
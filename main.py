@@ -1,4 +1,7 @@
 import os
+import time
+import asyncio
+import logging
 import nextcord
 from nextcord.ext import commands
 from dotenv import load_dotenv
@@ -6,44 +9,33 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Set up logging before anything else logs
+from utils.logging_setup import setup_logging
+setup_logging()
+logger = logging.getLogger('bot')
+
 # Import utilities
 from utils.error_handler import ErrorHandler
 from utils.embed_helper import EmbedHelper, EmbedColors
 from utils.time_helper import TimeHelper
+from utils.message_archive import MessageArchive
+from utils.case_store import CaseStore
+from utils.guild_features import GuildFeatures
+from utils.bot_stats import BotStats
+from utils.instrumentation import instrument
+from utils.metrics import MetricsServer, registry
+from utils.gateway_recorder import GatewayRecorder
+from utils.cluster import ClusterClient
+from utils.extensions import ExtensionLoader
+from utils.command_sync import CommandSync, DEFAULT_CACHE_PATH
+from utils.member_cache import MemberCache
+from utils.response_cache import ResponseCache
+from utils.rest_scheduler import RestScheduler, MAX_IN_FLIGHT, BULK_MAX_IN_FLIGHT
+from utils.dm_outbox import DMOutbox, DM_CONCURRENCY, DM_TIMEOUT
 
 # Bot version
 BOT_VERSION = 'v1.0.1'
 
-#importing moderation cogs
-#=============================================================================================================================================================
-from cogs.moderation.ban import BanCommands
-from cogs.moderation.kick import KickCommands
-from cogs.moderation.purge import PurgeCommands
-from cogs.moderation.lock import LockCommands
-from cogs.moderation.slowmode import SlowmodeCommands
-from cogs.moderation.mute import MuteCommands
-from cogs.moderation.deafen import DeafenCommands
-#=============================================================================================================================================================
-
-
-#importing admin cogs
-#=============================================================================================================================================================
-from cogs.admin.role import RoleCommands
-from cogs.admin.logs import LogsCommands
-from cogs.admin.autorole import Autorole
-#=============================================================================================================================================================
-
-
-#importing utility cogs
-#=============================================================================================================================================================
-from cogs.utility.help import HelpCommand
-from cogs.utility.activity import ActivityManager
-from cogs.utility.status import Status
-from cogs.utility.avatar import Avatar
-from cogs.utility.serverinfo import ServerInfo
-from cogs.utility.userinfo import UserInfo
-#=============================================================================================================================================================
-
 BOT_TOKEN = os.getenv("DISCORD_TOKEN")
 
 # INTENTS
@@ -52,8 +44,31 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
+# SHARDING (optional)
+# SHARD_COUNT="auto" lets Discord pick the count; SHARD_IDS runs a subset of SHARD_COUNT shards in this process
+SHARD_COUNT = os.getenv("SHARD_COUNT", "").strip().lower()
+SHARD_IDS = [int(shard_id) for shard_id in os.getenv("SHARD_IDS", "").split(",") if shard_id.strip()]
+
+# MEMBER CACHE ("full" chunks every guild at startup, "lazy" chunks guilds when a command needs them)
+MEMBER_CACHE_MODE = os.getenv("MEMBER_CACHE_MODE", "full").lower()
+
 # BOT INSTANCE
-bot = commands.Bot(command_prefix="s!", intents=intents, help_command=None)
+if SHARD_COUNT or SHARD_IDS:
+    bot = commands.AutoShardedBot(
+        command_prefix="s!",
+        intents=intents,
+        help_command=None,
+        chunk_guilds_at_startup=MEMBER_CACHE_MODE == "full",
+        shard_count=int(SHARD_COUNT) if SHARD_COUNT not in ("", "auto") else None,
+        shard_ids=SHARD_IDS or None
+    )
+else:
+    bot = commands.Bot(
+        command_prefix="s!",
+        intents=intents,
+        help_command=None,
+        chunk_guilds_at_startup=MEMBER_CACHE_MODE == "full"
+    )
 
 # Make utilities available to all cogs
 bot.error_handler = ErrorHandler(bot)
@@ -63,52 +78,150 @@ bot.embed_colors = EmbedColors
 bot.time_helper = TimeHelper
 bot.version = BOT_VERSION
 
-# Load Moderation cogs
-#=============================================================================================================================================================
-bot.add_cog(BanCommands(bot))
-bot.add_cog(KickCommands(bot))
-bot.add_cog(PurgeCommands(bot))
-bot.add_cog(LockCommands(bot))
-bot.add_cog(SlowmodeCommands(bot))
-bot.add_cog(MuteCommands(bot))
-bot.add_cog(DeafenCommands(bot))
-#=============================================================================================================================================================
-# Load Admin cogs
-#=============================================================================================================================================================
-bot.add_cog(RoleCommands(bot))
-bot.add_cog(LogsCommands(bot))
-bot.add_cog(Autorole(bot))
-#=============================================================================================================================================================
-# Load utility cogs
+# Member cache policy; idle guilds' members are evicted after MEMBER_CACHE_TTL seconds in lazy mode
+bot.member_cache = MemberCache(bot, MEMBER_CACHE_MODE, ttl=float(os.getenv("MEMBER_CACHE_TTL", "1800")))
+
+# Per-guild feature flags checked by gateway listeners before doing any work
+bot.guild_features = GuildFeatures()
+
+# Guild, member and channel totals maintained from gateway events
+bot.bot_stats = BotStats(bot)
+bot.bot_stats.register_listeners()
+
+# Rendered embeds of informational commands, invalidated by gateway events; RESPONSE_CACHE_TTLS looks like "status=10,serverinfo=60"
+response_cache_ttls = {
+    command.strip(): float(seconds)
+    for command, seconds in (item.split("=", 1) for item in os.getenv("RESPONSE_CACHE_TTLS", "").split(",") if item.strip())
+}
+bot.response_cache = ResponseCache(bot, response_cache_ttls)
+bot.response_cache.register_listeners()
+
+# Cluster-wide stats when running as a worker under launcher.py
+bot.cluster = None
+if os.getenv("CLUSTER_SOCKET"):
+    bot.cluster = ClusterClient(bot, int(os.getenv("CLUSTER_ID", "0")), os.getenv("CLUSTER_SOCKET"))
+
+# Metrics collection, optionally served in Prometheus format on a local port
+instrument(bot)
+
+# REST requests go through interactive, logging and bulk lanes so bulk jobs yield to command replies
+bot.rest_scheduler = RestScheduler(
+    bot,
+    max_in_flight=int(os.getenv("REST_MAX_IN_FLIGHT", str(MAX_IN_FLIGHT))),
+    bulk_max_in_flight=int(os.getenv("REST_BULK_MAX_IN_FLIGHT", str(BULK_MAX_IN_FLIGHT)))
+)
+bot.rest_scheduler.install()
+
+# Moderation DMs are sent in the background and their outcome added to the mod-log entry
+bot.dm_outbox = DMOutbox(
+    bot,
+    concurrency=int(os.getenv("DM_OUTBOX_CONCURRENCY", str(DM_CONCURRENCY))),
+    timeout=float(os.getenv("DM_OUTBOX_TIMEOUT", str(DM_TIMEOUT)))
+)
+bot.metrics_server = None
+if os.getenv("METRICS_PORT"):
+    bot.metrics_server = MetricsServer(
+        registry,
+        host=os.getenv("METRICS_HOST", "127.0.0.1"),
+        port=int(os.getenv("METRICS_PORT"))
+    )
+
+# Optional on-disk archive of edited and deleted messages for /logs search
+bot.message_archive = None
+if os.getenv("MESSAGE_ARCHIVE", "false").lower() in ("1", "true", "yes"):
+    bot.message_archive = MessageArchive(
+        os.getenv("MESSAGE_ARCHIVE_PATH", "./data/message_archive.db"),
+        max_age_days=int(os.getenv("MESSAGE_ARCHIVE_MAX_AGE_DAYS", "30")),
+        max_rows_per_guild=int(os.getenv("MESSAGE_ARCHIVE_MAX_ROWS", "50000"))
+    )
+    bot.message_archive.start()
+
+# On-disk history of moderation actions for /cases
+bot.case_store = CaseStore(os.getenv("CASE_STORE_PATH", "./data/cases.db"))
+bot.case_store.start()
+
+# Optional recording of anonymized gateway events for replay load tests
+bot.gateway_recorder = None
+if os.getenv("GATEWAY_RECORD", "false").lower() in ("1", "true", "yes"):
+    record_path = os.getenv("GATEWAY_RECORD_PATH", f"./data/recordings/gateway-{int(time.time())}.jsonl.gz")
+    # Cluster workers start together, so each one gets its own file
+    if bot.cluster is not None:
+        record_dir, record_name = os.path.split(record_path)
+        stem, dot, extension = record_name.partition(".")
+        record_path = os.path.join(record_dir, f"{stem}-cluster{os.getenv('CLUSTER_ID', '0')}{dot}{extension}")
+    bot.gateway_recorder = GatewayRecorder(
+        bot,
+        record_path,
+        events=[event.strip() for event in os.getenv("GATEWAY_RECORD_EVENTS", "").split(",") if event.strip()]
+    ).start()
+
+# Slash command sync, diffed against the last successful sync; only cluster 0 pushes changes
+bot.command_sync = CommandSync(
+    bot,
+    cache_path=os.getenv("COMMAND_SYNC_CACHE", DEFAULT_CACHE_PATH),
+    guild_id=int(os.getenv("COMMAND_SYNC_GUILD")) if os.getenv("COMMAND_SYNC_GUILD") else None,
+    push=os.getenv("CLUSTER_ID", "0") == "0",
+    force=os.getenv("COMMAND_SYNC_FORCE", "false").lower() in ("1", "true", "yes")
+)
+
+# Load cogs as extensions, filtered by COGS_ALLOW / COGS_DENY
 #=============================================================================================================================================================
-bot.add_cog(HelpCommand(bot))
-bot.add_cog(ActivityManager(bot))
-bot.add_cog(Status(bot))
-bot.add_cog(Avatar(bot))
-bot.add_cog(ServerInfo(bot))
-bot.add_cog(UserInfo(bot))
+ExtensionLoader.load_all(bot, ExtensionLoader.from_env())
 #=============================================================================================================================================================
-# WILL IMPLEMENT THIS LATER LOL
-"""
-# Load cogs automatically
-def load_cogs(bot):
-    for folder in os.listdir('./commands'):
-        if os.path.isdir(f'./commands/{folder}'):
-            for filename in os.listdir(f'./commands/{folder}'):
-                if filename.endswith('.py'):
-                    bot.load_extension(f'commands.{folder}.{filename[:-3]}')
-
-load_cogs(bot)
-"""
+
+# Replaces nextcord's default on_connect, which re-syncs the whole command tree on every connect
+# Each shard dispatches connect, so shards connecting together wait for the one sync in flight
+command_sync_lock = asyncio.Lock()
+
+@bot.event
+async def on_connect():
+    async with command_sync_lock:
+        if bot.command_sync.synced:
+            return
+        try:
+            await bot.command_sync.sync()
+        except Exception as e:
+            logger.error(f"Application command sync failed: {e}", exc_info=True)
 
 # Bot event for when it's ready
 @bot.event
 async def on_ready():
-    print(f'Logged in as {bot.user.name}')
-    print(f'Bot Version: {BOT_VERSION}')
-    print(f'Nextcord Version: {nextcord.__version__}')
-    print(f'Connected to {len(bot.guilds)} servers')
-    print('------')
+    logger.info(f'Logged in as {bot.user.name}')
+    logger.info(f'Bot Version: {BOT_VERSION}')
+    logger.info(f'Nextcord Version: {nextcord.__version__}')
+    logger.info(f'Connected to {len(bot.guilds)} servers')
+    if bot.shard_count:
+        logger.info(f'Running shards {sorted(bot.shards)} of {bot.shard_count}')
+    
+    # Start the metrics endpoint once the event loop is running
+    if bot.metrics_server:
+        await bot.metrics_server.start()
+    
+    # Start evicting idle member caches
+    bot.member_cache.start()
+    
+    # Start reporting to the cluster coordinator
+    if bot.cluster:
+        bot.cluster.start()
+
+@bot.event
+async def on_shard_ready(shard_id):
+    logger.info(f'Shard {shard_id} ready')
+
+# Write queued cases and archive rows to disk before shutting down
+original_close = bot.close
+
+async def close():
+    for store in (bot.case_store, bot.message_archive):
+        if store is None:
+            continue
+        try:
+            await store.close()
+        except Exception as e:
+            logger.error(f"Error closing {store.path}: {e}")
+    await original_close()
+
+bot.close = close
 
 # Run the bot
 bot.run(BOT_TOKEN)
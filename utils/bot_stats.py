@@ -0,0 +1,130 @@
+import logging
+import os
+from collections import Counter
+from typing import Dict, List
+
+import nextcord
+from nextcord.ext import tasks
+
+logger = logging.getLogger('bot.BotStats')
+
+# How often the incremental totals are checked against a full recount (seconds)
+RECONCILE_INTERVAL = float(os.getenv("BOT_STATS_RECONCILE_INTERVAL", "3600"))
+
+class BotStats:
+    """
+    Bot-wide guild, member and channel totals.
+
+    Totals are kept per guild and adjusted by gateway listeners as guilds,
+    members and channels come and go, so readers never walk ``bot.guilds``.
+    A full recount runs on ready and every ``RECONCILE_INTERVAL`` seconds to
+    correct any drift from missed events. Guild and member totals are also
+    kept per shard.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._guilds: Dict[int, List[int]] = {}  # guild_id -> [members, channels, shard_id]
+        self.members = 0
+        self.channels = 0
+        self.shard_guilds = Counter()
+        self.shard_members = Counter()
+        self.drift = 0
+        self._reconcile_loop = tasks.loop(seconds=RECONCILE_INTERVAL)(self._reconcile_tick)
+
+    @property
+    def guilds(self) -> int:
+        return len(self._guilds)
+
+    def register_listeners(self) -> None:
+        """Keep the totals up to date from gateway events"""
+        self.bot.add_listener(self.on_ready, "on_ready")
+        self.bot.add_listener(self.track_guild, "on_guild_available")
+        self.bot.add_listener(self.track_guild, "on_guild_join")
+        self.bot.add_listener(self.on_guild_remove, "on_guild_remove")
+        self.bot.add_listener(self.on_member_join, "on_member_join")
+        self.bot.add_listener(self.on_raw_member_remove, "on_raw_member_remove")
+        self.bot.add_listener(self.on_guild_channel_create, "on_guild_channel_create")
+        self.bot.add_listener(self.on_guild_channel_delete, "on_guild_channel_delete")
+
+    def stop(self) -> None:
+        self._reconcile_loop.cancel()
+
+    # Listeners
+    #=============================================================================================================================================================
+    async def on_ready(self):
+        self.reconcile()
+        if not self._reconcile_loop.is_running():
+            self._reconcile_loop.start()
+
+    async def track_guild(self, guild: nextcord.Guild):
+        self._set(guild.id, guild.member_count or 0, len(guild.channels), guild.shard_id)
+
+    async def on_guild_remove(self, guild: nextcord.Guild):
+        counts = self._guilds.pop(guild.id, None)
+        if counts:
+            self.members -= counts[0]
+            self.channels -= counts[1]
+            self.shard_guilds[counts[2]] -= 1
+            self.shard_members[counts[2]] -= counts[0]
+
+    async def on_member_join(self, member: nextcord.Member):
+        self._adjust(member.guild.id, members=1)
+
+    async def on_raw_member_remove(self, payload: nextcord.RawMemberRemoveEvent):
+        self._adjust(payload.guild_id, members=-1)
+
+    async def on_guild_channel_create(self, channel: nextcord.abc.GuildChannel):
+        self._adjust(channel.guild.id, channels=1)
+
+    async def on_guild_channel_delete(self, channel: nextcord.abc.GuildChannel):
+        self._adjust(channel.guild.id, channels=-1)
+
+    # Bookkeeping
+    #=============================================================================================================================================================
+    def _set(self, guild_id: int, members: int, channels: int, shard_id: int) -> None:
+        counts = self._guilds.get(guild_id)
+        if counts is None:
+            counts = self._guilds[guild_id] = [0, 0, shard_id]
+            self.shard_guilds[shard_id] += 1
+        self.members += members - counts[0]
+        self.channels += channels - counts[1]
+        self.shard_members[shard_id] += members - counts[0]
+        counts[0], counts[1] = members, channels
+
+    def _adjust(self, guild_id: int, members: int = 0, channels: int = 0) -> None:
+        counts = self._guilds.get(guild_id)
+        if counts is None:
+            return
+        counts[0] += members
+        counts[1] += channels
+        self.shard_members[counts[2]] += members
+        self.members += members
+        self.channels += channels
+
+    def reconcile(self) -> int:
+        """Recount every guild from the cache and return how far the totals had drifted"""
+        before = (self.guilds, self.members, self.channels)
+        self._guilds = {guild.id: [guild.member_count or 0, len(guild.channels), guild.shard_id] for guild in self.bot.guilds}
+        self.members = sum(counts[0] for counts in self._guilds.values())
+        self.channels = sum(counts[1] for counts in self._guilds.values())
+        self.shard_guilds = Counter(counts[2] for counts in self._guilds.values())
+        self.shard_members = Counter()
+        for counts in self._guilds.values():
+            self.shard_members[counts[2]] += counts[0]
+
+        drift = sum(abs(a - b) for a, b in zip(before, (self.guilds, self.members, self.channels)))
+        self.drift += drift
+        if drift:
+            logger.info(f"Reconciled bot stats: {self.guilds:,} guilds, {self.members:,} members, "
+                        f"{self.channels:,} channels (corrected {drift:,})")
+        return drift
+
+    async def _reconcile_tick(self) -> None:
+        # The first iteration runs immediately, right after on_ready already recounted
+        if self._reconcile_loop.current_loop == 0:
+            return
+        try:
+            self.reconcile()
+        except Exception as e:
+            logger.error(f"Failed to reconcile bot stats: {e}")
@@ -0,0 +1,115 @@
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils.sqlite_store import BatchedSQLiteStore
+
+# Actions recorded by the moderation cogs
+CASE_ACTIONS = (
+    "ban", "unban", "kick", "softban",
+    "mute", "unmute", "deafen", "undeafen",
+    "lock", "unlock", "lockdown", "unlockdown",
+    "purge", "clear"
+)
+
+class CaseStore(BatchedSQLiteStore):
+    """
+    On-disk history of moderation actions ("cases").
+
+    Each row is one action with its target user (or channel), moderator,
+    reason and optional duration. Rows are never pruned. Cluster workers share
+    one database and each writes its own batches, so ids are not in time order;
+    results are ordered by ``(created_at, id)`` instead. Every filter used by
+    /cases has an index that ends in ``created_at, id``, so a page is a single
+    index range scan however many rows the guild has. Pages are fetched by
+    keyset (``before``) rather than by offset.
+    """
+
+    def record(self, guild_id: int, action: str, moderator_id: Optional[int], user_id: Optional[int] = None,
+               channel_id: Optional[int] = None, reason: Optional[str] = None, duration: Optional[float] = None,
+               details: Optional[str] = None) -> None:
+        """Queue a moderation action for writing"""
+        self.enqueue((guild_id, action, user_id, moderator_id, channel_id, reason, duration, details, time.time()))
+
+    async def search(self, guild_id: int, user_id: Optional[int] = None, moderator_id: Optional[int] = None,
+                     action: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+                     before: Optional[Tuple[float, int]] = None, limit: int = 10) -> List[dict]:
+        """
+        Search a guild's cases, newest first.
+
+        Results are paginated by keyset: pass the ``(created_at, id)`` of the last
+        row of a page as ``before`` to get the next page.
+        """
+        return await self.run(self._search, guild_id, user_id, moderator_id, action, since, until, before, limit)
+
+    async def count_actions(self, guild_id: int, user_id: int) -> Dict[str, int]:
+        """Number of cases of each action against a user"""
+        return await self.run(self._count_actions, guild_id, user_id)
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cases (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                action TEXT NOT NULL,
+                user_id INTEGER,
+                moderator_id INTEGER,
+                channel_id INTEGER,
+                reason TEXT,
+                duration REAL,
+                details TEXT,
+                created_at REAL NOT NULL
+            );
+            DROP INDEX IF EXISTS idx_cases_guild;
+            DROP INDEX IF EXISTS idx_cases_user;
+            DROP INDEX IF EXISTS idx_cases_user_recent;
+            DROP INDEX IF EXISTS idx_cases_moderator;
+            DROP INDEX IF EXISTS idx_cases_action;
+            DROP INDEX IF EXISTS idx_cases_created;
+            CREATE INDEX IF NOT EXISTS idx_cases_guild_time ON cases (guild_id, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_cases_user_time ON cases (guild_id, user_id, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_cases_user_action_time ON cases (guild_id, user_id, action, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_cases_moderator_time ON cases (guild_id, moderator_id, created_at, id);
+            CREATE INDEX IF NOT EXISTS idx_cases_action_time ON cases (guild_id, action, created_at, id);
+        """)
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list) -> None:
+        conn.executemany(
+            "INSERT INTO cases (guild_id, action, user_id, moderator_id, channel_id, reason, duration, details, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _search(self, conn, guild_id, user_id, moderator_id, action, since, until, before, limit) -> List[dict]:
+        clauses = ["guild_id = ?"]
+        params = [guild_id]
+
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if moderator_id is not None:
+            clauses.append("moderator_id = ?")
+            params.append(moderator_id)
+        if action:
+            clauses.append("action = ?")
+            params.append(action)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at <= ?")
+            params.append(until)
+        if before is not None:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(before)
+
+        query = "SELECT * FROM cases WHERE " + " AND ".join(clauses) + " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in conn.execute(query, params)]
+
+    def _count_actions(self, conn, guild_id, user_id) -> Dict[str, int]:
+        rows = conn.execute(
+            "SELECT action, COUNT(*) AS total FROM cases WHERE guild_id = ? AND user_id = ? GROUP BY action",
+            (guild_id, user_id)
+        )
+        return {row["action"]: row["total"] for row in rows}
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from typing import Dict, Optional
+
+import nextcord
+from nextcord.ext import tasks
+
+logger = logging.getLogger('bot.Cluster')
+
+# Seconds between worker heartbeats, and how many missed heartbeats make a cluster stale
+HEARTBEAT_INTERVAL = float(os.getenv("CLUSTER_HEARTBEAT_INTERVAL", "15"))
+STALE_AFTER = 3
+DEFAULT_SOCKET = "./data/cluster.sock"
+
+class ClusterCoordinator:
+    """
+    Unix socket server run by the launcher.
+
+    Workers send a newline-delimited JSON heartbeat with their stats and get
+    the latest stats of every cluster back on the same connection, so each
+    worker always has a cluster-wide view no older than one heartbeat.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        self.path = path
+        self.clusters: Dict[int, dict] = {}
+        self.restarts: Dict[int, int] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # A socket file left behind by a previous launcher would block the bind
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._handle_worker, path=self.path)
+        logger.info(f"Cluster coordinator listening on {self.path}")
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def snapshot(self) -> dict:
+        """Stats of every cluster, with health worked out from heartbeat age"""
+        now = time.time()
+        clusters = {}
+        for cluster_id, stats in self.clusters.items():
+            age = now - stats["received"]
+            clusters[cluster_id] = {
+                **stats,
+                "age": round(age, 1),
+                "healthy": age < HEARTBEAT_INTERVAL * STALE_AFTER,
+                "restarts": self.restarts.get(cluster_id, 0)
+            }
+        return clusters
+
+    async def _handle_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning("Ignoring malformed message from a worker")
+                    continue
+
+                if message.get("op") == "heartbeat":
+                    stats = message["stats"]
+                    stats["received"] = time.time()
+                    self.clusters[int(message["cluster"])] = stats
+
+                writer.write(json.dumps({"op": "clusters", "clusters": self.snapshot()}).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+class ClusterClient:
+    """
+    Worker side of the coordinator connection.
+
+    Sends this cluster's stats every ``HEARTBEAT_INTERVAL`` seconds and keeps
+    the coordinator's reply in ``clusters``. If the coordinator is unreachable
+    the worker keeps running on its own stats and reconnects on the next beat.
+    """
+
+    def __init__(self, bot, cluster_id: int, path: str = DEFAULT_SOCKET):
+        self.bot = bot
+        self.cluster_id = cluster_id
+        self.path = path
+        self.clusters: Dict[int, dict] = {}
+        self._replied = 0.0
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._heartbeat_loop = tasks.loop(seconds=HEARTBEAT_INTERVAL)(self._heartbeat)
+
+    def start(self) -> None:
+        if not self._heartbeat_loop.is_running():
+            self._heartbeat_loop.start()
+
+    def stop(self) -> None:
+        self._heartbeat_loop.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+    @property
+    def total_guilds(self) -> int:
+        """Guilds across every cluster still reporting, with this process's own count always current"""
+        return self._total("guilds")
+
+    @property
+    def total_members(self) -> int:
+        return self._total("members")
+
+    def _total(self, key: str) -> int:
+        # Heartbeat age as of now: its age at the coordinator's reply plus the time since that reply
+        since_reply = time.time() - self._replied
+        total = getattr(self.bot.bot_stats, key)
+        for cluster_id, cluster in self.clusters.items():
+            if cluster_id != self.cluster_id and cluster["age"] + since_reply < HEARTBEAT_INTERVAL * STALE_AFTER:
+                total += cluster[key]
+        return total
+
+    def local_stats(self) -> dict:
+        """This worker's heartbeat payload"""
+        stats = self.bot.bot_stats
+        if isinstance(self.bot, nextcord.AutoShardedClient):
+            latencies = self.bot.latencies
+        else:
+            latencies = [(0, self.bot.latency)]
+        return {
+            "pid": os.getpid(),
+            "guilds": stats.guilds,
+            "members": stats.members,
+            "channels": stats.channels,
+            "shards": [
+                [shard_id, round(latency * 1000) if math.isfinite(latency) else None, stats.shard_guilds[shard_id]]
+                for shard_id, latency in latencies
+            ]
+        }
+
+    async def _heartbeat(self) -> None:
+        try:
+            if self._writer is None or self._writer.is_closing():
+                self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+            message = {"op": "heartbeat", "cluster": self.cluster_id, "stats": self.local_stats()}
+            self._writer.write(json.dumps(message).encode("utf-8") + b"\n")
+            await self._writer.drain()
+
+            reply = json.loads(await asyncio.wait_for(self._reader.readline(), timeout=HEARTBEAT_INTERVAL))
+            self.clusters = {int(cluster_id): cluster for cluster_id, cluster in reply["clusters"].items()}
+            self._replied = time.time()
+        except Exception as e:
+            logger.warning(f"Cluster coordinator heartbeat failed: {e}")
+            if self._writer is not None:
+                self._writer.close()
+            self._reader = self._writer = None
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+logger = logging.getLogger('bot.CommandSync')
+
+DEFAULT_CACHE_PATH = "./data/command_sync.json"
+
+class CommandSync:
+    """
+    Syncs slash commands with Discord by diffing against the last successful sync.
+
+    Each command payload is hashed and compared with a cache of hashes and
+    command IDs stored on disk. Unchanged commands are associated with their
+    cached IDs without any REST call, changed or new commands are upserted one
+    by one, and commands that no longer exist are deleted. Without a usable
+    cache the whole tree is pushed with a single bulk overwrite.
+
+    With ``guild_id`` set, every command is synced to that one guild instead
+    of globally, which Discord applies immediately (handy for testing).
+    """
+
+    def __init__(self, bot, cache_path: str = DEFAULT_CACHE_PATH, guild_id: Optional[int] = None, push: bool = True, force: bool = False):
+        self.bot = bot
+        self.cache_path = cache_path
+        self.guild_id = guild_id
+        self.push = push
+        self.force = force
+        self.synced = False
+
+    @staticmethod
+    def payload_hash(payload: dict) -> str:
+        """Stable hash of a command payload, independent of key order"""
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def command_key(payload: dict) -> str:
+        return f"{payload['type']}:{payload['name']}"
+
+    @property
+    def scope(self) -> str:
+        return str(self.guild_id) if self.guild_id else "global"
+
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_cache(self, cache: dict) -> None:
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        temp_path = f"{self.cache_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(cache, file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.cache_path)
+
+    def _local_commands(self) -> Dict[str, tuple]:
+        """Map of command key to (command, payload) for everything that belongs in this scope"""
+        commands = {}
+        for command in self.bot.get_all_application_commands():
+            if not self.guild_id and not command.is_global:
+                continue
+            payload = command.get_payload(self.guild_id)
+            commands[self.command_key(payload)] = (command, payload)
+        return commands
+
+    def _associate(self, command, command_id) -> None:
+        """Give a local command its Discord ID so interactions are routed to it"""
+        data = {"id": command_id}
+        if self.guild_id:
+            data["guild_id"] = self.guild_id
+        command.parse_discord_response(self.bot._connection, data)
+        self.bot.add_application_command(command, overwrite=True, use_rollout=True)
+
+    async def sync(self) -> int:
+        """Bring Discord in line with the local commands; returns how many commands were pushed or deleted"""
+        self.bot.add_all_application_commands()
+        http = self.bot.http
+        application_id = self.bot.application_id
+        local = self._local_commands()
+
+        cache = self._load_cache()
+        cached = cache.get(self.scope)
+        usable = cached is not None and cached.get("application_id") == str(application_id) and not self.force
+
+        # Workers that don't push only pick up IDs from the cache
+        if not self.push:
+            for key, (command, _) in local.items():
+                if usable and key in cached["commands"]:
+                    self._associate(command, cached["commands"][key]["id"])
+            self.synced = True
+            self.bot.dispatch("commands_synced")
+            return 0
+
+        entries = {}
+        pushed = deleted = 0
+        if not usable:
+            # Cold cache: overwrite the whole tree in one request
+            payloads = [payload for _, payload in local.values()]
+            if self.guild_id:
+                response = await http.bulk_upsert_guild_commands(application_id, self.guild_id, payloads)
+            else:
+                response = await http.bulk_upsert_global_commands(application_id, payloads)
+            pushed = len(payloads)
+            for data in response:
+                key = self.command_key(data)
+                if key in local:
+                    self._associate(local[key][0], data["id"])
+                    entries[key] = {"id": str(data["id"]), "hash": self.payload_hash(local[key][1])}
+        else:
+            for key, (command, payload) in local.items():
+                digest = self.payload_hash(payload)
+                entry = cached["commands"].get(key)
+                if entry and entry["hash"] == digest:
+                    self._associate(command, entry["id"])
+                    entries[key] = entry
+                    continue
+                if self.guild_id:
+                    data = await http.upsert_guild_command(application_id, self.guild_id, payload)
+                else:
+                    data = await http.upsert_global_command(application_id, payload)
+                self._associate(command, data["id"])
+                entries[key] = {"id": str(data["id"]), "hash": digest}
+                pushed += 1
+
+            for key, entry in cached["commands"].items():
+                if key in local:
+                    continue
+                if self.guild_id:
+                    await http.delete_guild_command(application_id, self.guild_id, entry["id"])
+                else:
+                    await http.delete_global_command(application_id, entry["id"])
+                deleted += 1
+
+        cache[self.scope] = {"application_id": str(application_id), "commands": entries}
+        self._save_cache(cache)
+        self.synced = True
+        # Lets cogs that introspect the command tree (like /help) rebuild from the final state
+        self.bot.dispatch("commands_synced")
+
+        logger.info(
+            f"Command sync ({self.scope}): {pushed} pushed, {deleted} deleted, "
+            f"{len(local) - pushed} unchanged{' (full overwrite)' if not usable else ''}"
+        )
+        return pushed + deleted
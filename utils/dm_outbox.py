@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Set
+
+import nextcord
+
+from utils.metrics import registry
+from utils.rest_scheduler import rest_lane
+
+logger = logging.getLogger('bot.DMOutbox')
+
+# Direct messages being sent at once, and how long one may take including its wait for a slot
+DM_CONCURRENCY = 4
+DM_TIMEOUT = 10.0
+# How long ban/kick/softban wait for the DM before going ahead (the user can't be messaged afterwards);
+# their DMs skip the concurrency queue, so this is all sending time
+PRE_ACTION_WAIT = 3.0
+# Users whose DMs were closed are skipped for this long
+CLOSED_TTL = 6 * 3600
+# "Cannot send messages to this user": closed DMs, or no guild shared with the bot any more
+CANNOT_MESSAGE_USER = 50007
+MAX_CLOSED = 10000
+
+# Name of the embed field showing the outcome on the mod-log entry
+DM_FIELD = "Direct Message"
+OUTCOMES = {
+    "pending": "⏳ Sending...",
+    "sent": "✅ Delivered",
+    "closed": "❌ Not delivered, the user has DMs closed",
+    "known_closed": "⏭️ Skipped, the user had DMs closed recently",
+    "timeout": "❌ Not delivered, timed out",
+    "failed": "❌ Not delivered"
+}
+
+DM_OUTCOMES = registry.counter("bot_dm_outbox_total", "Direct messages handled by the outbox", ("outcome",))
+
+class DMOutbox:
+    """
+    Sends moderation DMs in the background.
+
+    ``send`` returns a task right away, so commands no longer wait on DM
+    channel creation and a message that often fails with 403. At most
+    ``concurrency`` DMs are in flight and each one gives up after ``timeout``
+    seconds. DMs sent with ``removal=True`` must go out before the ban or kick
+    the command is waiting to make, so they skip that queue and are sent in
+    the interactive REST lane. Users whose DMs turned out to be closed are
+    remembered for a while and skipped. Commands show the outcome in an embed
+    field and ``report`` edits the mod-log entry once it is known.
+
+    Discord refuses DMs to users who share no guild with the bot with the
+    same error as closed DMs. Only refusals for users still in a mutual
+    guild are remembered, and never for DMs sent with ``removal=True``
+    (ban, kick, softban), which may go out after the user has left.
+    """
+
+    def __init__(self, bot, concurrency: int = DM_CONCURRENCY, timeout: float = DM_TIMEOUT):
+        self.bot = bot
+        self.timeout = timeout
+        self.closed: Dict[int, float] = {}  # user_id -> skip until
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _track(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def send(self, user: nextcord.abc.User, embed: nextcord.Embed, removal: bool = False) -> asyncio.Task:
+        """Queue a DM; the task's result is one of the ``OUTCOMES`` keys"""
+        return self._track(self._deliver(user, embed, removal))
+
+    async def _deliver(self, user, embed, removal) -> str:
+        skip_until = self.closed.get(user.id)
+        if skip_until is not None and skip_until > time.monotonic():
+            outcome = "known_closed"
+        elif user.bot:
+            outcome = "failed"
+        else:
+            try:
+                outcome = await asyncio.wait_for(self._send_now(user, embed, removal), self.timeout)
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+        DM_OUTCOMES.inc(outcome)
+        return outcome
+
+    async def _send_now(self, user, embed, removal) -> str:
+        if removal:
+            return await self._attempt(user, embed, removal, "interactive")
+        async with self._semaphore:
+            return await self._attempt(user, embed, removal, "logging")
+
+    async def _attempt(self, user, embed, removal, lane) -> str:
+        try:
+            with rest_lane(lane):
+                await user.send(embed=embed)
+            return "sent"
+        except nextcord.Forbidden as e:
+            if e.code == CANNOT_MESSAGE_USER and not removal and user.mutual_guilds:
+                self._remember_closed(user.id)
+            return "closed"
+        except nextcord.HTTPException as e:
+            logger.debug(f"Could not DM {user} ({user.id}): {e}")
+            return "failed"
+
+    def _remember_closed(self, user_id: int) -> None:
+        now = time.monotonic()
+        if len(self.closed) >= MAX_CLOSED:
+            self.closed = {uid: until for uid, until in self.closed.items() if until > now}
+        self.closed[user_id] = now + CLOSED_TTL
+
+    @staticmethod
+    async def wait(task: asyncio.Task, timeout: float = PRE_ACTION_WAIT) -> None:
+        """Give a ``removal`` DM a bounded head start before an action that makes it impossible"""
+        await asyncio.wait({task}, timeout=timeout)
+
+    @staticmethod
+    def describe(task: asyncio.Task) -> str:
+        if not task.done():
+            return OUTCOMES["pending"]
+        if task.cancelled() or task.exception() is not None:
+            return OUTCOMES["failed"]
+        return OUTCOMES[task.result()]
+
+    def add_status_field(self, embed: nextcord.Embed, task: asyncio.Task) -> None:
+        embed.add_field(name=DM_FIELD, value=self.describe(task), inline=False)
+
+    def report(self, task: asyncio.Task, message: Optional[nextcord.Message], embed: nextcord.Embed) -> None:
+        """Edit the mod-log entry once the DM's outcome is known, if it was still pending when sent"""
+        if message is not None:
+            self._track(self._report(task, message, embed))
+
+    async def _report(self, task, message, embed) -> None:
+        await asyncio.wait({task})
+        value = self.describe(task)
+        for index, field in enumerate(embed.fields):
+            if field.name != DM_FIELD:
+                continue
+            if field.value == value:
+                return
+            embed.set_field_at(index, name=DM_FIELD, value=value, inline=False)
+            try:
+                with rest_lane("logging"):
+                    await message.edit(embed=embed)
+            except nextcord.HTTPException as e:
+                logger.debug(f"Could not update mod-log entry {message.id} with the DM outcome: {e}")
+            return
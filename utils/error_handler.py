@@ -1,9 +1,96 @@
 import nextcord
 import traceback
 import sys
+import os
+import asyncio
 import datetime
+import hashlib
+import logging
+import time
+from collections import OrderedDict
 from .embed_helper import EmbedHelper
 
+# Repeats of the same error in the same guild within this many seconds are summarised in one report
+ERROR_REPORT_WINDOW = float(os.getenv("ERROR_REPORT_WINDOW", "300"))
+# Maximum number of error fingerprints tracked at once; the oldest window is closed when full
+ERROR_MAX_FINGERPRINTS = 256
+# Number of innermost traceback frames that identify an error
+FINGERPRINT_FRAMES = 3
+
+logger = logging.getLogger('bot.ErrorHandler')
+
+class ErrorAggregator:
+    """
+    Groups repeated errors so each one is reported once per window.
+
+    Errors are keyed by guild and fingerprint. The first occurrence is reported
+    right away and opens a window; further occurrences within the window are only
+    counted, and a single summary is posted when the window closes. Open windows
+    are kept in a bounded table ordered by age.
+    """
+
+    def __init__(self, window: float = ERROR_REPORT_WINDOW, max_fingerprints: int = ERROR_MAX_FINGERPRINTS):
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self._windows = OrderedDict()
+
+    @staticmethod
+    def fingerprint(error: Exception) -> str:
+        """
+        Identify an error by its type and the innermost frames of its traceback.
+        Only file names, function names and line numbers are used, so the same
+        failure always gets the same fingerprint regardless of its message.
+        """
+        # Command invoke errors wrap the exception that was actually raised
+        error = getattr(error, "original", error)
+        frames = [
+            (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name, lineno)
+            for frame, lineno in traceback.walk_tb(error.__traceback__)
+        ][-FINGERPRINT_FRAMES:]
+        key = f"{type(error).__module__}.{type(error).__qualname__}|" + "|".join(
+            f"{filename}:{name}:{lineno}" for filename, name, lineno in frames
+        )
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+    def record(self, key, report) -> bool:
+        """
+        Count an occurrence of ``key``. Returns True if this is the first one in
+        the window and should be reported now. ``report`` is kept as the sample
+        for the summary and must be a dict with a ``"channel"`` entry.
+        """
+        entry = self._windows.get(key)
+        if entry:
+            entry["count"] += 1
+            entry["sample"] = report
+            return False
+
+        # Close the oldest window to make room, sending its summary now instead of at the end of the window
+        if len(self._windows) >= self.max_fingerprints:
+            _, oldest = self._windows.popitem(last=False)
+            oldest["task"].cancel()
+            if oldest["count"] > 1:
+                asyncio.get_running_loop().create_task(self._send_summary(oldest))
+
+        self._windows[key] = {
+            "count": 1,
+            "started": time.time(),
+            "sample": report,
+            "task": asyncio.get_running_loop().create_task(self._close_later(key))
+        }
+        return True
+
+    async def _close_later(self, key):
+        await asyncio.sleep(self.window)
+        entry = self._windows.pop(key, None)
+        if entry and entry["count"] > 1:
+            await self._send_summary(entry)
+
+    async def _send_summary(self, entry):
+        await ErrorHandler.send_summary(entry["sample"], entry["count"], time.time() - entry["started"])
+
+# Shared by every ErrorHandler so cogs with their own handler still aggregate together
+aggregator = ErrorAggregator()
+
 class ErrorHandler:
     def __init__(self, bot):
         self.bot = bot
@@ -11,7 +98,6 @@ class ErrorHandler:
     async def handle_command_error(self, interaction: nextcord.Interaction, error: Exception, command_name: str = None, is_followup: bool = False):
         """Handle errors from slash commands and send formatted error messages"""
         error_type = type(error).__name__
-        error_trace = "".join(traceback.format_exception(type(error), error, error.__traceback__))
         
         # Get command name if not provided
         if command_name is None and hasattr(interaction, 'application_command'):
@@ -19,15 +105,33 @@ class ErrorHandler:
         elif command_name is None:
             command_name = "Unknown Command"
             
-        # Print to terminal with formatting
-        print(f"\n{'='*50}")
-        print(f"Error in command: {command_name}")
-        print(f"Error type: {error_type}")
-        print(f"User: {interaction.user} (ID: {interaction.user.id})")
-        print(f"Guild: {interaction.guild.name if interaction.guild else 'DM'} (ID: {interaction.guild.id if interaction.guild else 'N/A'})")
-        print(f"Error: {str(error)}")
-        print(f"Traceback:\n{error_trace}")
-        print(f"{'='*50}\n")
+        # Count the error against its fingerprint; only the first in each window is reported in full
+        # The report keeps a formatted traceback, not the exception, whose frames would pin their locals
+        fingerprint = ErrorAggregator.fingerprint(error)
+        error_trace = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+        report = {
+            "channel": nextcord.utils.get(interaction.guild.channels, name="error-logs") if interaction.guild else None,
+            "command_name": command_name,
+            "error_type": error_type,
+            "message": str(error),
+            "trace": error_trace,
+            "fingerprint": fingerprint
+        }
+        should_report = aggregator.record((interaction.guild.id if interaction.guild else None, fingerprint), report)
+        
+        if should_report:
+            # Log the full report; the traceback is formatted on the logging thread
+            logger.error(
+                f"Error in command {command_name}: {error_type}: {error} "
+                f"(user {interaction.user.id}, guild {interaction.guild.id if interaction.guild else 'DM'})",
+                exc_info=(type(error), error, error.__traceback__),
+                extra={
+                    "command": command_name,
+                    "fingerprint": fingerprint,
+                    "user_id": interaction.user.id,
+                    "guild_id": interaction.guild.id if interaction.guild else None
+                }
+            )
         
         # Create user-friendly error message based on error type
         if isinstance(error, nextcord.errors.Forbidden):
@@ -78,9 +182,13 @@ class ErrorHandler:
             except:
                 pass
                 
+        # Repeats within the window are summarised when it closes
+        if not should_report:
+            return
+            
         # Try to send to error logs channel if it exists
         try:
-            error_channel = nextcord.utils.get(interaction.guild.channels, name="error-logs")
+            error_channel = report["channel"]
             if error_channel:
                 # Create a more detailed embed for the error logs
                 log_embed = nextcord.Embed(
@@ -92,24 +200,51 @@ class ErrorHandler:
                 
                 log_embed.add_field(name="User", value=f"{interaction.user.mention} ({interaction.user.id})", inline=True)
                 log_embed.add_field(name="Channel", value=f"{interaction.channel.mention} ({interaction.channel.id})", inline=True)
-                
-                # Add truncated traceback
-                trace_lines = error_trace.split('\n')
-                if len(trace_lines) > 15:
-                    trace_lines = trace_lines[:15] + ["..."]
-                
-                trace_text = '\n'.join(trace_lines)
-                if len(trace_text) > 1024:
-                    trace_text = trace_text[:1021] + "..."
-                    
-                log_embed.add_field(name="Traceback", value=f"```py\n{trace_text}\n```", inline=False)
-                log_embed.set_footer(text=f"Error ID: {interaction.id}")
+                log_embed.add_field(name="Traceback", value=ErrorHandler._format_trace(error_trace), inline=False)
+                log_embed.set_footer(text=f"Error ID: {interaction.id} | Fingerprint: {fingerprint}")
                 
                 await error_channel.send(embed=log_embed)
         except:
             # If we can't send to the error logs channel, just continue
             pass
             
+    @staticmethod
+    def _format_trace(error_trace: str) -> str:
+        """Truncate a traceback to fit in an embed field"""
+        trace_lines = error_trace.split('\n')
+        if len(trace_lines) > 15:
+            trace_lines = trace_lines[:15] + ["..."]
+        
+        trace_text = '\n'.join(trace_lines)
+        if len(trace_text) > 1024:
+            trace_text = trace_text[:1021] + "..."
+            
+        return f"```py\n{trace_text}\n```"
+        
+    @staticmethod
+    async def send_summary(report: dict, count: int, duration: float):
+        """Post a single summary for an error that repeated during its report window"""
+        logger.warning(
+            f"Error {report['fingerprint']} in command {report['command_name']} occurred {count} times in {duration:.0f}s",
+            extra={"command": report["command_name"], "fingerprint": report["fingerprint"], "occurrences": count}
+        )
+        
+        try:
+            if report["channel"]:
+                log_embed = nextcord.Embed(
+                    title=f"Repeated Command Error: /{report['command_name']}",
+                    description=f"**\u00d7{count} occurrences** in the last {duration:.0f}s\n"
+                                f"**Error Type:** `{report['error_type']}`\n**Latest Message:** `{report['message']}`",
+                    color=0xFF0000,
+                    timestamp=datetime.datetime.now()
+                )
+                log_embed.add_field(name="Latest Traceback", value=ErrorHandler._format_trace(report["trace"]), inline=False)
+                log_embed.set_footer(text=f"Fingerprint: {report['fingerprint']}")
+                
+                await report["channel"].send(embed=log_embed)
+        except:
+            pass
+            
     def register_error_handlers(self):
         """Register the global error handler for application commands"""
         @self.bot.event
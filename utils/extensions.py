@@ -0,0 +1,95 @@
+import fnmatch
+import logging
+import os
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger('bot.Extensions')
+
+# Package scanned for cog modules
+COGS_PACKAGE = "cogs"
+
+# A module is an extension if it defines a top-level setup(bot)
+SETUP_PATTERN = re.compile(r"^(async )?def setup\(", re.MULTILINE)
+
+class ExtensionLoader:
+    """
+    Discovers cog modules under ``cogs/`` and loads them as extensions.
+
+    Discovery only reads source files, so modules filtered out by
+    ``COGS_ALLOW``/``COGS_DENY`` are never imported. Patterns are shell-style
+    and match the full module name (``cogs.utility.status``), the name without
+    the package (``utility.status``, ``moderation.*``) or the module alone
+    (``status``).
+    """
+
+    @staticmethod
+    def discover(package: str = COGS_PACKAGE) -> List[str]:
+        """Dotted names of every module under ``package`` that defines setup()"""
+        names = []
+        for root, dirs, files in os.walk(package):
+            dirs[:] = sorted(d for d in dirs if not d.startswith(("_", ".")))
+            for filename in sorted(files):
+                if not filename.endswith(".py") or filename.startswith("_"):
+                    continue
+                path = os.path.join(root, filename)
+                with open(path, encoding="utf-8") as file:
+                    if not SETUP_PATTERN.search(file.read()):
+                        continue
+                names.append(os.path.splitext(path)[0].replace(os.sep, "."))
+        return names
+
+    @staticmethod
+    def matches(name: str, patterns: Iterable[str]) -> bool:
+        """Whether an extension name matches any of the patterns"""
+        short = name.split(".", 1)[1] if name.startswith(f"{COGS_PACKAGE}.") else name
+        module = name.rsplit(".", 1)[-1]
+        return any(
+            fnmatch.fnmatchcase(candidate, pattern)
+            for pattern in patterns
+            for candidate in (name, short, module)
+        )
+
+    @staticmethod
+    def select(names: List[str], allow: Optional[List[str]] = None, deny: Optional[List[str]] = None) -> List[str]:
+        """Apply the allow list (if any) and then the deny list"""
+        if allow:
+            names = [name for name in names if ExtensionLoader.matches(name, allow)]
+        if deny:
+            names = [name for name in names if not ExtensionLoader.matches(name, deny)]
+        return names
+
+    @staticmethod
+    def from_env() -> List[str]:
+        """Discovered extensions filtered by COGS_ALLOW and COGS_DENY (comma separated patterns)"""
+        def patterns(var):
+            return [pattern.strip() for pattern in os.getenv(var, "").split(",") if pattern.strip()]
+        return ExtensionLoader.select(ExtensionLoader.discover(), patterns("COGS_ALLOW"), patterns("COGS_DENY"))
+
+    @staticmethod
+    def resolve(name: str, candidates: Iterable[str]) -> Optional[str]:
+        """Turn a short name like ``status`` or ``utility.status`` into a full extension name"""
+        matches = [candidate for candidate in candidates if ExtensionLoader.matches(candidate, [name])]
+        return matches[0] if len(matches) == 1 else None
+
+    @staticmethod
+    def load_all(bot, names: List[str]) -> Dict[str, float]:
+        """
+        Load each extension, logging how long its import and setup took.
+        A failing extension is logged and skipped so the rest still load.
+        """
+        timings = {}
+        started = time.perf_counter()
+        for name in names:
+            start = time.perf_counter()
+            try:
+                bot.load_extension(name)
+            except Exception as e:
+                logger.error(f"Failed to load extension {name}: {e}", exc_info=True)
+                continue
+            timings[name] = time.perf_counter() - start
+            logger.info(f"Loaded {name} in {timings[name] * 1000:.1f}ms")
+
+        logger.info(f"Loaded {len(timings)}/{len(names)} extensions in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return timings
@@ -0,0 +1,131 @@
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import secrets
+import threading
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger('bot.GatewayRecorder')
+
+# Any string that looks like a snowflake is remapped, wherever it appears
+SNOWFLAKE_PATTERN = re.compile(r"^\d{15,21}$")
+
+# Free text is replaced by a digest of the same length, so equal text stays equal
+TEXT_KEYS = {
+    "content", "username", "global_name", "nick", "name", "topic", "description", "title",
+    "value", "text", "filename", "url", "proxy_url", "email", "bio", "custom_status", "state", "details"
+}
+# Image hashes and secrets are blanked; the keys stay because nextcord's parsers read some of them directly
+NULL_KEYS = {"avatar", "banner", "icon", "splash", "discovery_splash", "token", "session_id", "resume_gateway_url", "ip"}
+# Names the bot looks up by value are kept so replays behave like the real guild
+KEEP_NAMES = {"message-logs", "mod-logs", "error-logs", "Muted", "Logs", "@everyone"}
+
+class Anonymizer:
+    """
+    Scrubs gateway payloads while keeping their shape.
+
+    Snowflakes are remapped with a keyed hash that keeps the timestamp bits, so
+    IDs stay consistent across events and creation times are preserved. The key
+    is random per recording, so mappings can't be reversed or correlated.
+    """
+
+    def __init__(self):
+        self._key = secrets.token_bytes(16)
+
+    def _digest(self, value: str) -> bytes:
+        return hashlib.blake2b(value.encode("utf-8"), key=self._key, digest_size=8).digest()
+
+    def snowflake(self, value: str) -> str:
+        snowflake = int(value)
+        # Keep the 42 timestamp bits and replace the worker/process/sequence bits
+        low = int.from_bytes(self._digest(value)[:3], "big") & 0x3FFFFF
+        return str((snowflake >> 22) << 22 | low)
+
+    def text(self, value: str) -> str:
+        if not value:
+            return value
+        digest = self._digest(value).hex()
+        return (digest * (len(value) // len(digest) + 1))[:len(value)]
+
+    def scrub(self, data, key: Optional[str] = None):
+        if isinstance(data, dict):
+            return {k: None if k in NULL_KEYS else self.scrub(v, k) for k, v in data.items()}
+        if isinstance(data, list):
+            return [self.scrub(item, key) for item in data]
+        if isinstance(data, str):
+            if SNOWFLAKE_PATTERN.match(data):
+                return self.snowflake(data)
+            if key in TEXT_KEYS and not (key == "name" and data in KEEP_NAMES):
+                return self.text(data)
+        return data
+
+class GatewayRecorder:
+    """
+    Opt-in recorder of raw gateway dispatch events.
+
+    Each event is snapshotted as JSON on the event loop (before nextcord's
+    parsers can modify it) and handed to a writer thread, which anonymizes it
+    and appends ``{"t": seconds, "event": name, "data": payload}`` to a gzip
+    compressed JSON-lines file.
+    """
+
+    def __init__(self, bot, path: str, events: Optional[Iterable[str]] = None):
+        self.bot = bot
+        self.path = path
+        self.events = {event.upper() for event in events} if events else None
+        self.recorded = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start = time.monotonic()
+
+        # Create recordings directory if it doesn't exist
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def start(self) -> "GatewayRecorder":
+        """Hook into the connection's parsers and start the writer thread"""
+        if self._thread is not None:
+            return self
+        parsers = self.bot._connection.parsers
+        for event, parser in list(parsers.items()):
+            if self.events is None or event in self.events:
+                parsers[event] = self._wrap(event, parser)
+
+        self._thread = threading.Thread(target=self._write_loop, name="GatewayRecorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        logger.info(f"Recording gateway events to {self.path}")
+        return self
+
+    def stop(self) -> None:
+        """Write everything still queued and close the file"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _wrap(self, event: str, parser):
+        def parse(data):
+            self._queue.put((time.monotonic() - self._start, event, json.dumps(data)))
+            self.recorded += 1
+            return parser(data)
+        return parse
+
+    def _write_loop(self) -> None:
+        anonymizer = Anonymizer()
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                offset, event, raw = item
+                try:
+                    data = anonymizer.scrub(json.loads(raw))
+                    file.write(json.dumps({"t": round(offset, 4), "event": event, "data": data}) + "\n")
+                except Exception as e:
+                    logger.error(f"Failed to record {event} event: {e}")
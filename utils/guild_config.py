@@ -0,0 +1,53 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+@contextmanager
+def _locked(path: str):
+    """
+    Hold an exclusive lock on ``path`` + ".lock" for the duration of the block.
+    Without fcntl (Windows) this is a no-op; clusters are only run where it exists.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _read(path: str) -> Dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_guild_config(path: str, guild_id: str, config: Optional[dict]) -> Dict[str, dict]:
+    """
+    Write one guild's entry of a JSON config file keyed by guild ID.
+
+    Cluster workers each hold the whole file in memory but only change the
+    guilds on their own shards, so the file is re-read under a lock and only
+    ``guild_id`` is replaced (or removed when ``config`` is None). Returns
+    the merged contents, which include other workers' latest changes.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with _locked(path):
+        data = _read(path)
+        if config is None:
+            data.pop(guild_id, None)
+        else:
+            data[guild_id] = config
+
+        # Write to a temporary file first so readers never see a partial file
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f, indent=4)
+        os.replace(temp_path, path)
+    return data
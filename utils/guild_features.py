@@ -0,0 +1,57 @@
+import enum
+from collections import Counter
+from typing import Dict, Iterable
+
+class GuildFeature(enum.IntFlag):
+    """Per-guild features that gateway listeners can check before doing any work"""
+    MESSAGE_LOGS = 1
+    AUTOROLE = 2
+    ANTI_RAID = 4
+
+class GuildFeatures:
+    """
+    Bitmap of enabled features for every guild.
+
+    Cogs that own a feature keep its bit up to date whenever their configuration
+    changes, and listeners call ``enabled`` first so guilds without the feature
+    are rejected with a single dict lookup. Rejected events are counted per
+    event name in ``skipped``.
+    """
+
+    def __init__(self):
+        self._flags: Dict[int, int] = {}
+        self.skipped = Counter()
+
+    def enabled(self, guild_id: int, feature: GuildFeature, event: str) -> bool:
+        """Return whether ``feature`` is on for a guild, counting the event as skipped if not"""
+        if self._flags.get(guild_id, 0) & feature:
+            return True
+        self.skipped[event] += 1
+        return False
+
+    def has(self, guild_id: int, feature: GuildFeature) -> bool:
+        """Return whether ``feature`` is on for a guild"""
+        return bool(self._flags.get(guild_id, 0) & feature)
+
+    def set(self, guild_id: int, feature: GuildFeature, on: bool) -> None:
+        """Turn a feature on or off for a guild"""
+        flags = self._flags.get(guild_id, 0)
+        flags = flags | feature if on else flags & ~feature
+        if flags:
+            self._flags[guild_id] = flags
+        else:
+            self._flags.pop(guild_id, None)
+
+    def replace(self, feature: GuildFeature, guild_ids: Iterable[int]) -> None:
+        """Make ``guild_ids`` the exact set of guilds with ``feature`` on"""
+        guild_ids = set(guild_ids)
+        for guild_id in list(self._flags):
+            if guild_id not in guild_ids:
+                self.set(guild_id, feature, False)
+        for guild_id in guild_ids:
+            self.set(guild_id, feature, True)
+
+    def count(self, feature: GuildFeature) -> int:
+        """Number of guilds with ``feature`` on"""
+        return sum(1 for flags in self._flags.values() if flags & feature)
+
@@ -0,0 +1,99 @@
+import bisect
+import logging
+from typing import Dict, List, Optional
+
+import nextcord
+
+logger = logging.getLogger('bot.HelpCatalog')
+
+# Discord's limit on autocomplete choices
+MAX_SUGGESTIONS = 25
+# Category used for commands whose cog isn't in a cogs/<category>/ package
+DEFAULT_CATEGORY = "utility"
+
+SUBCOMMAND_TYPES = (
+    nextcord.ApplicationCommandOptionType.sub_command.value,
+    nextcord.ApplicationCommandOptionType.sub_command_group.value
+)
+
+class HelpCatalog:
+    """
+    Catalog of slash commands built from the registered command tree.
+
+    Every slash command and subcommand becomes an entry with its description,
+    options and default permissions, taken from the same payloads that are
+    synced to Discord, and its category, taken from the package of the cog
+    that defines it. Entries are looked up by name, and a sorted index of
+    every word-suffix of every name answers prefix searches with a bisect
+    (so both "role" and "add" find "role add").
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.entries: Dict[str, dict] = {}
+        self._index: List[tuple] = []  # sorted (search key, qualified name)
+
+    def rebuild(self) -> None:
+        entries = {}
+        for command in self.bot.get_all_application_commands():
+            if not isinstance(command, nextcord.SlashApplicationCommand):
+                continue
+            payload = command.get_payload(None)
+            category = self._category(command)
+            permissions = self._permissions(payload.get("default_member_permissions"))
+            self._add_entries(entries, payload, payload["name"], category, permissions)
+
+        self.entries = dict(sorted(entries.items()))
+        self._index = sorted(
+            (" ".join(words[i:]), name)
+            for name, words in ((name, name.split()) for name in self.entries)
+            for i in range(len(words))
+        )
+        logger.debug(f"Help catalog built with {len(self.entries)} commands")
+
+    def _add_entries(self, entries: dict, payload: dict, name: str, category: str, permissions: List[str]) -> None:
+        """Add a command and, recursively, its subcommands"""
+        options = payload.get("options") or []
+        children = [option for option in options if option["type"] in SUBCOMMAND_TYPES]
+        entries[name] = {
+            "name": name,
+            "description": payload.get("description", ""),
+            "category": category,
+            "permissions": permissions,
+            "options": [
+                {"name": option["name"], "description": option.get("description", ""), "required": option.get("required", False)}
+                for option in options if option["type"] not in SUBCOMMAND_TYPES
+            ],
+            "subcommands": [f"{name} {child['name']}" for child in children]
+        }
+        for child in children:
+            self._add_entries(entries, child, f"{name} {child['name']}", category, permissions)
+
+    @staticmethod
+    def _category(command) -> str:
+        """Category from the cog's package, e.g. cogs.moderation.ban -> moderation"""
+        module = type(command.parent_cog).__module__ if command.parent_cog else ""
+        parts = module.split(".")
+        return parts[1] if len(parts) > 2 and parts[0] == "cogs" else DEFAULT_CATEGORY
+
+    @staticmethod
+    def _permissions(value: Optional[str]) -> List[str]:
+        if not value:
+            return []
+        return [name.upper() for name, enabled in nextcord.Permissions(int(value)) if enabled]
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.entries.get(" ".join(name.lower().lstrip("/").split()))
+
+    def by_category(self, category: str) -> List[dict]:
+        return [entry for entry in self.entries.values() if entry["category"] == category]
+
+    def search(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[str]:
+        """Command names with a word sequence starting with ``prefix``, in name order"""
+        prefix = " ".join(prefix.lower().lstrip("/").split())
+        matches = set()
+        for key, name in self._index[bisect.bisect_left(self._index, (prefix,)):]:
+            if not key.startswith(prefix):
+                break
+            matches.add(name)
+        return sorted(matches)[:limit]
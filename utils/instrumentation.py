@@ -0,0 +1,241 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import nextcord
+
+from utils.logging_setup import queue_depth
+from utils.metrics import registry
+
+logger = logging.getLogger('bot.Instrumentation')
+
+# Number of recent invocations per command kept for /perf percentiles
+PERF_WINDOW = 500
+
+# REST route of the request currently in flight, read by the aiohttp trace hooks
+current_route: contextvars.ContextVar[Optional[Tuple[str, str]]] = contextvars.ContextVar("current_route", default=None)
+
+# Metrics updated inline by the hooks below
+COMMANDS = registry.counter("bot_commands_total", "Slash commands invoked", ("command",))
+COMMAND_ERRORS = registry.counter("bot_command_errors_total", "Slash commands that raised an error", ("command",))
+COMMAND_LATENCY = registry.histogram("bot_command_duration_seconds", "Slash command run time", ("command",))
+GATEWAY_EVENTS = registry.counter("bot_gateway_events_total", "Gateway dispatch events received", ("event",))
+REST_REQUESTS = registry.counter("bot_rest_requests_total", "REST requests made", ("method", "route"))
+REST_RATE_LIMITED = registry.counter("bot_rest_rate_limited_total", "REST responses with status 429", ("method", "route"))
+
+class Invocation:
+    """Timings collected while one slash command runs"""
+    __slots__ = ("start", "first_response", "http_calls", "http_time")
+
+    def __init__(self, start: float):
+        self.start = start
+        self.first_response = None
+        self.http_calls = 0
+        self.http_time = 0.0
+
+# Slash command currently running in this context, if any
+current_invocation: contextvars.ContextVar[Optional[Invocation]] = contextvars.ContextVar("current_invocation", default=None)
+
+class CommandStats:
+    """
+    Rolling window of the most recent invocations of one command.
+    Samples are only appended here; percentiles are computed when they are read.
+    """
+
+    def __init__(self, size: int = PERF_WINDOW):
+        self.count = 0
+        self.ttfr = deque(maxlen=size)
+        self.total = deque(maxlen=size)
+        self.http_calls = deque(maxlen=size)
+        self.http_time = deque(maxlen=size)
+
+    def add(self, invocation: Invocation, end: float) -> None:
+        self.count += 1
+        if invocation.first_response is not None:
+            self.ttfr.append(invocation.first_response - invocation.start)
+        self.total.append(end - invocation.start)
+        self.http_calls.append(invocation.http_calls)
+        self.http_time.append(invocation.http_time)
+
+    @staticmethod
+    def percentiles(samples, *points: float) -> List[float]:
+        """Nearest-rank percentiles of a sample window, 0 for an empty window"""
+        if not samples:
+            return [0.0 for _ in points]
+        ordered = sorted(samples)
+        return [ordered[min(len(ordered) - 1, int(point / 100 * len(ordered)))] for point in points]
+
+# Per-command rolling stats shown by /perf
+command_stats: Dict[str, CommandStats] = {}
+
+def command_name(interaction: nextcord.Interaction) -> str:
+    """Full name of an invoked slash command, including subcommand groups"""
+    data = interaction.data or {}
+    parts = [data.get("name", "unknown")]
+    options = data.get("options") or []
+    # Option types 1 and 2 are subcommands and subcommand groups
+    while options and options[0].get("type") in (1, 2):
+        parts.append(options[0]["name"])
+        options = options[0].get("options") or []
+    return " ".join(parts)
+
+def _pending_expiries() -> dict:
+    """Count scheduled unmute/undeafen/unlock/slowmode tasks still waiting, by coroutine name"""
+    counts = {}
+    for task in asyncio.all_tasks():
+        name = getattr(task.get_coro(), "__qualname__", "").rpartition(".")[2]
+        if name.startswith("schedule_"):
+            counts[(name,)] = counts.get((name,), 0) + 1
+    return counts
+
+def _count_event(event: str, parser):
+    def parse(data):
+        GATEWAY_EVENTS.inc(event)
+        return parser(data)
+    return parse
+
+def _timed_response(method):
+    """Wrap an interaction response method to record time-to-first-response and HTTP time"""
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        invocation = current_invocation.get()
+        if invocation is None:
+            return await method(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            end = time.perf_counter()
+            invocation.http_calls += 1
+            invocation.http_time += end - start
+            if invocation.first_response is None:
+                invocation.first_response = end
+    wrapper.instrumented = True
+    return wrapper
+
+async def _on_request_end(session, context, params) -> None:
+    if params.response.status == 429:
+        REST_RATE_LIMITED.inc(*(current_route.get() or ("?", "?")))
+
+def instrument(bot) -> None:
+    """
+    Attach metrics collection to a bot before it connects.
+
+    Command timings come from wrapping ``process_application_commands``, gateway
+    event counts from wrapping the connection's parser table, and REST counts
+    from wrapping ``http.request``. Discord's 429 responses are retried inside
+    the HTTP client, so they are counted with an aiohttp trace hook instead.
+
+    While a command runs, its REST calls and interaction responses are
+    attributed to it through ``current_invocation`` for the stats shown by /perf.
+    """
+    # Slash command counts and latency
+    original_process = bot.process_application_commands
+
+    async def process_application_commands(interaction: nextcord.Interaction):
+        if interaction.type != nextcord.InteractionType.application_command:
+            return await original_process(interaction)
+        name = command_name(interaction)
+        invocation = Invocation(time.perf_counter())
+        token = current_invocation.set(invocation)
+        try:
+            return await original_process(interaction)
+        finally:
+            end = time.perf_counter()
+            current_invocation.reset(token)
+            COMMANDS.inc(name)
+            COMMAND_LATENCY.observe(end - invocation.start, name)
+            stats = command_stats.get(name)
+            if stats is None:
+                stats = command_stats[name] = CommandStats()
+            stats.add(invocation, end)
+
+    bot.process_application_commands = process_application_commands
+
+    async def on_application_command_error(interaction, error):
+        COMMAND_ERRORS.inc(command_name(interaction))
+
+    bot.add_listener(on_application_command_error, "on_application_command_error")
+
+    # Interaction responses and followups go through the webhook adapter rather than http.request
+    for owner, method_name in (
+        (nextcord.InteractionResponse, "send_message"),
+        (nextcord.InteractionResponse, "defer"),
+        (nextcord.InteractionResponse, "edit_message"),
+        (nextcord.InteractionResponse, "send_modal"),
+        (nextcord.Webhook, "send")
+    ):
+        method = getattr(owner, method_name)
+        if not getattr(method, "instrumented", False):
+            setattr(owner, method_name, _timed_response(method))
+
+    # Gateway events by type
+    parsers = bot._connection.parsers
+    for event, parser in list(parsers.items()):
+        parsers[event] = _count_event(event, parser)
+
+    # REST requests by route
+    original_request = bot.http.request
+
+    async def request(route, **kwargs):
+        key = (route.method, route.path)
+        REST_REQUESTS.inc(*key)
+        token = current_route.set(key)
+        start = time.perf_counter()
+        try:
+            return await original_request(route, **kwargs)
+        finally:
+            current_route.reset(token)
+            invocation = current_invocation.get()
+            if invocation is not None:
+                invocation.http_calls += 1
+                invocation.http_time += time.perf_counter() - start
+
+    bot.http.request = request
+
+    # The HTTP session only exists after login, so the trace hook is attached on connect
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_end.append(_on_request_end)
+    trace_config.freeze()
+
+    async def on_connect():
+        session = getattr(bot.http, "_HTTPClient__session", None)
+        trace_configs = getattr(session, "_trace_configs", None)
+        if trace_configs is not None and trace_config not in trace_configs:
+            trace_configs.append(trace_config)
+
+    bot.add_listener(on_connect, "on_connect")
+
+    # Values read at scrape time
+    registry.gauge("bot_pending_expiries", "Scheduled moderation expiries waiting to run", ("task",), func=_pending_expiries)
+    registry.gauge("bot_log_queue_depth", "Log records waiting for the logging thread", func=queue_depth)
+
+    def message_cache_hit_rate():
+        cog = bot.get_cog("MessageLogEvents")
+        return cog.message_cache.hit_rate if cog else 0
+
+    registry.gauge("bot_message_cache_hit_rate", "Fraction of message log lookups served from the cache", func=message_cache_hit_rate)
+
+    def antispam_tracked_users():
+        cog = bot.get_cog("AntiSpam")
+        return len(cog.tracker) if cog else 0
+
+    registry.gauge("bot_antispam_tracked_users", "Users with an anti-spam window in memory", func=antispam_tracked_users)
+
+    def population():
+        stats = getattr(bot, "bot_stats", None)
+        if stats is None:
+            return {}
+        return {("guilds",): stats.guilds, ("members",): stats.members, ("channels",): stats.channels}
+
+    registry.gauge("bot_population", "Guilds, members and channels the bot can see", ("kind",), func=population)
+
+    def cached_members():
+        return sum(len(guild._members) for guild in bot.guilds)
+
+    registry.gauge("bot_cached_members", "Members held in the member cache", func=cached_members)
@@ -0,0 +1,128 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Optional
+
+try:
+    import colorlog
+except ImportError:
+    colorlog = None
+
+# Default log settings, overridable from the environment
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+COLOR_LOG_FORMAT = "%(log_color)s%(asctime)s [%(levelname)s]%(reset)s %(name)s: %(message)s"
+DEFAULT_LOG_FILE = "./logs/bot.jsonl"
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_queue: Optional[queue.Queue] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class LoopSafeQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The stock handler formats the whole record, traceback included, before
+    queueing it. Here only the message arguments are merged so the record is
+    frozen, and exception info is passed through for the listener to format.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def _parse_levels(spec: str) -> dict:
+    """Parse ``name=LEVEL`` pairs separated by commas, e.g. ``bot.Status=DEBUG,autorole=WARNING``"""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging() -> None:
+    """
+    Route all logging through a queue to a background listener thread.
+
+    Settings (all optional):
+        LOG_LEVEL            root level, default INFO
+        LOG_LEVELS           per-logger levels, e.g. ``bot.Status=DEBUG,autorole=WARNING``
+        LOG_CONSOLE_COLOR    colorize console output when colorlog is installed, default true
+        LOG_FILE             JSON-lines log file, default ./logs/bot.jsonl ("" disables it)
+        LOG_FILE_MAX_BYTES   size before the file is rotated, default 10 MB
+        LOG_FILE_BACKUPS     number of rotated files kept, default 5
+    """
+    global _queue, _listener
+    if _listener is not None:
+        return
+
+    handlers = []
+
+    # Console output
+    console = logging.StreamHandler()
+    if colorlog and os.getenv("LOG_CONSOLE_COLOR", "true").lower() in ("1", "true", "yes"):
+        console.setFormatter(colorlog.ColoredFormatter(COLOR_LOG_FORMAT))
+    else:
+        console.setFormatter(logging.Formatter(LOG_FORMAT))
+    handlers.append(console)
+
+    # JSON-lines file output
+    log_file = os.getenv("LOG_FILE", DEFAULT_LOG_FILE)
+    if log_file:
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=int(os.getenv("LOG_FILE_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("LOG_FILE_BACKUPS", "5")),
+            encoding="utf-8"
+        )
+        file_handler.setFormatter(JSONFormatter())
+        handlers.append(file_handler)
+
+    # Everything logged on the event loop only goes as far as the queue
+    _queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.addHandler(LoopSafeQueueHandler(_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def queue_depth() -> int:
+    """Number of records waiting to be written by the listener thread"""
+    return _queue.qsize() if _queue is not None else 0
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import nextcord
+from nextcord.ext import tasks
+
+logger = logging.getLogger('bot.MemberCache')
+
+# "full" chunks every guild at startup and keeps all members (nextcord's default),
+# "lazy" only chunks a guild when a command needs its full membership
+MEMBER_CACHE_MODES = ("full", "lazy")
+# Idle guilds are looked for every ttl seconds, but no more often than this and at least every 5 minutes
+MIN_EVICT_INTERVAL = 10
+MAX_EVICT_INTERVAL = 300
+
+class MemberCache:
+    """
+    Member cache policy.
+
+    In lazy mode guilds are not chunked at startup. Commands that need a
+    guild's full member list call ``ensure`` first, which chunks it once and
+    marks it as used. Member lists of guilds not used for ``ttl`` seconds are
+    dropped again, keeping only the bot itself and members in voice channels.
+    Single lookups go through ``get_member``, which falls back to the API when
+    the guild isn't fully cached.
+    """
+
+    def __init__(self, bot, mode: str = "full", ttl: float = 1800):
+        if mode not in MEMBER_CACHE_MODES:
+            raise ValueError(f"MEMBER_CACHE_MODE must be one of {', '.join(MEMBER_CACHE_MODES)}, not {mode!r}")
+        if ttl <= 0:
+            raise ValueError(f"MEMBER_CACHE_TTL must be a positive number of seconds, not {ttl!r}")
+        self.bot = bot
+        self.mode = mode
+        self.ttl = ttl
+        self.last_used: Dict[int, float] = {}
+        self.chunks = 0
+        self.evictions = 0
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._evict_loop = tasks.loop(seconds=max(min(ttl, MAX_EVICT_INTERVAL), MIN_EVICT_INTERVAL))(self._evict_tick)
+
+    @property
+    def lazy(self) -> bool:
+        return self.mode == "lazy"
+
+    def start(self) -> None:
+        if self.lazy and not self._evict_loop.is_running():
+            self._evict_loop.start()
+
+    def stop(self) -> None:
+        self._evict_loop.cancel()
+
+    async def ensure(self, guild: nextcord.Guild) -> None:
+        """Make sure a guild's full member list is cached before using it"""
+        self.last_used[guild.id] = time.monotonic()
+        if guild.chunked:
+            return
+
+        # Concurrent commands in the same guild share one chunk request
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if guild.chunked:
+                return
+            start = time.perf_counter()
+            await guild.chunk(cache=True)
+            self.chunks += 1
+            logger.info(f"Chunked {guild.name} ({guild.id}): {len(guild._members):,} members in {time.perf_counter() - start:.2f}s")
+
+    async def get_member(self, guild: nextcord.Guild, user_id: int) -> Optional[nextcord.Member]:
+        """Cached member, or one fetched from the API when the guild isn't fully cached"""
+        member = guild.get_member(user_id)
+        if member is not None or guild.chunked:
+            return member
+        try:
+            member = await guild.fetch_member(user_id)
+        except nextcord.NotFound:
+            return None
+        guild._add_member(member)
+        self.last_used.setdefault(guild.id, time.monotonic())
+        return member
+
+    def evict(self, guild: nextcord.Guild) -> int:
+        """Drop a guild's member list, keeping the bot and anyone in a voice channel"""
+        keep = {self.bot.user.id} | set(guild._voice_states)
+        dropped = 0
+        for member_id in list(guild._members):
+            if member_id not in keep:
+                del guild._members[member_id]
+                dropped += 1
+        self.last_used.pop(guild.id, None)
+        self.evictions += 1
+        return dropped
+
+    def counts(self) -> List[Tuple[nextcord.Guild, int]]:
+        """Cached member count of every guild, largest first"""
+        return sorted(((guild, len(guild._members)) for guild in self.bot.guilds), key=lambda item: item[1], reverse=True)
+
+    async def _evict_tick(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        for guild_id, used in list(self.last_used.items()):
+            if used > cutoff:
+                continue
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                self.last_used.pop(guild_id, None)
+                continue
+            dropped = self.evict(guild)
+            logger.debug(f"Evicted {dropped:,} idle cached members from {guild.name} ({guild.id})")
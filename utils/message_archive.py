@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import time
+from typing import List, Optional
+
+from utils.sqlite_store import BatchedSQLiteStore
+
+# How often retention limits are enforced (seconds)
+RETENTION_INTERVAL = 3600
+
+class MessageArchive(BatchedSQLiteStore):
+    """
+    On-disk archive of edited and deleted messages with a full-text index.
+
+    Each row records one event ("edit" or "delete"). ``content`` holds the text
+    that was lost (the deleted message, or the message before the edit) and
+    ``after_content`` holds the new text of an edit. Both are indexed with FTS5.
+    Retention is bounded per guild by age and by row count.
+    """
+
+    def __init__(self, path: str, max_age_days: int = 30, max_rows_per_guild: int = 50000, **kwargs):
+        super().__init__(path, **kwargs)
+        self.max_age_days = max_age_days
+        self.max_rows_per_guild = max_rows_per_guild
+        self._last_retention = 0.0
+
+    def record_edit(self, guild_id: int, channel_id: int, message_id: int, author, before: str, after: str) -> None:
+        """Queue a message edit for archiving"""
+        self.enqueue((
+            guild_id, channel_id, message_id,
+            author.id if author else None, str(author) if author else None,
+            "edit", before, after, None, time.time()
+        ))
+
+    def record_delete(self, guild_id: int, channel_id: int, message_id: int, author_id: Optional[int],
+                      author_name: Optional[str], content: str, attachments: Optional[List[str]] = None) -> None:
+        """Queue a message deletion for archiving"""
+        self.enqueue((
+            guild_id, channel_id, message_id, author_id, author_name,
+            "delete", content, None, json.dumps(attachments) if attachments else None, time.time()
+        ))
+
+    async def search(self, guild_id: int, user_id: Optional[int] = None, channel_id: Optional[int] = None,
+                     since: Optional[float] = None, until: Optional[float] = None, text: Optional[str] = None,
+                     event: Optional[str] = None, before_id: Optional[int] = None, limit: int = 10) -> List[dict]:
+        """
+        Search archived messages for a guild, newest first.
+
+        Results are paginated by keyset: pass the ``id`` of the last row of a page
+        as ``before_id`` to get the next page.
+        """
+        return await self.run(
+            self._search, guild_id, user_id, channel_id, since, until, text, event, before_id, limit
+        )
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                channel_id INTEGER NOT NULL,
+                message_id INTEGER NOT NULL,
+                author_id INTEGER,
+                author_name TEXT,
+                event TEXT NOT NULL,
+                content TEXT,
+                after_content TEXT,
+                attachments TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_guild ON messages (guild_id, id);
+            CREATE INDEX IF NOT EXISTS idx_messages_author ON messages (guild_id, author_id, id);
+            CREATE INDEX IF NOT EXISTS idx_messages_channel ON messages (guild_id, channel_id, id);
+            CREATE INDEX IF NOT EXISTS idx_messages_created ON messages (guild_id, created_at);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                content, after_content, content='messages', content_rowid='id'
+            );
+            CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts (rowid, content, after_content)
+                VALUES (new.id, new.content, new.after_content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, content, after_content)
+                VALUES ('delete', old.id, old.content, old.after_content);
+            END;
+        """)
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list) -> None:
+        conn.executemany(
+            "INSERT INTO messages (guild_id, channel_id, message_id, author_id, author_name, event, "
+            "content, after_content, attachments, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _maintain(self, conn: sqlite3.Connection) -> None:
+        """Enforce the age and per-guild size limits"""
+        now = time.time()
+        if now - self._last_retention < RETENTION_INTERVAL:
+            return
+        self._last_retention = now
+
+        with conn:
+            conn.execute("DELETE FROM messages WHERE created_at < ?", (now - self.max_age_days * 86400,))
+
+            oversized = conn.execute(
+                "SELECT guild_id FROM messages GROUP BY guild_id HAVING COUNT(*) > ?",
+                (self.max_rows_per_guild,)
+            ).fetchall()
+            for row in oversized:
+                conn.execute(
+                    "DELETE FROM messages WHERE guild_id = ? AND id <= ("
+                    "SELECT id FROM messages WHERE guild_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (row["guild_id"], row["guild_id"], self.max_rows_per_guild)
+                )
+
+    def _search(self, conn, guild_id, user_id, channel_id, since, until, text, event, before_id, limit) -> List[dict]:
+        clauses = ["m.guild_id = ?"]
+        params = [guild_id]
+
+        if user_id is not None:
+            clauses.append("m.author_id = ?")
+            params.append(user_id)
+        if channel_id is not None:
+            clauses.append("m.channel_id = ?")
+            params.append(channel_id)
+        if since is not None:
+            clauses.append("m.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("m.created_at <= ?")
+            params.append(until)
+        if event:
+            clauses.append("m.event = ?")
+            params.append(event)
+        if before_id is not None:
+            clauses.append("m.id < ?")
+            params.append(before_id)
+
+        query = "SELECT m.* FROM messages m"
+        if text:
+            # Quote every term so user input can't break the FTS query syntax
+            terms = " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+            query += " JOIN messages_fts f ON f.rowid = m.id"
+            clauses.append("messages_fts MATCH ?")
+            params.append(terms)
+
+        query += " WHERE " + " AND ".join(clauses) + " ORDER BY m.id DESC LIMIT ?"
+        params.append(limit)
+
+        results = []
+        for row in conn.execute(query, params):
+            result = dict(row)
+            result["attachments"] = json.loads(row["attachments"]) if row["attachments"] else []
+            results.append(result)
+        return results
@@ -0,0 +1,201 @@
+import datetime
+import lzma
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Discord attachment URLs follow a fixed layout, so only the variable parts need to be kept.
+# The signed query (ex/is/hm) is one of them: the CDN rejects attachment URLs without it.
+ATTACHMENT_URL_PATTERN = re.compile(r"^https://cdn\.discordapp\.com/attachments/(\d+)/(\d+)/([^?#]+)(\?[^#]*)?$")
+ATTACHMENT_URL_FORMAT = "https://cdn.discordapp.com/attachments/{}/{}/{}{}"
+
+# Content codecs used by the compact representation
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_LZMA = 2
+
+CODECS = {
+    "zlib": CODEC_ZLIB,
+    "lzma": CODEC_LZMA
+}
+
+class MessageCache:
+    """
+    Bounded cache of recently seen messages used by the message logs.
+
+    In the default mode every message is kept as a plain dict. In compact mode
+    messages are stored as tuples: content as UTF-8 bytes (compressed above
+    ``compress_threshold``) and attachments as ``(channel_id, attachment_id,
+    filename, query)`` tuples. In both modes authors are a reference into a
+    shared, reference-counted table, and ``get``/``pop`` return the same dict
+    shape.
+    """
+
+    def __init__(self, max_size: int = 1000, compact: bool = False, codec: str = "zlib", compress_threshold: int = 256):
+        self.max_size = max_size
+        self.compact = compact
+        self.codec = CODECS.get(codec, CODEC_ZLIB)
+        self.compress_threshold = compress_threshold
+        self._entries: Dict[int, object] = {}
+        self._authors: Dict[int, list] = {}  # author_id -> [name, avatar_url, refcount]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._entries
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found a cached message"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def put(self, message) -> None:
+        """Cache a message, evicting the oldest entry once the cache is full"""
+        if message.id in self._entries:
+            self._discard(message.id)
+        elif len(self._entries) >= self.max_size:
+            self._discard(next(iter(self._entries)))
+
+        author = message.author
+        self._intern_author(author)
+        if not self.compact:
+            self._entries[message.id] = {
+                "content": message.content,
+                "attachments": [attachment.url for attachment in message.attachments],
+                "timestamp": datetime.datetime.now(),
+                "author_id": author.id
+            }
+            return
+
+        self._entries[message.id] = (
+            self._encode_content(message.content),
+            self._pack_attachments(message.attachments),
+            author.id,
+            datetime.datetime.now().timestamp()
+        )
+
+    def get(self, message_id: int) -> Optional[dict]:
+        """Return the cached message as a dict, or None if it is not cached"""
+        entry = self._entries.get(message_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._unpack(entry)
+
+    def pop(self, message_id: int) -> Optional[dict]:
+        """Remove a message from the cache and return it"""
+        entry = self._entries.get(message_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        data = self._unpack(entry)
+        self._discard(message_id)
+        return data
+
+    def pop_many(self, message_ids: Iterable[int]) -> List[Tuple[int, dict]]:
+        """Remove several messages in one pass, returning the ones that were cached"""
+        found = []
+        for message_id in message_ids:
+            data = self.pop(message_id)
+            if data is not None:
+                found.append((message_id, data))
+        return found
+
+    def update_content(self, message_id: int, content: str) -> None:
+        """Replace the cached content of a message after an edit"""
+        entry = self._entries.get(message_id)
+        if entry is None:
+            return
+        if not self.compact:
+            entry["content"] = content
+        else:
+            self._entries[message_id] = (self._encode_content(content),) + entry[1:]
+
+    def _discard(self, message_id: int) -> None:
+        """Drop an entry and release its author reference"""
+        entry = self._entries.pop(message_id, None)
+        if entry is None:
+            return
+        author_id = entry[2] if self.compact else entry["author_id"]
+        author = self._authors.get(author_id)
+        if author:
+            author[2] -= 1
+            if author[2] <= 0:
+                del self._authors[author_id]
+
+    def _intern_author(self, author) -> None:
+        """Store author details once per author instead of once per message"""
+        record = self._authors.get(author.id)
+        if record is None:
+            self._authors[author.id] = [str(author), author.display_avatar.url, 1]
+            return
+        record[0] = str(author)
+        record[1] = author.display_avatar.url
+        record[2] += 1
+
+    def _encode_content(self, content: str):
+        """Encode content as UTF-8, compressing it when that actually saves space"""
+        if not content:
+            return b""
+        raw = content.encode("utf-8")
+        if len(raw) < self.compress_threshold:
+            return raw
+        if self.codec == CODEC_LZMA:
+            packed = lzma.compress(raw)
+        else:
+            packed = zlib.compress(raw)
+        if len(packed) + 1 >= len(raw):
+            return raw
+        return (self.codec, packed)
+
+    def _decode_content(self, content) -> str:
+        """Reverse _encode_content"""
+        if isinstance(content, bytes):
+            return content.decode("utf-8")
+        codec, packed = content
+        if codec == CODEC_LZMA:
+            return lzma.decompress(packed).decode("utf-8")
+        return zlib.decompress(packed).decode("utf-8")
+
+    def _pack_attachments(self, attachments) -> tuple:
+        """Store attachment URLs as (channel_id, attachment_id, filename, query) where possible"""
+        if not attachments:
+            return ()
+        packed = []
+        for attachment in attachments:
+            match = ATTACHMENT_URL_PATTERN.match(attachment.url)
+            if match:
+                packed.append((int(match.group(1)), int(match.group(2)), match.group(3), match.group(4) or ""))
+            else:
+                # Keep URLs we don't recognise verbatim
+                packed.append(attachment.url)
+        return tuple(packed)
+
+    def _unpack(self, entry) -> dict:
+        """Convert a stored entry back into the dict shape used by the message logs"""
+        if not self.compact:
+            author = self._authors.get(entry["author_id"])
+            return {
+                "content": entry["content"],
+                "attachments": entry["attachments"],
+                "timestamp": entry["timestamp"],
+                "author": (entry["author_id"], author[0], author[1]) if author else None
+            }
+
+        content, attachments, author_id, timestamp = entry
+        author = self._authors.get(author_id)
+        return {
+            "content": self._decode_content(content),
+            "attachments": [
+                ATTACHMENT_URL_FORMAT.format(*attachment) if isinstance(attachment, tuple) else attachment
+                for attachment in attachments
+            ],
+            "timestamp": datetime.datetime.fromtimestamp(timestamp),
+            "author": (author_id, author[0], author[1]) if author else None
+        }
@@ -0,0 +1,195 @@
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import nextcord
+
+from utils.embed_helper import EmbedHelper
+from utils.metrics import registry
+
+logger = logging.getLogger('bot.ResponseCache')
+
+# Seconds a rendered embed is reused for, per command
+DEFAULT_TTLS = {
+    "status": 10,
+    "serverinfo": 60,
+    "role_info": 60,
+    "userinfo": 60
+}
+# Entries kept per command before the least recently used are dropped
+MAX_ENTRIES = 1024
+
+# Token buckets: (uses allowed in a burst, seconds for the bucket to refill completely)
+USER_COOLDOWN = (3, 15.0)
+GUILD_COOLDOWN = (15, 15.0)
+
+RESPONSE_CACHE_REQUESTS = registry.counter(
+    "bot_response_cache_requests_total", "Response cache lookups", ("command", "result")
+)
+COOLDOWN_REJECTIONS = registry.counter(
+    "bot_command_cooldown_rejections_total", "Commands rejected by a cooldown bucket", ("bucket",)
+)
+
+class TokenBuckets:
+    """
+    Token buckets keyed by user or guild ID.
+
+    Each bucket holds up to ``capacity`` tokens and refills at
+    ``capacity / per`` tokens per second; every use takes one token.
+    """
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}  # key -> (tokens, updated)
+
+    def _tokens(self, key: Hashable, now: float) -> float:
+        tokens, updated = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated) * self.rate)
+
+    def wait_time(self, key: Hashable) -> float:
+        """Seconds until a token is available, 0 if one is available now; takes nothing"""
+        tokens = self._tokens(key, time.monotonic())
+        return 0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self, key: Hashable) -> float:
+        """Take a token; returns 0 on success, or the seconds until one is available"""
+        now = time.monotonic()
+        tokens = self._tokens(key, now)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+        self._buckets[key] = (tokens - 1, now)
+        # Buckets that have refilled completely are the same as missing ones
+        if len(self._buckets) > MAX_ENTRIES:
+            self._buckets = {
+                k: (t, u) for k, (t, u) in self._buckets.items()
+                if t + (now - u) * self.rate < self.capacity
+            }
+        return 0
+
+class ResponseCache:
+    """
+    Cache of rendered embeds for informational commands.
+
+    Entries are keyed per command and per guild, role or user, expire after
+    the command's TTL and are dropped early by gateway events that change what
+    they show. Commands also share per-user and per-guild cooldown buckets.
+    """
+
+    def __init__(self, bot, ttls: Optional[Dict[str, float]] = None):
+        self.bot = bot
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._entries: Dict[str, OrderedDict] = {command: OrderedDict() for command in self.ttls}
+        self.hits = Counter()
+        self.misses = Counter()
+        self.user_buckets = TokenBuckets(*USER_COOLDOWN)
+        self.guild_buckets = TokenBuckets(*GUILD_COOLDOWN)
+
+    # Cache
+    #=============================================================================================================================================================
+    def get(self, command: str, key: Hashable) -> Optional[nextcord.Embed]:
+        """A copy of the cached embed, or None if it's missing or expired"""
+        entries = self._entries[command]
+        entry = entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            entries.pop(key, None)
+            self.misses[command] += 1
+            RESPONSE_CACHE_REQUESTS.inc(command, "miss")
+            return None
+        entries.move_to_end(key)
+        self.hits[command] += 1
+        RESPONSE_CACHE_REQUESTS.inc(command, "hit")
+        return entry[1].copy()
+
+    def put(self, command: str, key: Hashable, embed: nextcord.Embed) -> None:
+        entries = self._entries[command]
+        entries[key] = (time.monotonic() + self.ttls[command], embed.copy())
+        entries.move_to_end(key)
+        while len(entries) > MAX_ENTRIES:
+            entries.popitem(last=False)
+
+    def invalidate(self, command: str, key: Hashable) -> None:
+        self._entries[command].pop(key, None)
+
+    def hit_rate(self, command: str) -> float:
+        total = self.hits[command] + self.misses[command]
+        return self.hits[command] / total if total else 0.0
+
+    # Cooldowns
+    #=============================================================================================================================================================
+    def retry_after(self, user_id: int, guild_id: Optional[int]) -> float:
+        """
+        Take a token from the user's and the guild's bucket; returns seconds to wait if either is empty.
+        Both are checked before either is taken, so a rejected command costs no tokens.
+        """
+        retry = self.user_buckets.wait_time(user_id)
+        if retry:
+            COOLDOWN_REJECTIONS.inc("user")
+            return retry
+        if guild_id is not None:
+            retry = self.guild_buckets.wait_time(guild_id)
+            if retry:
+                COOLDOWN_REJECTIONS.inc("guild")
+                return retry
+            self.guild_buckets.take(guild_id)
+        self.user_buckets.take(user_id)
+        return 0
+
+    @staticmethod
+    def cooldown_embed(retry_after: float) -> nextcord.Embed:
+        return EmbedHelper.warning_embed(
+            "Slow Down",
+            f"This command is on cooldown. Try again in {max(1, round(retry_after))}s."
+        )
+
+    # Invalidation
+    #=============================================================================================================================================================
+    def register_listeners(self) -> None:
+        """Drop cached responses when the things they show change"""
+        self.bot.add_listener(self.on_guild_update, "on_guild_update")
+        self.bot.add_listener(self.on_guild_channel_change, "on_guild_channel_create")
+        self.bot.add_listener(self.on_guild_channel_change, "on_guild_channel_delete")
+        self.bot.add_listener(self.on_guild_role_change, "on_guild_role_create")
+        self.bot.add_listener(self.on_guild_role_change, "on_guild_role_delete")
+        self.bot.add_listener(self.on_guild_role_update, "on_guild_role_update")
+        self.bot.add_listener(self.on_guild_assets_update, "on_guild_emojis_update")
+        self.bot.add_listener(self.on_guild_assets_update, "on_guild_stickers_update")
+        self.bot.add_listener(self.on_member_update, "on_member_update")
+        self.bot.add_listener(self.on_member_update, "on_presence_update")
+        self.bot.add_listener(self.on_member_remove, "on_member_remove")
+        self.bot.add_listener(self.on_user_update, "on_user_update")
+
+    async def on_guild_update(self, before, after):
+        self.invalidate("serverinfo", after.id)
+
+    async def on_guild_channel_change(self, channel):
+        self.invalidate("serverinfo", channel.guild.id)
+
+    async def on_guild_role_change(self, role):
+        self.invalidate("serverinfo", role.guild.id)
+        self.invalidate("role_info", role.id)
+
+    async def on_guild_role_update(self, before, after):
+        self.invalidate("role_info", after.id)
+        self.invalidate("serverinfo", after.guild.id)
+
+    async def on_guild_assets_update(self, guild, before, after):
+        self.invalidate("serverinfo", guild.id)
+
+    async def on_member_update(self, before, after):
+        self.invalidate("userinfo", (after.guild.id, after.id))
+        # Member counts of roles the member gained or lost
+        for role in set(before.roles) ^ set(after.roles):
+            self.invalidate("role_info", role.id)
+
+    async def on_member_remove(self, member):
+        self.invalidate("userinfo", (member.guild.id, member.id))
+        for role in member.roles:
+            self.invalidate("role_info", role.id)
+
+    async def on_user_update(self, before, after):
+        for key in [key for key in self._entries["userinfo"] if key[1] == after.id]:
+            self.invalidate("userinfo", key)
@@ -0,0 +1,215 @@
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+
+import aiohttp
+
+from utils.instrumentation import current_invocation
+from utils.metrics import registry
+
+logger = logging.getLogger('bot.RestScheduler')
+
+# Lanes in priority order: replies to commands, log messages, then bulk jobs
+LANES = ("interactive", "logging", "bulk")
+LANE_PRIORITY = {lane: priority for priority, lane in enumerate(LANES)}
+
+# REST requests allowed in flight at once, and how many of them may be bulk
+MAX_IN_FLIGHT = 20
+BULK_MAX_IN_FLIGHT = 4
+# Route buckets tracked before ones that have already reset are dropped
+MAX_BUCKETS = 5000
+
+# Wait buckets in seconds; bulk requests routinely wait much longer than replies
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REST_QUEUE_WAIT = registry.histogram(
+    "bot_rest_queue_wait_seconds", "Time REST requests waited in the scheduler before being sent", ("lane",), QUEUE_WAIT_BUCKETS
+)
+REST_BUCKET_WAITS = registry.counter(
+    "bot_rest_bucket_waits_total", "REST requests held back until their route's rate limit reset", ("lane",)
+)
+
+# Lane set explicitly by the code making the requests, see rest_lane()
+current_lane: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_lane", default=None)
+# Route bucket of the request in flight, read by the aiohttp trace hook
+current_bucket: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_bucket", default=None)
+
+@contextlib.contextmanager
+def rest_lane(lane: str) -> Iterator[None]:
+    """Send the REST requests made inside this block through ``lane``"""
+    if lane not in LANE_PRIORITY:
+        raise ValueError(f"Unknown REST lane {lane!r}, expected one of {', '.join(LANES)}")
+    token = current_lane.set(lane)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+def request_lane() -> str:
+    """Lane of a request: set explicitly, else interactive inside a slash command and logging elsewhere"""
+    lane = current_lane.get()
+    if lane is not None:
+        return lane
+    return "interactive" if current_invocation.get() is not None else "logging"
+
+class RouteBucket:
+    """Rate limit state of one route bucket, as last reported by Discord"""
+    __slots__ = ("remaining", "reset_at")
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+class RestScheduler:
+    """
+    Priority layer in front of ``bot.http.request``.
+
+    Every REST request takes one of ``max_in_flight`` slots before it is
+    sent. When slots run out, waiting requests are admitted in lane order, so
+    a bulk job (lockdown, role add to everyone, purge) never delays command
+    replies or log messages queued behind it, and bulk requests are capped at
+    ``bulk_max_in_flight`` slots on top of that.
+
+    Each route bucket's remaining requests and reset time are read from
+    Discord's rate limit headers. A request whose bucket is exhausted waits
+    for the reset before taking a slot instead of sleeping inside the HTTP
+    client while holding one.
+    """
+
+    def __init__(self, bot, max_in_flight: int = MAX_IN_FLIGHT, bulk_max_in_flight: int = BULK_MAX_IN_FLIGHT):
+        self.bot = bot
+        self.max_in_flight = max_in_flight
+        self.bulk_max_in_flight = min(bulk_max_in_flight, max_in_flight)
+        self.in_flight = Counter()
+        self.queued = Counter()
+        self.buckets: Dict[str, RouteBucket] = {}
+        self._waiters: List[tuple] = []  # heap of (priority, sequence, lane, future)
+        self._sequence = itertools.count()
+
+    # Slots
+    #=============================================================================================================================================================
+    def _can_start(self, lane: str) -> bool:
+        if sum(self.in_flight.values()) >= self.max_in_flight:
+            return False
+        return lane != "bulk" or self.in_flight["bulk"] < self.bulk_max_in_flight
+
+    async def _acquire(self, lane: str) -> None:
+        # Only jump the queue when nothing of the same or higher priority is waiting
+        if self._can_start(lane) and (not self._waiters or self._waiters[0][0] > LANE_PRIORITY[lane]):
+            self.in_flight[lane] += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (LANE_PRIORITY[lane], next(self._sequence), lane, future))
+        self.queued[lane] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot handed over just as the request was cancelled goes to the next waiter
+            if future.done() and not future.cancelled():
+                self._release(lane)
+            raise
+        finally:
+            self.queued[lane] -= 1
+
+    def _release(self, lane: str) -> None:
+        self.in_flight[lane] -= 1
+        # Waiters are ordered by lane, so once the first can't start (bulk at its cap) nothing behind it can
+        while self._waiters and self._can_start(self._waiters[0][2]):
+            _, _, waiting_lane, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self.in_flight[waiting_lane] += 1
+            future.set_result(None)
+
+    # Route buckets
+    #=============================================================================================================================================================
+    async def _wait_for_bucket(self, key: str, lane: str) -> None:
+        """Wait until the route bucket has a request left, then reserve it"""
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return
+        while bucket.remaining is not None and bucket.remaining <= 0:
+            delay = bucket.reset_at - time.monotonic()
+            if delay <= 0:
+                bucket.remaining = None
+                break
+            REST_BUCKET_WAITS.inc(lane)
+            await asyncio.sleep(delay)
+        if bucket.remaining is not None:
+            bucket.remaining -= 1
+
+    def update_bucket(self, key: str, headers) -> None:
+        """Record the rate limit headers of a response"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is None or reset_after is None:
+            return
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= MAX_BUCKETS:
+                self.prune_buckets()
+            bucket = self.buckets[key] = RouteBucket()
+        bucket.remaining = int(remaining)
+        bucket.reset_at = time.monotonic() + float(reset_after)
+
+    def prune_buckets(self) -> None:
+        """Forget buckets whose limits have reset"""
+        now = time.monotonic()
+        self.buckets = {key: bucket for key, bucket in self.buckets.items() if bucket.reset_at > now}
+
+    # Installation
+    #=============================================================================================================================================================
+    def install(self) -> None:
+        """Wrap the bot's HTTP client; call after instrument() so request metrics count actual sends"""
+        original_request = self.bot.http.request
+
+        async def request(route, **kwargs):
+            lane = request_lane()
+            key = f"{route.method} {route.bucket}"
+            start = time.perf_counter()
+            await self._wait_for_bucket(key, lane)
+            await self._acquire(lane)
+            REST_QUEUE_WAIT.observe(time.perf_counter() - start, lane)
+            token = current_bucket.set(key)
+            try:
+                return await original_request(route, **kwargs)
+            finally:
+                current_bucket.reset(token)
+                self._release(lane)
+
+        self.bot.http.request = request
+
+        # Rate limit headers are only visible on the raw response, so they are read with a trace hook
+        async def on_request_end(session, context, params):
+            key = current_bucket.get()
+            if key is not None:
+                self.update_bucket(key, params.response.headers)
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.freeze()
+
+        async def on_connect():
+            session = getattr(self.bot.http, "_HTTPClient__session", None)
+            trace_configs = getattr(session, "_trace_configs", None)
+            if trace_configs is not None and trace_config not in trace_configs:
+                trace_configs.append(trace_config)
+            self.prune_buckets()
+
+        self.bot.add_listener(on_connect, "on_connect")
+
+        registry.gauge(
+            "bot_rest_queued", "REST requests waiting in the scheduler", ("lane",),
+            func=lambda: {(lane,): self.queued[lane] for lane in LANES}
+        )
+        registry.gauge(
+            "bot_rest_in_flight", "REST requests being sent", ("lane",),
+            func=lambda: {(lane,): self.in_flight[lane] for lane in LANES}
+        )
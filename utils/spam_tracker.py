@@ -0,0 +1,129 @@
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from utils.metrics import registry
+
+# Messages remembered per user; every window below is evaluated over these
+HISTORY = 10
+# More than MESSAGE_LIMIT messages within MESSAGE_WINDOW seconds
+MESSAGE_LIMIT = 5
+MESSAGE_WINDOW = 5.0
+# DUPLICATE_LIMIT identical messages within DUPLICATE_WINDOW seconds
+DUPLICATE_LIMIT = 3
+DUPLICATE_WINDOW = 30.0
+# MENTION_LIMIT user/role mentions within MENTION_WINDOW seconds
+MENTION_LIMIT = 10
+MENTION_WINDOW = 30.0
+# Users are forgotten after this many idle seconds, and at most MAX_TRACKED are kept
+IDLE_TTL = 120.0
+MAX_TRACKED = 50000
+
+NEVER = float("-inf")
+
+SPAM_TRIGGERS = registry.counter("bot_antispam_triggers_total", "Messages that crossed an anti-spam threshold", ("rule",))
+
+class _Window:
+    """Ring buffer of one user's recent messages, stored as parallel fixed-size lists"""
+    __slots__ = ("index", "last_seen", "times", "hashes", "mentions", "channels", "message_ids")
+
+    def __init__(self):
+        self.index = 0
+        self.last_seen = NEVER
+        self.times = [NEVER] * HISTORY
+        self.hashes = [0] * HISTORY
+        self.mentions = [0] * HISTORY
+        self.channels = [0] * HISTORY
+        self.message_ids = [0] * HISTORY
+
+class SpamTracker:
+    """
+    Sliding-window spam detection per (guild, user).
+
+    Each tracked user costs one fixed-size ring buffer of the last ``HISTORY``
+    messages, so memory is bounded per user and by ``MAX_TRACKED`` overall.
+    Users are kept in least-recently-active order: checking a message moves
+    its author to the end, and starting to track a new user drops idle users
+    from the front, so eviction needs no timer. ``check`` touches at most
+    ``HISTORY`` slots and is cheap enough to run on every message.
+    """
+
+    def __init__(self, max_tracked: int = MAX_TRACKED, idle_ttl: float = IDLE_TTL):
+        self.max_tracked = max_tracked
+        self.idle_ttl = idle_ttl
+        self._windows: "OrderedDict[Tuple[int, int], _Window]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def check(self, guild_id: int, user_id: int, channel_id: int, message_id: int,
+              content: str, mention_count: int, now: float) -> Optional[str]:
+        """Record a message and return the rule ("messages", "duplicates" or "mentions") its author broke, if any"""
+        key = (guild_id, user_id)
+        window = self._windows.get(key)
+        if window is None:
+            self._evict(now)
+            window = self._windows[key] = _Window()
+        else:
+            self._windows.move_to_end(key)
+
+        # Overwrite the oldest slot with this message
+        index = window.index
+        oldest = window.times[(index - MESSAGE_LIMIT) % HISTORY]
+        content_hash = hash(content.strip().lower()) if content else 0
+        window.times[index] = now
+        window.hashes[index] = content_hash
+        window.mentions[index] = mention_count
+        window.channels[index] = channel_id
+        window.message_ids[index] = message_id
+        window.index = (index + 1) % HISTORY
+        window.last_seen = now
+
+        if now - oldest <= MESSAGE_WINDOW:
+            return self._trigger("messages")
+
+        duplicates = 0
+        mentions = 0
+        for slot in range(HISTORY):
+            age = now - window.times[slot]
+            if content_hash and age <= DUPLICATE_WINDOW and window.hashes[slot] == content_hash:
+                duplicates += 1
+            if age <= MENTION_WINDOW:
+                mentions += window.mentions[slot]
+
+        if duplicates >= DUPLICATE_LIMIT:
+            return self._trigger("duplicates")
+        if mentions >= MENTION_LIMIT:
+            return self._trigger("mentions")
+        return None
+
+    @staticmethod
+    def _trigger(rule: str) -> str:
+        SPAM_TRIGGERS.inc(rule)
+        return rule
+
+    def pop_messages(self, guild_id: int, user_id: int, max_age: float, now: float) -> List[Tuple[int, int]]:
+        """Forget a user and return the (channel_id, message_id) of their messages from the last ``max_age`` seconds"""
+        window = self._windows.pop((guild_id, user_id), None)
+        if window is None:
+            return []
+        return [
+            (window.channels[slot], window.message_ids[slot])
+            for slot in range(HISTORY)
+            if now - window.times[slot] <= max_age
+        ]
+
+    def forget_guild(self, guild_id: int) -> None:
+        """Drop every window of a guild"""
+        for key in [key for key in self._windows if key[0] == guild_id]:
+            del self._windows[key]
+
+    def _evict(self, now: float) -> None:
+        """Drop idle users from the front, then the least recently active ones over the cap"""
+        windows = self._windows
+        while windows:
+            first = next(iter(windows.values()))
+            if now - first.last_seen < self.idle_ttl:
+                break
+            windows.popitem(last=False)
+        while len(windows) >= self.max_tracked:
+            windows.popitem(last=False)
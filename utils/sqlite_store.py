@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+from nextcord.ext import tasks
+
+logger = logging.getLogger('bot.SQLiteStore')
+
+# How long a write waits for another process's transaction before failing with "database is locked"
+BUSY_TIMEOUT_MS = 30000
+
+class BatchedSQLiteStore:
+    """
+    Base class for local SQLite stores that are written in batches.
+
+    Rows are queued in memory with ``enqueue`` and written by a background loop,
+    either every ``flush_interval`` seconds or as soon as ``batch_size`` rows are
+    waiting. All database work runs on a single worker thread so the event loop
+    never blocks on disk I/O. Subclasses implement ``_create_schema`` and
+    ``_write_batch``.
+    """
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: List[Any] = []
+        self._flushing = False
+        self._conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=type(self).__name__)
+        self._flush_loop = tasks.loop(seconds=flush_interval)(self._flush_tick)
+
+        # Create data directory if it doesn't exist
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def start(self) -> None:
+        """Start the background writer"""
+        if not self._flush_loop.is_running():
+            self._flush_loop.start()
+
+    async def close(self) -> None:
+        """Write anything still queued and stop the background writer"""
+        self._flush_loop.cancel()
+        await self.flush()
+        await self.run(self._close_connection)
+
+    def enqueue(self, row: Any) -> None:
+        """Queue a row for the next batch write"""
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size and not self._flushing:
+            asyncio.get_running_loop().create_task(self.flush())
+
+    async def flush(self) -> None:
+        """Write all queued rows in one transaction"""
+        if self._flushing or not self._pending:
+            return
+        self._flushing = True
+        rows = []
+        try:
+            while self._pending:
+                rows, self._pending = self._pending, []
+                await self.run(self._write_rows, rows)
+                rows = []
+        except Exception as e:
+            # Put the batch back ahead of rows queued since, so it is retried on the next tick in order
+            self._pending[:0] = rows
+            logger.error(f"Error writing batch to {self.path}, keeping {len(self._pending)} rows queued: {e}")
+        finally:
+            self._flushing = False
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run ``func(connection, *args)`` on the database thread"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._call, func, args)
+
+    async def _flush_tick(self) -> None:
+        await self.flush()
+        await self.run(self._maintain)
+
+    def _call(self, func: Callable, args: tuple) -> Any:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            with self._conn:
+                self._create_schema(self._conn)
+        return func(self._conn, *args)
+
+    def _write_rows(self, conn: sqlite3.Connection, rows: List[Any]) -> None:
+        with conn:
+            self._write_batch(conn, rows)
+
+    def _close_connection(self, conn: sqlite3.Connection) -> None:
+        conn.close()
+        self._conn = None
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        raise NotImplementedError
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: List[Any]) -> None:
+        raise NotImplementedError
+
+    def _maintain(self, conn: sqlite3.Connection) -> None:
+        """Periodic housekeeping hook, run on the database thread after each flush"""
+        pass
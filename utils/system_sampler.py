@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+import platform
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+import psutil
+from nextcord.ext import tasks
+
+logger = logging.getLogger('bot.SystemSampler')
+
+# How often system metrics are sampled (seconds) and how much history is kept
+SAMPLE_INTERVAL = 10
+HISTORY_SECONDS = 3600
+
+class SystemSampler:
+    """
+    Samples system and process metrics in the background.
+
+    Every ``interval`` seconds a worker thread reads CPU, memory, disk and
+    process figures, and the snapshot is appended to a ring buffer holding
+    ``history_seconds`` of history. Readers get the latest snapshot and
+    min/avg/max summaries without doing any blocking work themselves.
+    CPU usage is measured between consecutive samples, so no sample ever waits
+    on a measurement interval.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, history_seconds: float = HISTORY_SECONDS):
+        self.interval = interval
+        self.history = deque(maxlen=max(1, int(history_seconds / interval)))
+        self.process = psutil.Process()
+
+        # Details that don't change while the bot is running
+        self.static = {
+            "platform": f"{platform.system()} {platform.release()}",
+            "cpu_cores": f"{psutil.cpu_count(logical=False)} physical ({psutil.cpu_count(logical=True)} logical)",
+            "arch": platform.machine(),
+            "process_id": os.getpid()
+        }
+
+        # Prime the CPU counters so the first real sample has a baseline
+        psutil.cpu_percent(interval=None)
+        self.process.cpu_percent(interval=None)
+
+        self._loop = tasks.loop(seconds=interval)(self._tick)
+
+    def start(self) -> None:
+        """Start sampling in the background"""
+        if not self._loop.is_running():
+            self._loop.start()
+
+    def stop(self) -> None:
+        """Stop sampling"""
+        self._loop.cancel()
+
+    @property
+    def latest(self) -> Optional[dict]:
+        """The most recent snapshot, or None before the first sample"""
+        return self.history[-1] if self.history else None
+
+    def summary(self, key: str, seconds: float = HISTORY_SECONDS) -> Tuple[float, float, float]:
+        """Min, average and max of one metric over the last ``seconds``"""
+        cutoff = time.time() - seconds
+        values = [snapshot[key] for snapshot in self.history if snapshot["timestamp"] >= cutoff]
+        if not values:
+            return 0, 0, 0
+        return min(values), sum(values) / len(values), max(values)
+
+    def sample_now(self) -> dict:
+        """Take a sample on the calling thread; only used before the first background sample exists"""
+        snapshot = self._sample()
+        self.history.append(snapshot)
+        return snapshot
+
+    async def _tick(self) -> None:
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, self._sample)
+            self.history.append(snapshot)
+        except Exception as e:
+            logger.error(f"Failed to sample system metrics: {e}")
+
+    def _sample(self) -> dict:
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        with self.process.oneshot():
+            process_memory = self.process.memory_info()
+            process_cpu = self.process.cpu_percent(interval=None)
+            threads = self.process.num_threads()
+
+        memory_total = round(memory.total / (1024 * 1024))
+        memory_used = memory_total - round(memory.available / (1024 * 1024))
+        disk_total = round(disk.total / (1024 * 1024 * 1024))
+        disk_free = round(disk.free / (1024 * 1024 * 1024))
+
+        return {
+            "timestamp": time.time(),
+            "cpu_usage": psutil.cpu_percent(interval=None),
+            "memory_total": memory_total,
+            "memory_used": memory_used,
+            "memory_percent": round(memory_used / memory_total * 100),
+            "disk_total": disk_total,
+            "disk_free": disk_free,
+            "disk_percent": round(disk_free / disk_total * 100) if disk_total else 0,
+            "process_cpu": process_cpu,
+            "rss": round(process_memory.rss / (1024 * 1024)),
+            "vms": round(process_memory.vms / (1024 * 1024)),
+            "threads": threads
+        }
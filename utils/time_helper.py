@@ -44,7 +44,12 @@ class TimeHelper:
     @staticmethod
     def format_time_remaining(expiry_time: float) -> str:
         """Format the remaining time until expiry in a human-readable way"""
-        seconds_remaining = int(expiry_time - time.time())
+        return TimeHelper.format_duration(expiry_time - time.time())
+    
+    @staticmethod
+    def format_duration(seconds: float) -> str:
+        """Format a length of time in a human-readable way"""
+        seconds_remaining = int(seconds)
         if seconds_remaining <= 0:
             return "0 seconds"
             
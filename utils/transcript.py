@@ -0,0 +1,85 @@
+import datetime
+import html
+import io
+from typing import List, Tuple
+
+# Discord epoch used to read creation times out of snowflake IDs
+DISCORD_EPOCH = 1420070400000
+
+class TranscriptHelper:
+    """Helper class for rendering deleted-message transcripts"""
+
+    @staticmethod
+    def snowflake_time(snowflake: int) -> datetime.datetime:
+        """Return the UTC creation time encoded in a snowflake ID"""
+        return datetime.datetime.fromtimestamp(((snowflake >> 22) + DISCORD_EPOCH) / 1000, tz=datetime.timezone.utc)
+
+    @staticmethod
+    def render(entries: List[Tuple[int, dict]], channel_name: str, fmt: str = "txt") -> bytes:
+        """
+        Render cached messages as a text or HTML transcript.
+        ``entries`` are ``(message_id, data)`` pairs as returned by MessageCache.pop_many.
+        Lines are written one at a time into a single buffer, so memory stays
+        proportional to the output rather than to intermediate copies.
+        """
+        buffer = io.BytesIO()
+        writer = io.TextIOWrapper(buffer, encoding="utf-8", newline="\n")
+        entries = sorted(entries, key=lambda entry: entry[0])
+
+        if fmt == "html":
+            TranscriptHelper._write_html(writer, entries, channel_name)
+        else:
+            TranscriptHelper._write_text(writer, entries, channel_name)
+
+        writer.flush()
+        writer.detach()
+        return buffer.getvalue()
+
+    @staticmethod
+    def _author_label(data: dict) -> str:
+        author = data.get("author")
+        if not author:
+            return "Unknown user"
+        return f"{author[1]} ({author[0]})"
+
+    @staticmethod
+    def _write_text(writer, entries, channel_name):
+        writer.write(f"Bulk deletion transcript for #{channel_name}\n")
+        writer.write(f"{len(entries)} cached message(s)\n")
+        writer.write("=" * 60 + "\n\n")
+
+        for message_id, data in entries:
+            created = TranscriptHelper.snowflake_time(message_id).strftime("%Y-%m-%d %H:%M:%S UTC")
+            writer.write(f"[{created}] {TranscriptHelper._author_label(data)} - message {message_id}\n")
+            if data.get("content"):
+                writer.write(data["content"] + "\n")
+            for url in data.get("attachments") or []:
+                writer.write(f"[attachment] {url}\n")
+            writer.write("\n")
+
+    @staticmethod
+    def _write_html(writer, entries, channel_name):
+        writer.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+            f"<title>Bulk deletion transcript for #{html.escape(channel_name)}</title>"
+            "<style>body{font-family:sans-serif;background:#313338;color:#dbdee1}"
+            ".msg{margin:8px 0;padding:6px 10px;border-left:3px solid #ed4245}"
+            ".meta{color:#949ba4;font-size:12px}.content{white-space:pre-wrap}</style>"
+            "</head><body>\n"
+        )
+        writer.write(f"<h2>Bulk deletion transcript for #{html.escape(channel_name)}</h2>\n")
+        writer.write(f"<p>{len(entries)} cached message(s)</p>\n")
+
+        for message_id, data in entries:
+            created = TranscriptHelper.snowflake_time(message_id).strftime("%Y-%m-%d %H:%M:%S UTC")
+            writer.write(
+                f"<div class=\"msg\"><div class=\"meta\">{html.escape(TranscriptHelper._author_label(data))}"
+                f" &middot; {created} &middot; {message_id}</div>"
+            )
+            if data.get("content"):
+                writer.write(f"<div class=\"content\">{html.escape(data['content'])}</div>")
+            for url in data.get("attachments") or []:
+                writer.write(f"<div><a href=\"{html.escape(url, quote=True)}\">{html.escape(url)}</a></div>")
+            writer.write("</div>\n")
+
+        writer.write("</body></html>\n")